@@ -0,0 +1,56 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Action plugin of the facts module, reusing the facts Ansible has of the host"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type  # pylint: disable=invalid-name
+
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.utils.vars import merge_hash
+from ansible_collections.nokia.srlinux.plugins.module_utils.facts import (
+    cached_facts,
+    resolve_subsets,
+)
+
+MODULE = "nokia.srlinux.facts"
+
+
+class ActionModule(ActionBase):
+    """Runs the facts module unless the facts of the host are recent enough"""
+
+    _supports_check_mode = True
+
+    def run(self, tmp=None, task_vars=None):
+        result = super().run(tmp, task_vars)
+        del tmp  # tmp no longer has any effect
+        task_vars = task_vars or {}
+
+        args = dict(self._task.args)
+        args.pop("cached_commit_id", None)
+        cached = None
+        try:
+            subsets = resolve_subsets(args.get("gather_subset"))
+        except ValueError:
+            # the module fails with the message
+            subsets = None
+        if subsets is not None:
+            cached = cached_facts(
+                task_vars.get("ansible_facts") or {}, subsets, int(args.get("cache_ttl") or 0)
+            )
+
+        if cached is not None:
+            if not boolean(args.get("validate_commit", True), strict=False):
+                result.update(changed=False, cached=True, ansible_facts=cached)
+                return result
+            args["cached_commit_id"] = str(cached["ansible_net_commit_id"])
+
+        result = merge_hash(
+            result, self._execute_module(module_name=MODULE, module_args=args, task_vars=task_vars)
+        )
+        if result.get("cached"):
+            result["ansible_facts"] = cached
+        self._remove_tmp_path(self._connection._shell.tmpdir)
+        return result
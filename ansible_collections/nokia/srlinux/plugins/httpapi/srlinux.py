@@ -5,7 +5,13 @@
 """Module for http api base functionality."""
 from __future__ import absolute_import, division, print_function
 
+import base64
+import http.client
+import io
 import json
+import os
+import time
+from urllib.request import getproxies, proxy_bypass
 
 __metaclass__ = type  # pylint: disable=invalid-name
 
@@ -17,6 +23,26 @@ from ansible.module_utils.basic import to_text
 from ansible_collections.ansible.netcommon.plugins.plugin_utils.httpapi_base import (
     HttpApiBase,
 )
+from ansible_collections.nokia.srlinux.plugins.module_utils.cli_cache import (
+    CliCache,
+    changes_config,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.gateway import (
+    GatewayConnection,
+    GatewayError,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.keepalive import (
+    KeepAliveConnection,
+    make_context,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.trace import (
+    TraceReader,
+    TraceWriter,
+    trace_name,
+)
 
 DOCUMENTATION = """
 ---
@@ -29,6 +55,112 @@ author:
   - Patrick Dumais (@Nokia)
   - Roman Dodin (@Nokia)
   - Walter De Smedt (@Nokia)
+options:
+  srlinux_gateway:
+    description:
+      - Send the requests through a local gateway daemon that keeps the connections to the
+        devices open across playbook runs, instead of opening them anew in every run.
+      - The gateway listens on the Unix socket C(srlinux_gateway_socket) and is started on
+        first use. It keeps a pool of connections per device and TLS sessions to resume,
+        and no credentials, the requests carry them.
+      - Show its per-device stats with
+        C(python -m ansible_collections.nokia.srlinux.plugins.module_utils.gateway stats),
+        with the collections directory on C(PYTHONPATH), and stop it with C(stop).
+      - Requests go through the httpapi connection as before when a proxy applies to the device.
+    type: bool
+    default: false
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_SRLINUX_GATEWAY
+    vars:
+      - name: ansible_srlinux_gateway
+  srlinux_gateway_socket:
+    description:
+      - Unix socket of the gateway, see C(srlinux_gateway).
+    type: path
+    default: ~/.ansible/srlinux_gateway/gateway.sock
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_SRLINUX_GATEWAY_SOCKET
+    vars:
+      - name: ansible_srlinux_gateway_socket
+  srlinux_gateway_idle_timeout:
+    description:
+      - Seconds without requests after which the gateway exits.
+      - Applies when this connection starts the gateway, a running gateway keeps its settings.
+    type: int
+    default: 600
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_SRLINUX_GATEWAY_IDLE_TIMEOUT
+    vars:
+      - name: ansible_srlinux_gateway_idle_timeout
+  srlinux_gateway_max_per_device:
+    description:
+      - Requests the gateway sends to one device at a time, further requests wait for one
+        to finish, up to C(ansible_command_timeout).
+      - Applies when this connection starts the gateway, a running gateway keeps its settings.
+    type: int
+    default: 4
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_SRLINUX_GATEWAY_MAX_PER_DEVICE
+    vars:
+      - name: ansible_srlinux_gateway_max_per_device
+  srlinux_keepalive:
+    description:
+      - Keep one HTTP(S) connection per device open in the persistent connection, across
+        requests and tasks, and resume its TLS session when it has to reconnect, e.g. after
+        the device closed an idle connection. Without it every request opens a new
+        connection with a full TLS handshake.
+      - TLS sessions are kept in memory, for as long as the persistent connection lives,
+        they are not stored on disk.
+      - Requests go through the httpapi connection when this is disabled, the default, or
+        a proxy applies to the device.
+    type: bool
+    default: false
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_SRLINUX_KEEPALIVE
+    vars:
+      - name: ansible_srlinux_keepalive
+  srlinux_trace_record:
+    description:
+      - Directory to record every request and its response to, for a later replay.
+      - The trace of a host is the JSON lines file C(<host>.jsonl), or C(<host>_<port>.jsonl)
+        when the port is set. Records are appended, remove the file to start over.
+    type: path
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_SRLINUX_TRACE_RECORD
+    vars:
+      - name: ansible_srlinux_trace_record
+  srlinux_trace_replay:
+    description:
+      - Trace file, or directory of recorded traces, to serve requests from instead of the device.
+      - Requests are matched on their JSON-RPC method and params, the request id is ignored.
+        A request missing from the trace fails the module.
+      - Traces compressed with gzip, with a C(.gz) suffix, are read as well.
+      - The trace is read from the start again when a new persistent connection is opened,
+        raise C(ansible_command_timeout) and C(ansible_connect_timeout) for long replays.
+    type: path
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_SRLINUX_TRACE_REPLAY
+    vars:
+      - name: ansible_srlinux_trace_replay
+  srlinux_trace_replay_speed:
+    description:
+      - Replay the recorded response times divided by this factor, e.g. C(100) for 100x the
+        speed of the recorded run.
+      - C(0) answers at once.
+    type: float
+    default: 0
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_SRLINUX_TRACE_REPLAY_SPEED
+    vars:
+      - name: ansible_srlinux_trace_replay_speed
 """
 
 BASE_HEADERS = {"Content-Type": "application/json"}
@@ -37,10 +169,134 @@ BASE_HEADERS = {"Content-Type": "application/json"}
 class HttpApi(HttpApiBase):
     """HttpApi plugin for Nokia SR Linux"""
 
-    # pylint: disable=arguments-differ
-    def send_request(self, data, method="POST", path="/jsonrpc"):
-        try:
-            self._display_request(data)
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._trace_writer = None
+        self._trace_reader = None
+        self._keepalive_conn = None
+        self._gateway_conn = None
+        self._cli_cache = CliCache()
+
+    def _trace_file(self, directory):
+        return os.path.join(
+            directory,
+            trace_name(self.connection.get_option("host"), self.connection.get_option("port")),
+        )
+
+    def _recorder(self):
+        # options follow the task vars of a reused persistent connection, check them every time
+        directory = self.get_option("srlinux_trace_record")
+        if not directory:
+            return None
+        path = self._trace_file(directory)
+        if self._trace_writer is None or self._trace_writer.path != path:
+            if self._trace_writer:
+                self._trace_writer.close()
+            self._trace_writer = TraceWriter(path)
+        return self._trace_writer
+
+    def _replay(self, data, method, path):
+        trace = self.get_option("srlinux_trace_replay")
+        if os.path.isdir(trace):
+            trace = self._trace_file(trace)
+            if not os.path.exists(trace) and os.path.exists(trace + ".gz"):
+                trace += ".gz"
+        if not os.path.isfile(trace):
+            return 404, f"trace to replay not found: {trace}"
+        if self._trace_reader is None or self._trace_reader.path != trace:
+            self._trace_reader = TraceReader(trace)
+
+        record = self._trace_reader.lookup(method, path, data)
+        if record is None:
+            return 404, f"no recorded response in {trace} for request: {data}"
+        speed = self.get_option("srlinux_trace_replay_speed")
+        if speed:
+            time.sleep(record.get("elapsed", 0) / speed)
+        response = record["response"]
+        if isinstance(response, dict) and "id" in response:
+            # answer with the id of this request, like the device would
+            response = dict(response, id=json.loads(data).get("id"))
+        return record["code"], response
+
+    def _device(self):
+        """Connection options of the device, None when a proxy applies to it"""
+        option = self.connection.get_option
+        host, use_ssl = option("host"), option("use_ssl")
+        if option("use_proxy") and getproxies().get("https" if use_ssl else "http"):
+            if not proxy_bypass(host):
+                return None
+        return {
+            "host": host,
+            "port": option("port") or (443 if use_ssl else 80),
+            "use_ssl": use_ssl,
+            "validate_certs": option("validate_certs"),
+            "ca_path": option("ca_path"),
+            "client_cert": option("client_cert"),
+            "client_key": option("client_key"),
+            "ciphers": option("ciphers"),
+            "user": option("remote_user"),
+            "timeout": option("persistent_command_timeout"),
+        }
+
+    def _gateway(self):
+        if not self.get_option("srlinux_gateway"):
+            return None
+        path = os.path.expanduser(self.get_option("srlinux_gateway_socket"))
+        if self._gateway_conn is None or self._gateway_conn.path != path:
+            device = self._device()
+            if device is None:
+                return None
+            if self._gateway_conn:
+                self._gateway_conn.close()
+            self._gateway_conn = GatewayConnection(
+                path,
+                device,
+                idle_timeout=self.get_option("srlinux_gateway_idle_timeout"),
+                max_per_device=self.get_option("srlinux_gateway_max_per_device"),
+            )
+        return self._gateway_conn
+
+    def _keepalive(self):
+        if not self.get_option("srlinux_keepalive"):
+            return None
+        if self._keepalive_conn is None:
+            device = self._device()
+            if device is None:
+                return None
+            context = None
+            if device["use_ssl"]:
+                context = make_context(
+                    validate_certs=device["validate_certs"],
+                    ca_path=device["ca_path"],
+                    client_cert=device["client_cert"],
+                    client_key=device["client_key"],
+                    ciphers=device["ciphers"],
+                )
+            self._keepalive_conn = KeepAliveConnection(
+                device["host"],
+                device["port"],
+                use_ssl=device["use_ssl"],
+                context=context,
+                timeout=device["timeout"],
+            )
+        return self._keepalive_conn
+
+    def _headers(self):
+        headers = dict(BASE_HEADERS)
+        user = self.connection.get_option("remote_user")
+        if user:
+            credentials = f"{user}:{self.connection.get_option('password') or ''}"
+            headers["Authorization"] = "Basic " + base64.b64encode(
+                credentials.encode("utf-8")
+            ).decode("ascii")
+        if self.connection.get_option("http_agent"):
+            headers["User-Agent"] = self.connection.get_option("http_agent")
+        return headers
+
+    def _send(self, data, method, path):
+        """Status and body text of a request, HTTPError for error statuses"""
+        conn = self._gateway() or self._keepalive()
+        if conn is None:
             response, response_data = self.connection.send(
                 path,
                 data,
@@ -48,10 +304,80 @@ class HttpApi(HttpApiBase):
                 headers=BASE_HEADERS,
                 force_basic_auth=True,
             )
+            return response.getcode(), to_text(response_data.getvalue())
 
-            return response.getcode(), self._response_to_json(
-                to_text(response_data.getvalue())
+        scheme = "https" if conn.use_ssl else "http"
+        url = f"{scheme}://{conn.host}:{conn.port}{path}"
+        handshakes, resumed = conn.handshakes, conn.resumed
+        try:
+            code, body = conn.request(
+                method, path, data.encode("utf-8") if isinstance(data, str) else data, self._headers()
             )
+        except (OSError, http.client.HTTPException, GatewayError) as e:
+            raise AnsibleConnectionFailure(f"Could not connect to {url}: {e}") from e
+        if conn.handshakes > handshakes:
+            self.connection.queue_message(
+                "vvvv",
+                f"TLS handshake with {url}, session resumed: {conn.resumed > resumed}",
+            )
+        if not 200 <= code < 300:
+            raise HTTPError(url, code, http.client.responses.get(code, ""), {}, io.BytesIO(body))
+        return code, to_text(body)
+
+    def _show_request(self, data, cache_ttl):
+        """(id, commands, output format) of a cli request to cache, drops the cache on config changes"""
+        if not cache_ttl and not self._cli_cache.entries:
+            return None
+        try:
+            request = json.loads(data)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(request, dict):
+            return None
+        method, params = request.get("method"), request.get("params") or {}
+        if changes_config(method, params):
+            self._cli_cache.clear()
+            return None
+        if not cache_ttl or method != "cli" or not params.get("commands"):
+            return None
+        return request.get("id"), params["commands"], params.get("output-format")
+
+    def clear_cli_cache(self):
+        """Drop the cached cli results, for config changes made without this connection"""
+        self._cli_cache.clear()
+
+    # pylint: disable=arguments-differ
+    def send_request(self, data, method="POST", path="/jsonrpc", cache_ttl=0):
+        show = self._show_request(data, cache_ttl)
+        if show is None:
+            return self._send_request(data, method, path)
+
+        request_id, commands, output_format = show
+        results = self._cli_cache.lookup(commands, output_format, cache_ttl)
+        if results is not None:
+            self.connection.queue_message("vvvv", f"cli results from cache: {commands}")
+            return 200, {"jsonrpc": JSON_RPC_VERSION, "id": request_id, "result": results, "cached": True}
+        code, response = self._send_request(data, method, path)
+        if 200 <= code < 300 and isinstance(response, dict):
+            results = response.get("result")
+            if isinstance(results, list) and len(results) == len(commands):
+                self._cli_cache.store(commands, output_format, results, cache_ttl)
+        return code, response
+
+    def _send_request(self, data, method, path):
+        if self.get_option("srlinux_trace_replay"):
+            self._display_request(data)
+            return self._replay(data, method, path)
+
+        recorder = self._recorder()
+        started = time.perf_counter()
+        try:
+            self._display_request(data)
+            code, text = self._send(data, method, path)
+            result = self._response_to_json(text)
+            if recorder:
+                recorder.write(method, path, data, code, result, time.perf_counter() - started)
+            return code, result
         except AnsibleConnectionFailure as e:
             self.connection.queue_message("vvv", f"AnsibleConnectionFailure: {e}")
             if to_text("Could not connect to") in to_text(e):
@@ -61,6 +387,10 @@ class HttpApi(HttpApiBase):
             return 404, "Object not found"
         except HTTPError as e:
             error = e.read()
+            if recorder:
+                recorder.write(
+                    method, path, data, e.code, to_text(error), time.perf_counter() - started
+                )
             return e.code, error
 
     def _display_request(self, data):
@@ -0,0 +1,323 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Inventory plugin for containerlab topologies"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type  # pylint: disable=invalid-name
+
+import hashlib
+import json
+import os
+import re
+
+from ansible.errors import AnsibleParserError
+from ansible.module_utils.common.text.converters import to_native
+from ansible.module_utils.common.yaml import yaml_load
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+
+DOCUMENTATION = """
+---
+name: containerlab
+short_description: Inventory of the nodes of a containerlab topology
+description:
+  - Adds the nodes of a containerlab topology file, C(*.clab.yml), or of the C(topology-data.json)
+    containerlab writes to the lab directory, as hosts.
+  - SR Linux nodes get the variables of the srlinux httpapi connection. The links of every
+    node are in its C(clab_links) variable, with SR Linux interface names.
+  - The topology file can be the inventory source itself, with the default options, or be set
+    with C(topology) in a config file whose name ends in C(containerlab.yml) or C(containerlab.yaml).
+  - With C(cache) enabled the parsed topology is cached and reused while the file has the same
+    modification time and size, or else the same content, so large topologies are not parsed
+    again for every run.
+  - Add C(nokia.srlinux.containerlab) to C(enable_plugins) in the C([inventory]) section of
+    C(ansible.cfg) to use it.
+version_added: "1.1.0"
+author:
+  - Uzma Saman (@NetOpsChic)
+extends_documentation_fragment:
+  - constructed
+  - inventory_cache
+options:
+  plugin:
+    description: Name of the plugin.
+    required: true
+    choices: [nokia.srlinux.containerlab]
+  topology:
+    description:
+      - Containerlab topology file, or C(topology-data.json) of a deployed lab.
+      - C(topology-data.json) also has the management addresses of the nodes, they become
+        their C(ansible_host).
+      - Relative paths are relative to the config file.
+    type: str
+  kinds:
+    description: Kinds of the nodes to add, other nodes are left out.
+    type: list
+    elements: str
+    default: [nokia_srlinux, srl]
+  hostname:
+    description:
+      - Name of the hosts, C(longname) is the name of the node container, e.g.
+        C(clab-srl-mesh-node1), that containerlab adds to C(/etc/hosts). C(shortname) is
+        the node name of the topology.
+    type: str
+    choices: [longname, shortname]
+    default: longname
+  group:
+    description:
+      - Group all hosts are added to. Hosts are also added to the group set for their node
+        in the topology.
+    type: str
+    default: clab
+  username:
+    description: User of the SR Linux nodes.
+    type: str
+    default: admin
+  password:
+    description: Password of the SR Linux nodes, the containerlab default by default.
+    type: str
+    default: NokiaSrl1!
+  use_ssl:
+    description: Connect to the JSON-RPC server of the SR Linux nodes over HTTPS.
+    type: bool
+    default: true
+  validate_certs:
+    description: Validate the certificates of the SR Linux nodes, containerlab generates self-signed ones.
+    type: bool
+    default: false
+"""
+
+EXAMPLES = """
+# containerlab.yml
+plugin: nokia.srlinux.containerlab
+topology: ../example-scenarios/containerlab/nokia-sr-linux.clab.yaml
+hostname: shortname
+cache: true
+cache_plugin: jsonfile
+cache_connection: ~/.cache/ansible-inventory
+keyed_groups:
+  - key: clab_type
+    prefix: type
+"""
+
+SRLINUX_KINDS = ("nokia_srlinux", "srl")
+CONFIG_SUFFIXES = ("containerlab.yml", "containerlab.yaml")
+TOPOLOGY_SUFFIXES = (".clab.yml", ".clab.yaml", "topology-data.json")
+
+# containerlab interface aliases of SR Linux, e1-1 is ethernet-1/1 and e1-3-1 ethernet-1/3/1
+INTERFACE_ALIAS_RE = re.compile(r"^e(\d+)-(\d+)(?:-(\d+))?$")
+
+
+def srlinux_interface(name):
+    """SR Linux name of an interface of a containerlab link"""
+    match = INTERFACE_ALIAS_RE.match(name)
+    if not match:
+        return name
+    return "ethernet-" + "/".join(part for part in match.groups() if part)
+
+
+def longname(prefix, lab, node):
+    """Container name of a node, after the prefix rules of containerlab"""
+    if prefix == "":
+        return node
+    if prefix == "__lab-name":
+        return f"{lab}-{node}"
+    return f"{prefix}-{lab}-{node}"
+
+
+def _endpoint(endpoint):
+    if isinstance(endpoint, dict):
+        return str(endpoint.get("node")), str(endpoint.get("interface"))
+    node, _, interface = str(endpoint).partition(":")
+    return node, interface
+
+
+def parse_clab(data):
+    """Nodes and links of a containerlab topology file"""
+    lab = str(data.get("name", ""))
+    prefix = data.get("prefix", "clab")
+    topology = data.get("topology") or {}
+    defaults = topology.get("defaults") or {}
+    kinds = topology.get("kinds") or {}
+
+    nodes = {}
+    for node, spec in (topology.get("nodes") or {}).items():
+        node, spec = str(node), spec or {}
+        kind = spec.get("kind") or defaults.get("kind")
+        kind_spec = kinds.get(kind) or {}
+        # node settings override those of the kind, which override the defaults
+        merged, labels = {}, {}
+        for layer in (defaults, kind_spec, spec):
+            merged.update(layer)
+            labels.update(layer.get("labels") or {})
+        nodes[node] = {
+            "longname": longname(prefix, lab, node),
+            "kind": kind,
+            "type": merged.get("type"),
+            "image": merged.get("image"),
+            "group": merged.get("group"),
+            "labels": labels,
+            "mgmt_ipv4": spec.get("mgmt-ipv4") or spec.get("mgmt_ipv4"),
+        }
+
+    links = []
+    for link in topology.get("links") or []:
+        endpoints = link.get("endpoints") or []
+        if len(endpoints) == 2:
+            links.append(_endpoint(endpoints[0]) + _endpoint(endpoints[1]))
+    return {"name": lab, "nodes": nodes, "links": links}
+
+
+def parse_topology_data(data):
+    """Nodes and links of the topology-data.json of a deployed lab"""
+    nodes = {}
+    for node, spec in (data.get("nodes") or {}).items():
+        nodes[str(node)] = {
+            "longname": spec.get("longname") or node,
+            "kind": spec.get("kind"),
+            "type": spec.get("type") or (spec.get("labels") or {}).get("clab-node-type"),
+            "image": spec.get("image"),
+            "group": spec.get("group"),
+            "labels": spec.get("labels") or {},
+            "mgmt_ipv4": spec.get("mgmt-ipv4-address"),
+        }
+
+    links = []
+    for link in data.get("links") or []:
+        # newer containerlab versions nest the link ends under endpoints
+        ends = link.get("endpoints") or link
+        if "a" in ends and "z" in ends:
+            links.append(_endpoint(ends["a"]) + _endpoint(ends["z"]))
+    return {"name": data.get("name", ""), "nodes": nodes, "links": links}
+
+
+def parse_topology(path, content):
+    """Nodes and links of a topology file, from its content"""
+    if path.endswith(".json"):
+        return parse_topology_data(json.loads(content))
+    return parse_clab(yaml_load(content) or {})
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    """Hosts of the nodes of a containerlab topology"""
+
+    NAME = "nokia.srlinux.containerlab"
+
+    def verify_file(self, path):
+        return super().verify_file(path) and path.endswith(CONFIG_SUFFIXES + TOPOLOGY_SUFFIXES)
+
+    def _topology(self, path, cache):
+        """Parsed topology, from the cache while the file is unchanged"""
+        stat = os.stat(path)
+        cache_key = self.get_cache_key(path)
+        cached = None
+        if cache and self.get_option("cache"):
+            try:
+                cached = self._cache[cache_key]
+            except KeyError:
+                pass
+        if cached and (cached.get("mtime_ns"), cached.get("size")) == (stat.st_mtime_ns, stat.st_size):
+            return cached["topology"]
+
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        if cached and cached.get("sha256") == digest:
+            # touched but not changed, e.g. checked out again
+            topology = cached["topology"]
+        else:
+            try:
+                topology = parse_topology(path, content)
+            except Exception as e:
+                raise AnsibleParserError(f"cannot parse topology {path}: {to_native(e)}") from e
+        if self.get_option("cache"):
+            self._cache[cache_key] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "topology": topology,
+            }
+        return topology
+
+    def parse(self, inventory, loader, path, cache=True):
+        super().parse(inventory, loader, path, cache)
+        if path.endswith(CONFIG_SUFFIXES):
+            self._read_config_data(path)
+            topology_path = self.get_option("topology")
+            if not topology_path:
+                raise AnsibleParserError(f"{path}: topology is required")
+            topology_path = os.path.join(os.path.dirname(path), os.path.expanduser(topology_path))
+        else:
+            self.set_options(direct={"plugin": self.NAME}, var_options=self._vars)
+            topology_path = path
+
+        topology = self._topology(topology_path, cache)
+        self._populate(topology)
+
+    def _host_name(self, topology, node):
+        spec = topology["nodes"].get(node)
+        if self.get_option("hostname") == "shortname" or spec is None:
+            return node
+        return spec["longname"]
+
+    def _populate(self, topology):
+        kinds = set(self.get_option("kinds"))
+        group = self.inventory.add_group(self.get_option("group"))
+        strict = self.get_option("strict")
+
+        links = {}
+        for a_node, a_if, z_node, z_if in topology["links"]:
+            links.setdefault(a_node, []).append((a_if, z_node, z_if))
+            links.setdefault(z_node, []).append((z_if, a_node, a_if))
+
+        def interface(node, name):
+            spec = topology["nodes"].get(node) or {}
+            return srlinux_interface(name) if spec.get("kind") in SRLINUX_KINDS else name
+
+        for node, spec in topology["nodes"].items():
+            if spec["kind"] not in kinds:
+                continue
+            host = self.inventory.add_host(self._host_name(topology, node), group=group)
+            if spec.get("group"):
+                self.inventory.add_child(self.inventory.add_group(spec["group"]), host)
+
+            host_vars = {
+                "clab_lab": topology["name"],
+                "clab_node": node,
+                "clab_kind": spec["kind"],
+                "clab_type": spec.get("type"),
+                "clab_image": spec.get("image"),
+                "clab_labels": spec.get("labels") or {},
+                "clab_links": [
+                    {
+                        "interface": interface(node, local_if),
+                        "peer": self._host_name(topology, peer),
+                        "peer_node": peer,
+                        "peer_interface": interface(peer, peer_if),
+                    }
+                    for local_if, peer, peer_if in links.get(node, [])
+                ],
+            }
+            if spec.get("mgmt_ipv4"):
+                host_vars["ansible_host"] = spec["mgmt_ipv4"]
+            elif host != spec["longname"]:
+                # the node name does not resolve, the container name does
+                host_vars["ansible_host"] = spec["longname"]
+            if spec["kind"] in SRLINUX_KINDS:
+                host_vars.update(
+                    {
+                        "ansible_connection": "ansible.netcommon.httpapi",
+                        "ansible_network_os": "nokia.srlinux.srlinux",
+                        "ansible_user": self.get_option("username"),
+                        "ansible_password": self.get_option("password"),
+                        "ansible_httpapi_use_ssl": self.get_option("use_ssl"),
+                        "ansible_httpapi_validate_certs": self.get_option("validate_certs"),
+                    }
+                )
+            for name, value in host_vars.items():
+                self.inventory.set_variable(host, name, value)
+
+            self._set_composite_vars(self.get_option("compose"), host_vars, host, strict=strict)
+            self._add_host_to_composed_groups(self.get_option("groups"), host_vars, host, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option("keyed_groups"), host_vars, host, strict=strict)
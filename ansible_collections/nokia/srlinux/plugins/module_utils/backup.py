@@ -0,0 +1,155 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Content-addressed store for SR Linux configuration backups"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+_UNSAFE_RE = re.compile(r"[^\w.-]+")
+
+
+def canonical_json(data):
+    """Serialize data so that equal configs give equal bytes"""
+    return json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def content_hash(data):
+    """sha256 of the canonical JSON of data"""
+    return hashlib.sha256(canonical_json(data)).hexdigest()
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """sha256 of a file's raw bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def split_config(config):
+    """Split a config into its top-level subtrees.
+
+    Returns the manifest tree, a list with one item per top-level node in order,
+    and a dict of the subtrees by hash. Top-level lists (interfaces, network-instances)
+    are split per entry so that a change in one entry does not store the whole list again.
+    """
+    tree, objects = [], {}
+    for key, value in config.items():
+        if isinstance(value, list) and all(isinstance(e, dict) for e in value):
+            hashes = []
+            for entry in value:
+                digest = content_hash(entry)
+                objects[digest] = entry
+                hashes.append(digest)
+            tree.append({"key": key, "entries": hashes})
+        else:
+            digest = content_hash(value)
+            objects[digest] = value
+            tree.append({"key": key, "object": digest})
+    return tree, objects
+
+
+def safe_name(name):
+    """name as a file name that stays in its directory, `..` included"""
+    name = _UNSAFE_RE.sub("_", name)
+    return "_" + name if name.startswith(".") or not name else name
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class ConfigStore:
+    """Backup store made of gzipped objects named by their hash and per-device manifests.
+
+    Layout:
+        objects/<2 hex>/<62 hex>.json.gz  one subtree, stored once for all devices and runs
+        manifests/<device>/<run>.json     the subtrees a device's config was made of
+
+    Device and run names are made safe file names with safe_name.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def object_path(self, digest):
+        """Path of an object file"""
+        return os.path.join(self.root, "objects", digest[:2], digest[2:] + ".json.gz")
+
+    def manifest_path(self, device, run):
+        """Path of a manifest file"""
+        return os.path.join(self.root, "manifests", safe_name(device), safe_name(run) + ".json")
+
+    def has(self, digest):
+        """Whether an object is stored"""
+        return os.path.exists(self.object_path(digest))
+
+    def put(self, digest, value):
+        """Store an object unless present, returns the number of bytes written"""
+        if self.has(digest):
+            return 0
+        # mtime=0 keeps the compressed bytes reproducible
+        data = gzip.compress(canonical_json(value), mtime=0)
+        _write_atomic(self.object_path(digest), data)
+        return len(data)
+
+    def get(self, digest):
+        """Load an object"""
+        with gzip.open(self.object_path(digest), "rb") as f:
+            return json.loads(f.read())
+
+    def save_manifest(self, manifest):
+        """Write the manifest of a run, returns its path"""
+        path = self.manifest_path(manifest["device"], manifest["run"])
+        _write_atomic(path, json.dumps(manifest, indent=2).encode("utf-8"))
+        return path
+
+    def load_manifest(self, device, run=None):
+        """Load the manifest of a run, the latest one when run is None"""
+        if run is None:
+            runs = self.runs(device)
+            if not runs:
+                raise FileNotFoundError(f"no backup of {device} in {self.root}")
+            run = runs[-1]
+        with open(self.manifest_path(device, run), "rb") as f:
+            return json.loads(f.read())
+
+    def runs(self, device):
+        """Runs of a device, oldest first"""
+        path = os.path.join(self.root, "manifests", safe_name(device))
+        if not os.path.isdir(path):
+            return []
+        return sorted(n[: -len(".json")] for n in os.listdir(path) if n.endswith(".json"))
+
+    def restore(self, manifest):
+        """Reassemble the config of a manifest"""
+        config = {}
+        for item in manifest["tree"]:
+            if "entries" in item:
+                config[item["key"]] = [self.get(d) for d in item["entries"]]
+            else:
+                config[item["key"]] = self.get(item["object"])
+        return config
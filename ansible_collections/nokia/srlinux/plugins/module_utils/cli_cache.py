@@ -0,0 +1,69 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Results of show commands kept by the httpapi plugin for the cli module.
+
+The persistent connection lives across the tasks of a play, so verify tasks
+running the same show commands can be answered from the results of the
+first run. Only requests of nothing but show commands are cached, per
+(command, output format), and each task takes results up to its TTL old. Any
+set or other CLI command sent through the connection, a commit for one, drops
+all results, as do gNMI sets of the config module.
+"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import time
+
+
+def is_show(command):
+    """Whether a CLI command is a show command"""
+    return command.split(None, 1)[:1] == ["show"]
+
+
+def changes_config(method, params):
+    """Whether a JSON-RPC request can change what show commands return"""
+    if method == "set":
+        return True
+    if method == "cli":
+        return not all(is_show(c) for c in params.get("commands") or [])
+    return False
+
+
+class CliCache:
+    """Results of show commands of one device, by command and output format"""
+
+    def __init__(self):
+        self.entries = {}
+        # results older than the longest TTL asked for are of no use to anyone
+        self.max_ttl = 0
+
+    def lookup(self, commands, output_format, ttl, now=None):
+        """Results of all commands, None unless every one is younger than ttl seconds"""
+        now = time.monotonic() if now is None else now
+        results = []
+        for command in commands:
+            entry = self.entries.get((command, output_format))
+            if entry is None or now - entry[0] >= ttl:
+                return None
+            results.append(entry[1])
+        return results
+
+    def store(self, commands, output_format, results, ttl, now=None):
+        """Keep the results of commands"""
+        now = time.monotonic() if now is None else now
+        self.max_ttl = max(self.max_ttl, ttl)
+        self.entries = {
+            key: entry for key, entry in self.entries.items() if now - entry[0] < self.max_ttl
+        }
+        for command, result in zip(commands, results):
+            self.entries[(command, output_format)] = (now, result)
+
+    def clear(self):
+        """Drop all results"""
+        self.entries = {}
@@ -0,0 +1,227 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Compaction of JSON-RPC set commands"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import copy
+
+from ansible_collections.nokia.srlinux.plugins.module_utils.compare import (
+    list_key,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    NUMERIC_KEYS,
+)
+
+ACTION_ORDER = {"delete": 0, "replace": 1, "update": 2}
+
+
+class _Conflict(Exception):
+    """The commands can't be compacted without changing their meaning"""
+
+
+def parse_path(path):
+    """Split a path into (name, keys) elements, keys being (key, value, quoted) tuples.
+
+    Unlike split_path, whether a key value was quoted is kept, so that paths are
+    rendered back the way they were written.
+    """
+    elems = []
+    name, keys, key, buf = "", [], None, ""
+    in_key = quoted = was_quoted = False
+    for char in path.strip("/") + "/":
+        if quoted:
+            if char == '"':
+                quoted = False
+            else:
+                buf += char
+        elif in_key:
+            if char == '"':
+                quoted = was_quoted = True
+            elif char == "=" and key is None:
+                key, buf = buf, ""
+            elif char == "]":
+                keys.append((key, buf, was_quoted))
+                key, buf, in_key, was_quoted = None, "", False, False
+            else:
+                buf += char
+        elif char == "[":
+            in_key = True
+            name, buf = name or buf, ""
+        elif char == "/":
+            name = name or buf
+            if name:
+                elems.append((name.split(":", 1)[-1], tuple(keys)))
+            name, keys, buf = "", [], ""
+        else:
+            buf += char
+    return elems
+
+
+def format_path(elems):
+    """Render parsed elements back into a path"""
+    parts = []
+    for name, keys in elems:
+        parts.append(
+            name
+            + "".join(f'[{k}="{v}"]' if q else f"[{k}={v}]" for k, v, q in keys)
+        )
+    return "/" + "/".join(parts)
+
+
+def _key_values(keys):
+    return tuple((k, v) for k, v, _ in keys)
+
+
+def covers(ancestor, elems):
+    """Whether the ancestor path is the same as or above elems"""
+    if len(ancestor) > len(elems):
+        return False
+    return all(
+        a[0] == e[0] and _key_values(a[1]) == _key_values(e[1])
+        for a, e in zip(ancestor, elems)
+    )
+
+
+def _typed(key, value):
+    # values of numeric keys (subinterface index, sequence-id) are numbers in JSON
+    return int(value) if key in NUMERIC_KEYS and value.isdigit() else value
+
+
+class _Merger:
+    """Merges update values, matching list entries by their keys"""
+
+    def __init__(self):
+        self.list_keys = {}
+        # key index of the merged lists, by id, so that merging n entries one at a
+        # time into the same list stays linear
+        self.indexes = {}
+
+    def nest(self, rest, value):
+        """Wrap value into the containers and list entries of the relative path"""
+        node = value
+        for name, keys in reversed(rest):
+            if keys:
+                if not isinstance(node, dict):
+                    raise _Conflict(name)
+                self.list_keys[name] = tuple(k for k, _, _ in keys)
+                entry = {k: _typed(k, v) for k, v, _ in keys}
+                entry.update(node)
+                node = {name: [entry]}
+            else:
+                node = {name: node}
+        return node
+
+    def merge(self, dst, src):
+        """Merge src into dst, later leaf values win"""
+        for key, value in src.items():
+            if key not in dst:
+                dst[key] = copy.deepcopy(value)
+            elif isinstance(dst[key], dict) and isinstance(value, dict):
+                self.merge(dst[key], value)
+            elif isinstance(dst[key], list) and isinstance(value, list):
+                self.merge_list(key, dst[key], value)
+            elif isinstance(dst[key], (dict, list)) or isinstance(value, (dict, list)):
+                raise _Conflict(key)
+            else:
+                dst[key] = copy.deepcopy(value)
+
+    def merge_list(self, name, dst, src):
+        """Merge keyed list entries, leaf-lists can't be merged without changing them"""
+        if dst == src:
+            return
+        cached = self.indexes.get(id(dst))
+        if cached is None:
+            entries = dst + src
+            if not all(isinstance(e, dict) for e in entries):
+                raise _Conflict(name)
+            keys = self.list_keys.get(name) or list_key(name, entries, {})
+            if keys is None or not all(all(k in e for k in keys) for e in entries):
+                raise _Conflict(name)
+            index = {tuple(str(e[k]) for k in keys): e for e in dst}
+            self.indexes[id(dst)] = (keys, index)
+        else:
+            keys, index = cached
+            if not all(isinstance(e, dict) and all(k in e for k in keys) for e in src):
+                raise _Conflict(name)
+        for entry in src:
+            match = index.get(tuple(str(entry[k]) for k in keys))
+            if match is None:
+                dst.append(copy.deepcopy(entry))
+                index[tuple(str(entry[k]) for k in keys)] = dst[-1]
+            else:
+                self.merge(match, entry)
+
+
+def compact_commands(commands):
+    """Compact the commands of a set request into fewer, larger commands.
+
+    - updates below a common keyed ancestor (the first list entry of their path, or
+      the top-level container) are merged into one update of that ancestor
+    - updates overwritten by a later delete or replace of the same or an ancestor path
+      are dropped, as are deletes below another delete
+    - the result is ordered deletes, replaces, updates, like the config module does
+
+    When reordering would change the meaning of the commands, e.g. an update followed
+    by a delete of one of its leaves, or values can't be merged unambiguously, the
+    commands are returned as they are.
+    """
+    parsed = [(cmd, parse_path(cmd["path"])) for cmd in commands]
+    overwrites = [
+        (i, elems)
+        for i, (cmd, elems) in enumerate(parsed)
+        if cmd["action"] in ("delete", "replace")
+    ]
+
+    kept = []
+    for i, (cmd, elems) in enumerate(parsed):
+        if cmd["action"] == "update" and any(
+            j > i and covers(other, elems) for j, other in overwrites
+        ):
+            continue
+        kept.append((i, cmd, elems))
+
+    # commands moved before an earlier overlapping command change the outcome
+    for j, other in overwrites:
+        rank = ACTION_ORDER[parsed[j][0]["action"]]
+        for i, cmd, elems in kept:
+            if i >= j:
+                break
+            if ACTION_ORDER[cmd["action"]] > rank and (
+                covers(other, elems) or covers(elems, other)
+            ):
+                return list(commands)
+
+    deletes, replaces, anchors = [], [], {}
+    merger = _Merger()
+    try:
+        for _, cmd, elems in kept:
+            if cmd["action"] == "delete":
+                if not any(covers(d, elems) for _, d in deletes):
+                    deletes.append((cmd, elems))
+            elif cmd["action"] == "replace":
+                replaces.append(cmd)
+            else:
+                split = next((n for n, (_, keys) in enumerate(elems) if keys), 0)
+                anchor = format_path(elems[: split + 1]) if elems else "/"
+                value = merger.nest(elems[split + 1:], cmd.get("value"))
+                if not isinstance(value, dict):
+                    raise _Conflict(anchor)
+                merger.merge(anchors.setdefault(anchor, {}), value)
+    except _Conflict:
+        return list(commands)
+
+    return (
+        [cmd for cmd, _ in deletes]
+        + replaces
+        + [
+            {"action": "update", "path": path, "value": value}
+            for path, value in anchors.items()
+        ]
+    )
@@ -0,0 +1,217 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Structural comparison of SR Linux JSON configurations"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import re
+
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    strip_identity,
+)
+
+# keys of the SR Linux lists whose key is not found by the heuristic below,
+# or whose name is shared with a list keyed differently
+DEFAULT_LIST_KEYS = {
+    "acl-filter": ("name", "type"),
+    "address": ("ip-prefix",),
+    "afi-safi": ("afi-safi-name",),
+    "area": ("area-id",),
+    "buffer": ("buffer-name",),
+    "entry": ("sequence-id",),
+    "facility": ("facility-name",),
+    "file": ("file-name",),
+    "group": ("group-name",),
+    "neighbor": ("peer-address",),
+    "next-hop": ("index",),
+    "prefix": ("ip-prefix", "mask-length-range"),
+    "route": ("prefix",),
+    "subinterface": ("index",),
+}
+
+# key leaves tried in order when a list is not in DEFAULT_LIST_KEYS
+KEY_CANDIDATES = ("name", "index", "id", "sequence-id", "ip-prefix")
+KEY_SUFFIXES = ("-name", "-id", "-address", "-index", "-prefix")
+
+# characters that need the key value to be quoted in a path
+QUOTE_RE = re.compile(r'[\s\]\["=]')
+
+
+def glob_to_regex(pattern):
+    """Compile an ignore pattern, `*` matches within a path element and `**` across elements"""
+    regex = ""
+    for part in re.split(r"(\*\*|\*)", pattern.rstrip("/") or "/"):
+        if part == "**":
+            regex += ".*"
+        elif part == "*":
+            regex += "[^/]*"
+        else:
+            regex += re.escape(part)
+    return re.compile(regex)
+
+
+def list_key(name, entries, list_keys):
+    """Key leaves of a keyed list, None when the entries can't be keyed"""
+    if not entries or not all(isinstance(e, dict) for e in entries):
+        return None
+    candidates = []
+    if name in list_keys:
+        candidates.append(tuple(list_keys[name]))
+    if name in DEFAULT_LIST_KEYS:
+        candidates.append(DEFAULT_LIST_KEYS[name])
+    first = entries[0]
+    candidates += [(k,) for k in KEY_CANDIDATES]
+    candidates += [(k,) for k in first if k.endswith(KEY_SUFFIXES)]
+    for keys in candidates:
+        if all(all(k in e for k in keys) for e in entries):
+            return keys
+    return None
+
+
+def format_key(key, value):
+    """Format a key of a path element"""
+    value = str(value).lower() if isinstance(value, bool) else str(value)
+    if QUOTE_RE.search(value):
+        value = '"' + value.replace('"', '\\"') + '"'
+    return f"[{key}={value}]"
+
+
+def same_scalar(a, b):
+    """Compare leaf values, tolerating module prefixes and string typed numbers"""
+    if a == b:
+        return True
+    a, b = strip_identity(a), strip_identity(b)
+    if isinstance(a, bool) or isinstance(b, bool):
+        return str(a).lower() == str(b).lower()
+    return str(a) == str(b)
+
+
+class ConfigDelta:
+    """Computes the set commands that turn a running config into the golden one.
+
+    Both configs are walked once in parallel. Containers are matched by name with
+    module prefixes stripped, keyed lists are indexed by their keys, so the work
+    is linear in the size of the configs. Equal subtrees are not descended into.
+    Every difference is reported at the highest node where it occurs: a missing
+    list entry is one update with the whole entry and an extra one is one delete.
+    """
+
+    def __init__(self, list_keys=None, ignore_paths=None):
+        self.list_keys = list_keys or {}
+        self.ignore = [glob_to_regex(p) for p in ignore_paths or []]
+        self.update, self.replace, self.delete = [], [], []
+        self._keys = {}
+
+    def ignored(self, path):
+        """Whether the path matches an ignore pattern"""
+        return bool(self.ignore) and any(regex.fullmatch(path) for regex in self.ignore)
+
+    def compare(self, golden, running, path="/"):
+        """Compare golden with running rooted at path, returns self"""
+        self._compare_node(golden, running, path.rstrip("/"))
+        return self
+
+    def commands(self):
+        """The delta as `config` module options"""
+        return {
+            "delete": [{"path": path} for path in self.delete],
+            "replace": self.replace,
+            "update": self.update,
+        }
+
+    def _compare_node(self, golden, running, path):
+        if golden == running:
+            return
+        if isinstance(golden, dict) and isinstance(running, dict):
+            self._compare_container(golden, running, path)
+        elif isinstance(golden, list) and isinstance(running, list):
+            self._compare_leaf_list(golden, running, path)
+        elif isinstance(golden, (dict, list)) or isinstance(running, (dict, list)):
+            self.replace.append({"path": path or "/", "value": golden})
+        elif not same_scalar(golden, running):
+            self.update.append({"path": path or "/", "value": golden})
+
+    def _compare_container(self, golden, running, path):
+        running_names = {key.split(":", 1)[-1]: key for key in running}
+        golden_names = set()
+        for key, value in golden.items():
+            name = key.split(":", 1)[-1]
+            golden_names.add(name)
+            child = f"{path}/{name}"
+            if self.ignored(child):
+                continue
+            if name not in running_names:
+                if isinstance(value, list) and value and isinstance(value[0], dict):
+                    self._compare_list(name, value, [], path)
+                else:
+                    self.update.append({"path": child, "value": value})
+                continue
+            other = running[running_names[name]]
+            if value == other:
+                # identical subtrees are skipped at C speed, most of a compliant config
+                continue
+            if isinstance(value, list) and isinstance(other, list) and (
+                (value and isinstance(value[0], dict))
+                or (other and isinstance(other[0], dict))
+            ):
+                self._compare_list(name, value, other, path)
+            else:
+                self._compare_node(value, other, child)
+
+        for name, key in running_names.items():
+            child = f"{path}/{name}"
+            if name in golden_names or self.ignored(child):
+                continue
+            value = running[key]
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                self._compare_list(name, [], value, path)
+            else:
+                self.delete.append(child)
+
+    def _compare_list(self, name, golden, running, path):
+        entries = golden + running
+        # the same list appears under every parent entry, try the keys found last time first
+        keys = self._keys.get(name)
+        if keys is None or not all(
+            isinstance(e, dict) and all(k in e for k in keys) for e in entries
+        ):
+            keys = self._keys[name] = list_key(name, entries, self.list_keys)
+        if keys is None:
+            # unkeyed lists are only comparable as a whole
+            if golden != running:
+                self.replace.append({"path": f"{path}/{name}", "value": golden})
+            return
+
+        def entry_path(entry):
+            return f"{path}/{name}" + "".join(format_key(k, entry[k]) for k in keys)
+
+        def index(entries):
+            return {tuple(str(e[k]) for k in keys): e for e in entries}
+
+        running_index = index(running)
+        golden_index = index(golden)
+        for key, entry in golden_index.items():
+            child = entry_path(entry)
+            if self.ignored(child):
+                continue
+            if key not in running_index:
+                self.update.append({"path": child, "value": entry})
+            elif entry != running_index[key]:
+                self._compare_container(entry, running_index[key], child)
+        for key, entry in running_index.items():
+            if key not in golden_index:
+                child = entry_path(entry)
+                if not self.ignored(child):
+                    self.delete.append(child)
+
+    def _compare_leaf_list(self, golden, running, path):
+        if len(golden) != len(running) or not all(
+            same_scalar(a, b) for a, b in zip(golden, running)
+        ):
+            self.replace.append({"path": path or "/", "value": golden})
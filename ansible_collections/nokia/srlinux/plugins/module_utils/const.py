@@ -13,3 +13,10 @@ TOOLS_DATASTORE: str = "tools"
 
 # configuration save path
 SAVE_CONFIG_PATH: str = "/system/configuration/save"
+
+# ids of the commits of the device, the last one tells whether the config changed
+COMMIT_ID_PATH: str = "/system/configuration/commit[id=*]/id"
+
+# key leaves whose values are numbers in JSON, e.g. the subinterface index; the values
+# of other keys are strings even when all digits, e.g. a policy statement name=10
+NUMERIC_KEYS = frozenset(("index", "sequence-id", "vlan-id"))
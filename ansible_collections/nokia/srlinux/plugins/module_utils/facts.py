@@ -0,0 +1,70 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Gather subsets of the facts module and reuse of facts gathered before.
+
+The facts module returns its facts with the commit id of the device and the
+time they were gathered at. The facts action plugin looks them up in the facts
+Ansible has of the host, from an earlier play or from the fact cache, and the
+module skips gathering while they are younger than cache_ttl and the device
+is still at the same commit.
+"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import time
+
+SUBSETS = ("system", "interfaces", "network_instances", "lldp")
+# always gathered, it holds the commit id that validates cached facts
+MIN_SUBSETS = ("system",)
+
+
+def resolve_subsets(gather_subset):
+    """Subsets to gather for a gather_subset option.
+
+    Takes subset names, `all`, `min` and exclusions with a `!` prefix. Only
+    exclusions exclude from all subsets, the min subsets are always gathered.
+    """
+    include, exclude = set(), set()
+    for item in gather_subset or ["all"]:
+        negate = item.startswith("!")
+        name = item[1:] if negate else item
+        if name == "all":
+            names = set(SUBSETS)
+        elif name == "min":
+            names = set(MIN_SUBSETS)
+        elif name in SUBSETS:
+            names = {name}
+        else:
+            raise ValueError(
+                f"unknown gather_subset {item}, expected all, min or one of {', '.join(SUBSETS)}"
+            )
+        (exclude if negate else include).update(names)
+    if not include:
+        include = set(SUBSETS)
+    return [s for s in SUBSETS if s in (include - exclude) or s in MIN_SUBSETS]
+
+
+def cached_facts(facts, subsets, ttl, now=None):
+    """Facts gathered before covering subsets and younger than ttl seconds, None otherwise.
+
+    facts are the ansible_facts of the host, whose keys Ansible stores without
+    the ansible_ prefix; the returned facts have it back.
+    """
+    if not ttl:
+        return None
+    gathered_at = facts.get("net_gathered_at")
+    if not isinstance(gathered_at, (int, float)):
+        return None
+    if (now if now is not None else time.time()) - gathered_at >= ttl:
+        return None
+    if facts.get("net_commit_id") is None:
+        return None
+    if not set(subsets) <= set(facts.get("net_gather_subset") or []):
+        return None
+    return {f"ansible_{key}": value for key, value in facts.items() if key.startswith("net_")}
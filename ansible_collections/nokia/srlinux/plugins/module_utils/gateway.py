@@ -0,0 +1,469 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Local gateway keeping device connections open across playbook runs.
+
+Every ansible-playbook run starts new persistent connection processes, and with
+them new connections and TLS handshakes to every device. The gateway is a daemon
+on a Unix socket, started by the httpapi plugin on first use, holding a pool of
+keep-alive connections per device for all runs of the controller user. The
+plugin sends its requests, headers included, through the gateway, which keeps
+no credentials of its own.
+
+Requests to one device use at most max_per_device connections at a time, more
+wait for a free one. The gateway exits after idle_timeout seconds without
+requests. Its stats, per device, are one command away:
+
+    python -m ansible_collections.nokia.srlinux.plugins.module_utils.gateway stats
+
+or, without the collection on the Python path:
+
+    echo '{"op": "stats"}' | nc -U ~/.ansible/srlinux_gateway/gateway.sock
+
+Requests and responses are JSON lines, bodies are passed as text.
+"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import argparse
+import fcntl
+import http.client
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+from ansible_collections.nokia.srlinux.plugins.module_utils.keepalive import (
+    KeepAliveConnection,
+    dropped,
+    make_context,
+)
+
+DEFAULT_SOCKET = "~/.ansible/srlinux_gateway/gateway.sock"
+DEFAULT_IDLE_TIMEOUT = 600
+DEFAULT_MAX_PER_DEVICE = 4
+# seconds to wait for a started gateway to listen
+START_TIMEOUT = 10
+
+# the collection root the gateway is started from, <root>/ansible_collections/nokia/srlinux/...
+COLLECTIONS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), *[os.pardir] * 5))
+MODULE = "ansible_collections.nokia.srlinux.plugins.module_utils.gateway"
+
+
+class GatewayError(Exception):
+    """Gateway could not be reached or could not send the request"""
+
+
+def _text(data):
+    """Body bytes as text, bytes invalid in UTF-8 survive the round trip"""
+    if isinstance(data, str):
+        return data
+    return (data or b"").decode("utf-8", "surrogateescape")
+
+
+def _bytes(text):
+    return text.encode("utf-8", "surrogateescape")
+
+
+def device_name(device):
+    """user@host:port of a device"""
+    return f"{device.get('user') or ''}@{device['host']}:{device['port']}"
+
+
+class DevicePool:
+    """Kept connections to one device, at most limit of them in use at a time"""
+
+    def __init__(self, device, limit):
+        self.device = device
+        self.limit = limit
+        self.context = None
+        if device.get("use_ssl"):
+            self.context = make_context(
+                validate_certs=device.get("validate_certs", True),
+                ca_path=device.get("ca_path"),
+                client_cert=device.get("client_cert"),
+                client_key=device.get("client_key"),
+                ciphers=device.get("ciphers"),
+            )
+        self.slots = threading.BoundedSemaphore(limit)
+        self.lock = threading.Lock()
+        self.idle = []
+        # the TLS session new connections resume
+        self.session = None
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "waits": 0,
+            "connections": 0,
+            "handshakes": 0,
+            "resumed": 0,
+            "in_use": 0,
+            "peak_in_use": 0,
+        }
+
+    def _acquire(self):
+        if self.slots.acquire(blocking=False):
+            return
+        with self.lock:
+            self.stats["waits"] += 1
+        timeout = self.device.get("timeout") or 30
+        if not self.slots.acquire(timeout=timeout):
+            raise TimeoutError(
+                f"no free connection to {device_name(self.device)} within {timeout}s, "
+                f"{self.limit} in use"
+            )
+
+    def request(self, method, path, body, headers):
+        """Status and body of a request, with whether it took a handshake and resumed a session"""
+        self._acquire()
+        with self.lock:
+            conn = self.idle.pop() if self.idle else None
+            self.stats["requests"] += 1
+            self.stats["in_use"] += 1
+            self.stats["peak_in_use"] = max(self.stats["peak_in_use"], self.stats["in_use"])
+        if conn is None:
+            conn = KeepAliveConnection(
+                self.device["host"],
+                self.device["port"],
+                use_ssl=self.device.get("use_ssl"),
+                context=self.context,
+                timeout=self.device.get("timeout") or 30,
+            )
+            conn.session = self.session
+            with self.lock:
+                self.stats["connections"] += 1
+        handshakes, resumed = conn.handshakes, conn.resumed
+        try:
+            status, data = conn.request(method, path, _bytes(body), headers)
+        except Exception:
+            with self.lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self.lock:
+                self.stats["handshakes"] += conn.handshakes - handshakes
+                self.stats["resumed"] += conn.resumed - resumed
+                self.stats["in_use"] -= 1
+                if conn.session is not None:
+                    self.session = conn.session
+                self.idle.append(conn)
+            self.slots.release()
+        return status, data, conn.handshakes > handshakes, conn.resumed > resumed
+
+    def close(self):
+        """Close the idle connections"""
+        with self.lock:
+            for conn in self.idle:
+                conn.close()
+            self.idle = []
+
+
+class GatewayHandler(socketserver.StreamRequestHandler):
+    """One client, a persistent connection process, sending JSON lines"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {"error": f"invalid request: {e}"}
+            else:
+                response = self.server.dispatch(request)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class GatewayServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Pools of device connections behind a Unix socket"""
+
+    daemon_threads = True
+
+    def __init__(self, path, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_per_device=DEFAULT_MAX_PER_DEVICE):
+        super().__init__(path, GatewayHandler)
+        self.idle_timeout = idle_timeout
+        self.max_per_device = max_per_device
+        self.pools = {}
+        self.lock = threading.Lock()
+        self.active = 0
+        self.requests = 0
+        self.started = time.time()
+        self.last_activity = time.monotonic()
+
+    def pool(self, device):
+        """Pool of a device, devices differ in any connection option but the timeout"""
+        key = json.dumps({k: v for k, v in device.items() if k != "timeout"}, sort_keys=True)
+        with self.lock:
+            if key not in self.pools:
+                self.pools[key] = DevicePool(device, self.max_per_device)
+            return self.pools[key]
+
+    def dispatch(self, request):
+        """Response to a request of a client"""
+        op = request.get("op")
+        if op == "stats":
+            return self.stats()
+        if op == "stop":
+            threading.Thread(target=self.shutdown).start()
+            return {"stopping": True}
+        if op != "request":
+            return {"error": f"unknown op: {op}"}
+
+        with self.lock:
+            self.active += 1
+            self.requests += 1
+        try:
+            status, data, handshake, resumed = self.pool(request["device"]).request(
+                request["method"], request["path"], request.get("body"), request.get("headers") or {}
+            )
+            return {"status": status, "body": _text(data), "handshake": handshake, "resumed": resumed}
+        except (OSError, http.client.HTTPException, KeyError, ValueError) as e:
+            return {"error": str(e) or type(e).__name__}
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.last_activity = time.monotonic()
+
+    def stats(self):
+        """Counters of the gateway and of every device"""
+        with self.lock:
+            pools = list(self.pools.values())
+            stats = {
+                "pid": os.getpid(),
+                "uptime": round(time.time() - self.started, 1),
+                "idle": round(time.monotonic() - self.last_activity, 1),
+                "idle_timeout": self.idle_timeout,
+                "max_per_device": self.max_per_device,
+                "requests": self.requests,
+                "active": self.active,
+            }
+        devices = {}
+        for pool in pools:
+            with pool.lock:
+                devices[device_name(pool.device)] = dict(pool.stats, idle_connections=len(pool.idle))
+        stats["devices"] = devices
+        return stats
+
+    def watch_idle(self):
+        """Shut down after idle_timeout seconds without requests"""
+        while True:
+            time.sleep(min(self.idle_timeout, 5))
+            with self.lock:
+                idle = not self.active and time.monotonic() - self.last_activity > self.idle_timeout
+            if idle:
+                self.shutdown()
+                return
+
+    def close_pools(self):
+        """Close the kept connections of all devices"""
+        for pool in list(self.pools.values()):
+            pool.close()
+
+
+def serve(path, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_per_device=DEFAULT_MAX_PER_DEVICE):
+    """Serve on path until idle or stopped, unless another gateway already does"""
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    with open(path + ".lock", "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # a gateway started by another client at the same time
+            return 0
+        if os.path.exists(path):
+            # left behind by a gateway that was killed
+            os.unlink(path)
+        umask = os.umask(0o177)
+        try:
+            server = GatewayServer(path, idle_timeout, max_per_device)
+        finally:
+            os.umask(umask)
+        threading.Thread(target=server.watch_idle, daemon=True).start()
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+            server.server_close()
+            server.close_pools()
+    return 0
+
+
+def start(path, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_per_device=DEFAULT_MAX_PER_DEVICE):
+    """Start a gateway in the background, its output goes to <path>.log"""
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (COLLECTIONS_ROOT, env.get("PYTHONPATH")) if p
+    )
+    with open(path + ".log", "a") as log:
+        # returns once the gateway forked into the background
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                MODULE,
+                "serve",
+                "--daemon",
+                "--socket",
+                path,
+                "--idle-timeout",
+                str(idle_timeout),
+                "--max-per-device",
+                str(max_per_device),
+            ],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            check=False,
+        )
+
+
+class GatewayConnection:
+    """KeepAliveConnection lookalike sending the requests of one device through the gateway.
+
+    The gateway is started when nothing listens on path.
+    """
+
+    def __init__(self, path, device, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_per_device=DEFAULT_MAX_PER_DEVICE):
+        self.path = os.path.expanduser(path)
+        self.device = device
+        self.host = device["host"]
+        self.port = device["port"]
+        self.use_ssl = device.get("use_ssl")
+        self.idle_timeout = idle_timeout
+        self.max_per_device = max_per_device
+        self.sock = None
+        self.rfile = None
+        self.handshakes = 0
+        self.resumed = 0
+
+    def _open(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        self.rfile = sock.makefile("rb")
+
+    def _connect(self):
+        try:
+            self._open()
+            return
+        except (FileNotFoundError, ConnectionRefusedError):
+            start(self.path, self.idle_timeout, self.max_per_device)
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            try:
+                self._open()
+                return
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                if time.monotonic() > deadline:
+                    raise GatewayError(
+                        f"gateway did not start on {self.path}, see {self.path}.log"
+                    ) from e
+                time.sleep(0.05)
+
+    def call(self, request):
+        """Response of the gateway to a request"""
+        line = json.dumps(request).encode("utf-8") + b"\n"
+        # the gateway idled out since the last request, send it to a new one
+        if self.sock is not None and dropped(self.sock):
+            self.close()
+        for attempt in range(2):
+            reused = self.sock is not None
+            if self.sock is None:
+                self._connect()
+            try:
+                self.sock.sendall(line)
+            except OSError as e:
+                self.close()
+                if attempt or not reused:
+                    raise GatewayError(f"gateway on {self.path} closed the connection") from e
+                continue
+            # once sent, the gateway may have passed the request on to the device
+            try:
+                response = self.rfile.readline()
+            except OSError:
+                response = None
+            if response:
+                return json.loads(response)
+            self.close()
+            raise GatewayError(f"gateway on {self.path} closed the connection")
+        return None
+
+    def request(self, method, path, body, headers):
+        """Status and body of a request"""
+        response = self.call(
+            {
+                "op": "request",
+                "device": self.device,
+                "method": method,
+                "path": path,
+                "body": _text(body),
+                "headers": headers,
+            }
+        )
+        if "error" in response:
+            raise GatewayError(response["error"])
+        self.handshakes += response["handshake"]
+        self.resumed += response["resumed"]
+        return response["status"], _bytes(response["body"])
+
+    def close(self):
+        """Close the connection to the gateway, the gateway keeps running"""
+        if self.sock is not None:
+            self.rfile.close()
+            self.sock.close()
+            self.sock = None
+            self.rfile = None
+
+
+def _call(path, request):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(os.path.expanduser(path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as rfile:
+            return json.loads(rfile.readline())
+    finally:
+        sock.close()
+
+
+def main():
+    """Serve, or show the stats of or stop a running gateway"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("command", choices=("serve", "stats", "stop"))
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--idle-timeout", type=int, default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument("--max-per-device", type=int, default=DEFAULT_MAX_PER_DEVICE)
+    parser.add_argument("--daemon", action="store_true", help="fork into the background")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        if args.daemon:
+            if os.fork():
+                return 0
+            os.setsid()
+        return serve(args.socket, args.idle_timeout, args.max_per_device)
+    try:
+        print(json.dumps(_call(args.socket, {"op": args.command}), indent=2))
+    except (FileNotFoundError, ConnectionRefusedError, ConnectionResetError):
+        print(f"no gateway running on {args.socket}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
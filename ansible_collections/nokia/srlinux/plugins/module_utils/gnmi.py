@@ -0,0 +1,321 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""gNMI transport for the get and set requests of the modules.
+
+`GnmiClient` takes the same JSON-RPC payloads as `JSONRPCClient.post` and returns
+responses of the same shape, modules only choose the client with `transport_client`.
+Gets of the running and state datastores and sets of the candidate datastore go
+over gNMI Get and Set with JSON_IETF encoded values: protobuf framing over HTTP/2
+instead of JSON-RPC envelopes over HTTP/1.1, and a gRPC channel per module run.
+Everything gNMI has no equivalent for, diff, validate, cli, the candidate and
+tools datastores of get, tools sets and commits with a confirm timeout, goes
+over the JSON-RPC connection as before.
+
+Requires grpcio and pygnmi, for the gNMI protobuf bindings, on the controller.
+"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import json
+import ssl
+import traceback
+
+from ansible.module_utils.basic import missing_required_lib
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+    NUMERIC_KEYS,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    JSONRPCClient,
+    split_path,
+)
+
+GNMI_IMPORT_ERROR = None
+try:
+    import grpc
+    from cryptography import x509
+    from pygnmi.spec.v080 import gnmi_pb2, gnmi_pb2_grpc
+except ImportError:
+    GNMI_IMPORT_ERROR = traceback.format_exc()
+
+DEFAULT_GNMI_PORT = 57400
+# a full config easily exceeds the 4 MiB gRPC default
+MAX_MESSAGE_LENGTH = 512 * 2**20
+
+ORIGINS = {"srl": "", "oc": "openconfig"}
+DATA_TYPES = {"running": "CONFIG", "state": "ALL"}
+
+
+class GnmiError(Exception):
+    """gNMI request failed, with the numeric gRPC status code"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def to_gnmi_path(path, origin=""):
+    """gNMI Path of an SR Linux path"""
+    return gnmi_pb2.Path(
+        origin=origin,
+        elem=[gnmi_pb2.PathElem(name=name, key=keys) for name, keys in split_path(path)],
+    )
+
+
+def from_gnmi_path(prefix, path):
+    """(name, keys) elements of a gNMI path under its notification prefix"""
+    return [
+        (elem.name.split(":", 1)[-1], dict(elem.key))
+        for elem in list(prefix.elem) + list(path.elem)
+    ]
+
+
+def decode_value(val):
+    """Python value of a TypedValue"""
+    kind = val.WhichOneof("value")
+    if kind in ("json_ietf_val", "json_val"):
+        return json.loads(getattr(val, kind))
+    if kind == "leaflist_val":
+        return [decode_value(v) for v in val.leaflist_val.element]
+    if kind in ("decimal_val", "any_val"):
+        raise GnmiError(12, f"UNIMPLEMENTED: unsupported value encoding {kind}")
+    return getattr(val, kind) if kind else None
+
+
+def _key_value(key, value):
+    return int(value) if key in NUMERIC_KEYS and value.isdigit() else value
+
+
+def place(tree, elems, value):
+    """Put value at elems in tree, list entries are found or added by their keys"""
+    node = tree
+    for i, (name, keys) in enumerate(elems):
+        last = i == len(elems) - 1
+        if keys:
+            entries = node.setdefault(name, [])
+            entry = next(
+                (e for e in entries if all(str(e.get(k)) == v for k, v in keys.items())),
+                None,
+            )
+            if entry is None:
+                entry = {k: _key_value(k, v) for k, v in keys.items()}
+                entries.append(entry)
+            node = entry
+            if last and isinstance(value, dict):
+                node.update(value)
+        elif last:
+            if isinstance(value, dict) and isinstance(node.get(name), dict):
+                node[name].update(value)
+            else:
+                node[name] = value
+        else:
+            node = node.setdefault(name, {})
+    return tree
+
+
+def assemble(request_elems, updates):
+    """Get result of a path from its gNMI updates, shaped like the JSON-RPC result.
+
+    JSON-RPC returns the addressed node itself, or the data rooted at the first
+    wildcarded list of the path.
+    """
+    wildcard = next(
+        (i for i, (_, keys) in enumerate(request_elems) if "*" in keys.values()), None
+    )
+    root = len(request_elems) if wildcard is None else wildcard
+    tree = {}
+    for elems, value in updates:
+        if elems == request_elems:
+            # the device answered with the whole addressed node
+            return value
+        place(tree, elems[root:], value)
+    return tree
+
+
+def certificate_name(pem):
+    """Host name a PEM certificate is valid for, from its SANs or else its CN"""
+    cert = x509.load_pem_x509_certificate(pem)
+    try:
+        san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+        names = san.get_values_for_type(x509.DNSName)
+        names += [str(address) for address in san.get_values_for_type(x509.IPAddress)]
+    except x509.ExtensionNotFound:
+        names = []
+    names += [a.value for a in cert.subject.get_attributes_for_oid(x509.NameOID.COMMON_NAME)]
+    if not names:
+        return None
+    # a wildcard name matches any single label in its place
+    return "srlinux" + names[0][1:] if names[0].startswith("*.") else names[0]
+
+
+class GnmiSession:
+    """gNMI Get and Set of one device"""
+
+    def __init__(
+        self,
+        host,
+        port=DEFAULT_GNMI_PORT,
+        username=None,
+        password=None,
+        use_ssl=True,
+        validate_certs=True,
+        ca_path=None,
+        timeout=30,
+    ):
+        self.target = f"{host}:{port}"
+        self.timeout = timeout
+        self.metadata = [("username", username or ""), ("password", password or "")]
+        options = [
+            ("grpc.max_receive_message_length", MAX_MESSAGE_LENGTH),
+            ("grpc.max_send_message_length", MAX_MESSAGE_LENGTH),
+        ]
+        if not use_ssl:
+            self.channel = grpc.insecure_channel(self.target, options=options)
+        else:
+            root = None
+            if ca_path:
+                with open(ca_path, "rb") as f:
+                    root = f.read()
+            elif not validate_certs:
+                # gRPC always verifies, trust the certificate the device presents and
+                # check the name against the name it is issued for rather than host
+                root = ssl.get_server_certificate((host, port)).encode("ascii")
+                name = certificate_name(root)
+                if name:
+                    options.append(("grpc.ssl_target_name_override", name))
+            self.channel = grpc.secure_channel(
+                self.target, grpc.ssl_channel_credentials(root_certificates=root), options=options
+            )
+        self.stub = gnmi_pb2_grpc.gNMIStub(self.channel)
+
+    def _call(self, rpc, request):
+        try:
+            return rpc(request, metadata=self.metadata, timeout=self.timeout)
+        except grpc.RpcError as e:
+            raise GnmiError(e.code().value[0], f"{e.code().name}: {e.details()}") from e
+
+    def get(self, path, datastore="state", yang_models="srl"):
+        """Value at path, shaped like the result of a JSON-RPC get command"""
+        request = gnmi_pb2.GetRequest(
+            path=[to_gnmi_path(path, ORIGINS[yang_models or "srl"])],
+            type=gnmi_pb2.GetRequest.DataType.Value(DATA_TYPES[datastore]),
+            encoding=gnmi_pb2.Encoding.Value("JSON_IETF"),
+        )
+        response = self._call(self.stub.Get, request)
+        updates = [
+            (from_gnmi_path(n.prefix, u.path), decode_value(u.val))
+            for n in response.notification
+            for u in n.update
+        ]
+        return assemble(split_path(path), updates)
+
+    def set(self, commands, yang_models="srl"):
+        """Apply JSON-RPC set commands as one gNMI Set transaction.
+
+        gNMI applies the deletes first, then the replaces and the updates, the
+        order the config module sends them in.
+        """
+        origin = ORIGINS[yang_models or "srl"]
+        request = gnmi_pb2.SetRequest()
+        for cmd in commands:
+            path = to_gnmi_path(cmd["path"], origin)
+            if cmd["action"] == "delete":
+                request.delete.append(path)
+                continue
+            update = gnmi_pb2.Update(
+                path=path,
+                val=gnmi_pb2.TypedValue(json_ietf_val=json.dumps(cmd.get("value")).encode("utf-8")),
+            )
+            getattr(request, cmd["action"]).append(update)
+        self._call(self.stub.Set, request)
+
+    def close(self):
+        """Close the channel"""
+        self.channel.close()
+
+
+def gnmi_capable(method, params):
+    """Whether a JSON-RPC request can go over gNMI"""
+    if method == "get":
+        return all(
+            cmd.get("datastore", "running") in DATA_TYPES for cmd in params.get("commands", [])
+        )
+    if method == "set":
+        return params.get("datastore", "candidate") == "candidate" and not params.get(
+            "confirm-timeout"
+        )
+    return False
+
+
+class GnmiClient:
+    """JSONRPCClient lookalike sending gets and sets over gNMI"""
+
+    def __init__(self, module):
+        if GNMI_IMPORT_ERROR:
+            module.fail_json(
+                msg=missing_required_lib("grpcio and pygnmi"), exception=GNMI_IMPORT_ERROR
+            )
+        self.module = module
+        self.jsonrpc = JSONRPCClient(module)
+        self.connection = self.jsonrpc.connection
+        self._session = None
+
+    @property
+    def session(self):
+        """gNMI session, opened with the host and credentials of the httpapi connection"""
+        if self._session is None:
+            option = self.connection.get_option
+            self._session = GnmiSession(
+                option("host"),
+                port=self.module.params.get("gnmi_port") or DEFAULT_GNMI_PORT,
+                username=option("remote_user"),
+                password=option("password"),
+                use_ssl=option("use_ssl"),
+                validate_certs=option("validate_certs"),
+                ca_path=option("ca_path"),
+                timeout=option("persistent_command_timeout"),
+            )
+        return self._session
+
+    def post(self, url="/jsonrpc", payload=None, **kwargs):
+        """JSON-RPC POST request, gets and sets gNMI can express go over gNMI"""
+        request = json.loads(payload)
+        method = request.get("method")
+        params = request.get("params") or {}
+        if not gnmi_capable(method, params):
+            return self.jsonrpc.post(url, payload=payload, **kwargs)
+
+        response = {"jsonrpc": JSON_RPC_VERSION, "id": request.get("id")}
+        try:
+            if method == "get":
+                response["result"] = [
+                    self.session.get(
+                        cmd["path"],
+                        cmd.get("datastore", "running"),
+                        cmd.get("yang-models") or params.get("yang-models"),
+                    )
+                    for cmd in params.get("commands", [])
+                ]
+            else:
+                try:
+                    self.session.set(params.get("commands", []), params.get("yang-models"))
+                finally:
+                    # the commit bypasses the connection, which caches show command results
+                    self.connection.clear_cli_cache()
+                response["result"] = [{}]
+        except GnmiError as e:
+            response["error"] = {"code": e.code, "message": f"gNMI {method} failed: {e}"}
+        return response
+
+
+def transport_client(module):
+    """Client of the transport chosen with the transport option"""
+    if module.params.get("transport") == "gnmi":
+        return GnmiClient(module)
+    return JSONRPCClient(module)
@@ -0,0 +1,138 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Keep-alive HTTP(S) connection of the httpapi plugin to one device.
+
+The httpapi connection opens a new connection, with a full TLS handshake, for
+every request. `KeepAliveConnection` keeps one connection to the device open in
+the persistent connection process across requests and tasks, and resumes the TLS
+session of the last connection when it has to reconnect, e.g. after the device
+closed an idle connection.
+
+TLS sessions live as long as the persistent connection process, the ssl module
+has no way to save them to disk for later runs.
+"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import http.client
+import select
+import ssl
+
+
+def make_context(validate_certs=True, ca_path=None, client_cert=None, client_key=None, ciphers=None):
+    """SSL context of the connection options of the httpapi connection"""
+    if validate_certs:
+        context = ssl.create_default_context(cafile=ca_path)
+    else:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if client_cert:
+        context.load_cert_chain(client_cert, client_key)
+    if ciphers:
+        context.set_ciphers(":".join(ciphers))
+    return context
+
+
+def dropped(sock):
+    """Whether the peer closed an idle connection, which has nothing to read otherwise"""
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class ResumingHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPS connection resuming a TLS session"""
+
+    def __init__(self, host, port=None, session=None, **kwargs):
+        super().__init__(host, port, **kwargs)
+        self.tls_session = session
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        self.sock = self._context.wrap_socket(
+            self.sock, server_hostname=self.host, session=self.tls_session
+        )
+
+
+class KeepAliveConnection:
+    """One kept open connection to a device, reconnected when the device closed it"""
+
+    # a kept connection the device closed fails while sending, the request is sent again
+    STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+    def __init__(self, host, port, use_ssl=True, context=None, timeout=30):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.context = context
+        self.timeout = timeout
+        self.conn = None
+        self.session = None
+        self.handshakes = 0
+        self.resumed = 0
+
+    def _connect(self):
+        if self.use_ssl:
+            conn = ResumingHTTPSConnection(
+                self.host, self.port, session=self.session, context=self.context, timeout=self.timeout
+            )
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        conn.connect()
+        if self.use_ssl:
+            self.handshakes += 1
+            self.resumed += conn.sock.session_reused
+        return conn
+
+    def request(self, method, path, body, headers):
+        """Status and body of a request.
+
+        The request is only sent again when sending it on a kept connection failed.
+        Once the device may have received it, e.g. the connection is reset while
+        waiting for the response, the error is raised, sets are not idempotent.
+        """
+        if self.conn is not None and dropped(self.conn.sock):
+            self.close()
+        for attempt in range(2):
+            reused = self.conn is not None
+            if self.conn is None:
+                self.conn = self._connect()
+            # getresponse drops the socket of a connection the device closes after the response
+            sock = self.conn.sock
+            try:
+                self.conn.request(method, path, body, headers)
+            except self.STALE_ERRORS:
+                self.close()
+                if attempt or not reused:
+                    raise
+                continue
+            except (OSError, http.client.HTTPException):
+                self.close()
+                raise
+            try:
+                response = self.conn.getresponse()
+                if self.use_ssl:
+                    self.session = sock.session
+                data = response.read()
+            except (OSError, http.client.HTTPException):
+                self.close()
+                raise
+            if response.will_close:
+                self.close()
+            return response.status, data
+        return None
+
+    def close(self):
+        """Close the connection, its TLS session is kept for the next one"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
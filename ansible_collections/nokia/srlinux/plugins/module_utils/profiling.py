@@ -0,0 +1,137 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Opt-in cProfile and tracemalloc profiling of module runs.
+
+Every module's main() is wrapped with `profiled`. Nothing happens unless the
+SRLINUX_PROFILE_DIR environment variable is set on the controller, where the modules
+of this collection run:
+
+    SRLINUX_PROFILE_DIR=/tmp/srl-profile ansible-playbook site.yml
+
+Each module run then writes, under <SRLINUX_PROFILE_DIR>/<host>/:
+
+    <time>-<module>[-<tag>].pstats  cProfile stats, for pstats or snakeviz
+    <time>-<module>[-<tag>].txt     the top functions by cumulative time and,
+                                    with SRLINUX_PROFILE_MEMORY=1, the top allocators
+
+Modules don't know the name of their task, set SRLINUX_PROFILE_TAG with the
+`environment` keyword of a task to tell runs of the same module apart.
+"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import functools
+import io
+import json
+import os
+import re
+from datetime import datetime
+
+PROFILE_DIR_ENV = "SRLINUX_PROFILE_DIR"
+PROFILE_MEMORY_ENV = "SRLINUX_PROFILE_MEMORY"
+PROFILE_TAG_ENV = "SRLINUX_PROFILE_TAG"
+
+TOP_FUNCTIONS = 40
+TOP_ALLOCATORS = 25
+
+_UNSAFE_RE = re.compile(r"[^\w.-]+")
+
+
+def _module_args():
+    """Arguments of the running module, as passed by Ansible"""
+    # pylint: disable=import-outside-toplevel
+    from ansible.module_utils import basic
+
+    try:
+        return json.loads(basic._ANSIBLE_ARGS)["ANSIBLE_MODULE_ARGS"]
+    except (TypeError, ValueError, KeyError):
+        return {}
+
+
+def _target_host(args):
+    """Host the module talked to, localhost for modules without a connection"""
+    socket_path = args.get("_ansible_socket")
+    if not socket_path:
+        return "localhost"
+    # pylint: disable=import-outside-toplevel
+    from ansible.module_utils.connection import Connection, ConnectionError
+
+    try:
+        return Connection(socket_path).get_option("host") or "unknown"
+    except (ConnectionError, OSError):
+        return "unknown"
+
+
+def _write_report(path, profiler, snapshot, peak):
+    # pylint: disable=import-outside-toplevel
+    import pstats
+
+    profiler.dump_stats(path + ".pstats")
+    out = io.StringIO()
+    # modules run from a zip in a temporary directory, its path is only noise here
+    stats = pstats.Stats(profiler, stream=out).strip_dirs()
+    stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    if snapshot is not None:
+        out.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n\n")
+        out.write(f"Top {TOP_ALLOCATORS} allocators by size:\n")
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATORS]:
+            frame = stat.traceback[0]
+            out.write(
+                f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  "
+                f"{os.path.basename(frame.filename)}:{frame.lineno}\n"
+            )
+    with open(path + ".txt", "w") as f:
+        f.write(out.getvalue())
+
+
+def profiled(main):
+    """Profile main() when SRLINUX_PROFILE_DIR is set, call it as is otherwise"""
+
+    @functools.wraps(main)
+    def wrapper(*args, **kwargs):
+        profile_dir = os.environ.get(PROFILE_DIR_ENV)
+        if not profile_dir:
+            return main(*args, **kwargs)
+
+        # pylint: disable=import-outside-toplevel
+        import cProfile
+        import tracemalloc
+
+        memory = os.environ.get(PROFILE_MEMORY_ENV, "") not in ("", "0")
+        if memory:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        started = datetime.now()
+        try:
+            # exit_json and fail_json end the module with SystemExit
+            return profiler.runcall(main, *args, **kwargs)
+        finally:
+            snapshot, peak = None, 0
+            if memory:
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            margs = _module_args()
+            name = started.strftime("%Y%m%dT%H%M%S.%f")
+            name += "-" + (margs.get("_ansible_module_name") or main.__module__).split(".")[-1]
+            if os.environ.get(PROFILE_TAG_ENV):
+                name += "-" + os.environ[PROFILE_TAG_ENV]
+            host_dir = os.path.join(
+                os.path.expanduser(profile_dir), _UNSAFE_RE.sub("_", _target_host(margs))
+            )
+            try:
+                os.makedirs(host_dir, exist_ok=True)
+                _write_report(
+                    os.path.join(host_dir, _UNSAFE_RE.sub("_", name)), profiler, snapshot, peak
+                )
+            except OSError:
+                # profiling must never fail the task
+                pass
+
+    return wrapper
@@ -0,0 +1,391 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Path-indexed view of the results of a get request.
+
+A get returns one result per path, in a list or, from some callers, as a
+single result. A path without wildcards returns the addressed node itself, a
+path with wildcard keys the data rooted at the first wildcarded list, or
+higher up. GetResponse takes care of both and resolves any path below the
+requested ones, e.g. `/interface[name=ethernet-1/1]/subinterface[index=0]`,
+in steps of the path rather than by scanning lists.
+
+Keyed lists are kept as a Table, with one column per leaf and the leaves of
+nested containers flattened into columns of their own, instead of a dict per
+entry and container. Entries become Records, with one slot per leaf or
+container, only when they are looked up, and a Table indexes its entries by
+key the first time one is looked up by key. For lists of 100k entries this
+takes a fraction of the memory of the decoded response, which can be dropped
+once the view is built.
+"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import itertools
+import keyword
+
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    split_path,
+)
+
+# unset leaves of Table columns, and paths that resolve to nothing
+_MISSING = object()
+
+
+def _name(name):
+    """Name without its module prefix"""
+    return name.split(":", 1)[-1]
+
+
+def _attribute(name):
+    """Python attribute of a YANG name"""
+    attribute = name.replace("-", "_").replace(".", "_")
+    if keyword.iskeyword(attribute) or hasattr(Record, attribute):
+        attribute += "_"
+    return attribute
+
+
+class _Converter:
+    """Converts get results, sharing field names, schemas and repeated values across them"""
+
+    def __init__(self):
+        # (container field, key) -> field
+        self.names = {}
+        # fields -> the fields dict of every Table with them
+        self.schemas = {}
+        # string values, every enable or up is one object
+        self.values = {}
+
+    def convert(self, value):
+        """Value of a get result with its keyed lists as Tables"""
+        if isinstance(value, dict):
+            return {_name(k): self.convert(v) for k, v in value.items()}
+        if isinstance(value, list):
+            if value and all(isinstance(e, dict) for e in value):
+                return self.table(value)
+            return value
+        if isinstance(value, str):
+            return self.values.setdefault(value, value)
+        return value
+
+    def table(self, entries):
+        """Table of the entries of a keyed list"""
+        size = len(entries)
+        fields, columns = {}, []
+        for row, entry in enumerate(entries):
+            self._flatten(entry, "", row, (size, fields, columns))
+        # nested lists repeat the same fields in every entry of their parent list
+        fields = self.schemas.setdefault(tuple(fields), fields)
+        return Table(fields, tuple(itertools.chain.from_iterable(columns)), size)
+
+    def _flatten(self, node, prefix, row, table):
+        """Sets the leaves of an entry in the columns of a table, those of containers as container/leaf"""
+        size, fields, columns = table
+        names, values = self.names, self.values
+        for key, value in node.items():
+            field = names.get((prefix, key))
+            if field is None:
+                field = names[(prefix, key)] = prefix + _name(key)
+            if isinstance(value, str):
+                value = values.setdefault(value, value)
+            elif isinstance(value, (dict, list)):
+                if value and isinstance(value, dict):
+                    self._flatten(value, field + "/", row, table)
+                    continue
+                value = self.convert(value)
+            column = fields.get(field)
+            if column is None:
+                column = fields[field] = len(columns)
+                columns.append([_MISSING] * size)
+            columns[column][row] = value
+
+
+def _walk(node, elems, known):
+    """Yields (key values, value) of the nodes at elems below node"""
+    if not elems:
+        yield known, node
+        return
+    name, keys = elems[0]
+    if not isinstance(node, dict) or name not in node:
+        return
+    child = node[name]
+    if not keys:
+        yield from _walk(child, elems[1:], known)
+        return
+    if isinstance(child, Table):
+        for row, values in child.matches(keys):
+            yield from child.walk(row, elems[1:], known + values)
+
+
+def to_data(value):
+    """value with its Tables and Records as plain lists and dicts"""
+    if isinstance(value, Table):
+        return [record.to_dict() for record in value]
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {k: to_data(v) for k, v in value.items()}
+    return value
+
+
+class Record:
+    """Entry of a keyed list, with its leaves and containers as slots.
+
+    Items are the YANG names, e.g. `record["admin-state"]`, attributes the
+    names with `_` for `-`, e.g. `record.admin_state`. Containers are dicts,
+    nested keyed lists Tables. Unset leaves are unset slots.
+    """
+
+    __slots__ = ()
+    # YANG name -> attribute, set for the Record class of every Table
+    fields = {}
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, self.fields[name])
+        except (KeyError, AttributeError):
+            raise KeyError(name) from None
+
+    def __contains__(self, name):
+        return self.get(name, _MISSING) is not _MISSING
+
+    def get(self, name, default=None):
+        """Value of a leaf or container, default when it is unset"""
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """YANG names of the set leaves and containers"""
+        return [name for name in self.fields if name in self]
+
+    def to_dict(self):
+        """Entry as a plain dict, like the get result has it"""
+        return {name: to_data(self[name]) for name in self.keys()}
+
+    def __repr__(self):
+        return f"Record({self.to_dict()!r})"
+
+
+_RECORD_CLASSES = {}
+
+
+def _record_class(names):
+    """Record class with a slot for each name, shared by Tables of the same leaves"""
+    cls = _RECORD_CLASSES.get(names)
+    if cls is None:
+        fields = {name: _attribute(name) for name in names}
+        cls = _RECORD_CLASSES[names] = type(
+            "Record", (Record,), {"__slots__": tuple(fields.values()), "fields": fields}
+        )
+    return cls
+
+
+class Table:
+    """Entries of a keyed list, as one column per leaf.
+
+    The cells of all columns are one tuple, column after column, rather than a
+    tuple per column, most nested lists only have an entry or two.
+    """
+
+    __slots__ = ("fields", "cells", "size", "_index", "_layout")
+
+    def __init__(self, fields, cells, size):
+        # field -> column
+        self.fields = fields
+        self.cells = cells
+        self.size = size
+        self._index = None
+        self._layout = None
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (self.record(row) for row in range(self.size))
+
+    def _column(self, field):
+        column = self.fields.get(field)
+        if column is None:
+            return None
+        return self.cells[column * self.size:(column + 1) * self.size]
+
+    def find(self, keys):
+        """Row of the entry with the key values of keys, None if there is none"""
+        names = tuple(keys)
+        if self._index is None or self._index[0] != names:
+            columns = [self._column(name) for name in names]
+            if None in columns:
+                return None
+            index = {tuple(map(str, values)): row for row, values in enumerate(zip(*columns))}
+            self._index = (names, index)
+        return self._index[1].get(tuple(keys.values()))
+
+    def matches(self, keys):
+        """Yields (row, key values) of the entries matching keys, `*` matches any value"""
+        columns = [self.fields.get(name) for name in keys]
+        if None in columns:
+            return
+        if "*" in keys.values():
+            rows = range(self.size)
+        else:
+            row = self.find(keys)
+            rows = () if row is None else (row,)
+        for row in rows:
+            values = tuple(self.cells[column * self.size + row] for column in columns)
+            if all(v == "*" or str(value) == v for v, value in zip(keys.values(), values)):
+                yield row, values
+
+    def walk(self, row, elems, known):
+        """Yields (key values, value) of the nodes at elems below the entry in row"""
+        prefix = ""
+        for i, (name, keys) in enumerate(elems):
+            field = prefix + name
+            column = self.fields.get(field)
+            if column is None:
+                # a container, its leaves are columns of their own
+                prefix = field + "/"
+                continue
+            value = self.cells[column * self.size + row]
+            if value is _MISSING:
+                if keys or not any(f.startswith(field + "/") for f in self.fields):
+                    return
+                # a container that is empty in other entries, and a column of its own there
+                prefix = field + "/"
+                continue
+            if keys:
+                if isinstance(value, Table):
+                    for nested_row, values in value.matches(keys):
+                        yield from value.walk(nested_row, elems[i + 1:], known + values)
+            else:
+                yield from _walk(value, elems[i + 1:], known)
+            return
+        if not prefix:
+            yield known, self.record(row)
+            return
+        children = [(f[len(prefix):], c) for f, c in self.fields.items() if f.startswith(prefix)]
+        container = self._container(row, children)
+        if container is not _MISSING:
+            yield known, container
+
+    def _container(self, row, children):
+        """Container of an entry from the (path in container, column) of its leaves"""
+        container = {}
+        for path, column in children:
+            value = self.cells[column * self.size + row]
+            if value is _MISSING:
+                continue
+            *parents, leaf = path.split("/")
+            node = container
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = value
+        return container or _MISSING
+
+    def record(self, row):
+        """Entry in row as a Record"""
+        if self._layout is None:
+            layout = {}
+            for field, column in self.fields.items():
+                name, _, path = field.partition("/")
+                entry = layout.setdefault(name, [None, []])
+                if path:
+                    entry[1].append((path, column))
+                else:
+                    entry[0] = column
+            cls = _record_class(tuple(layout))
+            self._layout = (cls, [(cls.fields[name], c, children) for name, (c, children) in layout.items()])
+
+        cls, layout = self._layout
+        record = cls()
+        for attribute, column, children in layout:
+            value = self._container(row, children) if children else _MISSING
+            if value is _MISSING and column is not None:
+                # a container without leaves, e.g. a presence container
+                value = self.cells[column * self.size + row]
+            if value is not _MISSING:
+                setattr(record, attribute, value)
+        return record
+
+
+class ResultView:
+    """Result of one path of a get, resolving the paths below it"""
+
+    def __init__(self, path, result, converter=None):
+        converter = converter or _Converter()
+        elems = split_path(path)
+        wildcard = next((i for i, (_, keys) in enumerate(elems) if "*" in keys.values()), None)
+        if wildcard is None:
+            # the result is the addressed node itself, an unset one comes back empty
+            self.root = elems
+            self.node = _MISSING if result == {} else converter.convert(result)
+            return
+        self.node = converter.convert(result)
+        self.root = elems[:wildcard]
+        for start in range(wildcard, -1, -1):
+            if isinstance(self.node, dict) and elems[start][0] in self.node:
+                self.root = elems[:start]
+                break
+
+    def walk(self, path):
+        """Yields (key values, value) of the nodes at path, `*` key values match any entry.
+
+        Key values are a tuple in path order, one per key of every element.
+        """
+        elems = split_path(path)
+        if self.node is _MISSING or len(elems) < len(self.root):
+            return
+        known = ()
+        for (name, keys), (root_name, root_keys) in zip(elems, self.root):
+            if name != root_name or keys.keys() != root_keys.keys():
+                return
+            if any(v not in ("*", root_keys[k]) for k, v in keys.items()):
+                return
+            known += tuple(root_keys.values())
+        yield from _walk(self.node, elems[len(self.root):], known)
+
+    def get(self, path, default=None):
+        """Value at a path without wildcards, default when there is none"""
+        for _, value in self.walk(path):
+            return value
+        return default
+
+
+class GetResponse:
+    """Results of a get request, by path.
+
+    Values are scalars, dicts for containers, Tables for keyed lists and
+    Records for their entries, to_data turns them into plain data.
+    """
+
+    def __init__(self, response, paths):
+        results = (response or {}).get("result")
+        if not isinstance(results, list):
+            results = [] if results is None else [results]
+        converter = _Converter()
+        self.results = [ResultView(path, result, converter) for path, result in zip(paths, results)]
+
+    def walk(self, path):
+        """Yields (key values, value) of the nodes at path, from the first result that has any"""
+        for result in self.results:
+            found = False
+            for item in result.walk(path):
+                found = True
+                yield item
+            if found:
+                return
+
+    def get(self, path, default=None):
+        """Value at a path without wildcards, default when there is none"""
+        for _, value in self.walk(path):
+            return value
+        return default
+
+    def __contains__(self, path):
+        return self.get(path, _MISSING) is not _MISSING
@@ -0,0 +1,144 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Columnar in-memory route table"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import socket
+from array import array
+from bisect import bisect_left
+
+AFI_BITS = {"ipv4-unicast": 32, "ipv6-unicast": 128}
+PREFIX_LEAF = {"ipv4-unicast": "ipv4-prefix", "ipv6-unicast": "ipv6-prefix"}
+
+
+class RouteTable:
+    """Route table stored as sorted parallel columns.
+
+    Every route is a row made of a packed `(network << 8) | prefix length` key,
+    an index into the protocol names and an index into the next-hop-group ids.
+    IPv4 keys fit in an unsigned 64 bit array, IPv6 keys are kept as a sorted list
+    of Python ints. Membership is a binary search on the keys, longest-prefix-match
+    is one binary search per prefix length present in the table.
+    """
+
+    __slots__ = ("afi", "bits", "family", "keys", "protocols", "next_hops",
+                 "protocol_names", "next_hop_ids", "lengths")
+
+    def __init__(self, afi="ipv4-unicast"):
+        self.afi = afi
+        self.bits = AFI_BITS[afi]
+        self.family = socket.AF_INET if self.bits == 32 else socket.AF_INET6
+        self.keys = array("Q") if self.bits == 32 else []
+        self.protocols = array("B")
+        self.next_hops = array("I")
+        self.protocol_names = []
+        self.next_hop_ids = []
+        self.lengths = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def from_entries(cls, entries, afi="ipv4-unicast"):
+        """Build the table from a list of route entries of a get response.
+
+        Entries are popped from the list while they are converted, so the decoded
+        JSON is released row by row instead of living alongside the columns.
+        """
+        table = cls(afi)
+        prefix_leaf = PREFIX_LEAF[afi]
+        protocols, next_hops = {}, {}
+        keys = array("Q") if table.bits == 32 else []
+        protocol_col, next_hop_col = array("B"), array("I")
+        while entries:
+            entry = entries.pop()
+            protocol = str(entry.get("route-type", "")).split(":")[-1]
+            nhg = str(entry.get("next-hop-group", ""))
+            if protocol not in protocols:
+                protocols[protocol] = len(table.protocol_names)
+                table.protocol_names.append(protocol)
+            if nhg not in next_hops:
+                next_hops[nhg] = len(table.next_hop_ids)
+                table.next_hop_ids.append(nhg)
+            keys.append(table.pack(entry[prefix_leaf]))
+            protocol_col.append(protocols[protocol])
+            next_hop_col.append(next_hops[nhg])
+
+        lengths = set()
+        # entries were popped from the end, positions from the last one make the
+        # stable sort keep the response order among equal prefixes
+        for pos in sorted(range(len(keys) - 1, -1, -1), key=keys.__getitem__):
+            key = keys[pos]
+            # a prefix may be present once per route owner, keep the first one
+            if table.keys and table.keys[-1] == key:
+                continue
+            table.keys.append(key)
+            table.protocols.append(protocol_col[pos])
+            table.next_hops.append(next_hop_col[pos])
+            lengths.add(key & 0xFF)
+        table.lengths = sorted(lengths, reverse=True)
+        return table
+
+    def pack(self, prefix):
+        """Pack a prefix string into its sortable key, host bits are cleared"""
+        address, _, length = prefix.partition("/")
+        length = int(length) if length else self.bits
+        network = int.from_bytes(socket.inet_pton(self.family, address), "big")
+        network &= ((1 << self.bits) - 1) ^ ((1 << (self.bits - length)) - 1)
+        return (network << 8) | length
+
+    def unpack(self, key):
+        """Convert a key back into its prefix string"""
+        address = socket.inet_ntop(self.family, (key >> 8).to_bytes(self.bits // 8, "big"))
+        return f"{address}/{key & 0xFF}"
+
+    def _find(self, key):
+        pos = bisect_left(self.keys, key)
+        if pos < len(self.keys) and self.keys[pos] == key:
+            return pos
+        return None
+
+    def _row(self, pos):
+        return {
+            "prefix": self.unpack(self.keys[pos]),
+            "protocol": self.protocol_names[self.protocols[pos]],
+            "next_hop_group": self.next_hop_ids[self.next_hops[pos]],
+        }
+
+    def get(self, prefix):
+        """Exact match of a prefix, returns the route or None"""
+        pos = self._find(self.pack(prefix))
+        return None if pos is None else self._row(pos)
+
+    def __contains__(self, prefix):
+        return self._find(self.pack(prefix)) is not None
+
+    def lookup(self, address):
+        """Longest-prefix-match of an address, returns the route or None"""
+        addr = int.from_bytes(socket.inet_pton(self.family, address), "big")
+        full = (1 << self.bits) - 1
+        for length in self.lengths:
+            mask = full ^ ((1 << (self.bits - length)) - 1)
+            pos = self._find(((addr & mask) << 8) | length)
+            if pos is not None:
+                return self._row(pos)
+        return None
+
+    def protocol_summary(self):
+        """Number of routes per protocol"""
+        counts = [0] * len(self.protocol_names)
+        for protocol in self.protocols:
+            counts[protocol] += 1
+        return dict(zip(self.protocol_names, counts))
+
+    def routes(self):
+        """Iterate over all routes as dicts"""
+        for pos in range(len(self.keys)):
+            yield self._row(pos)
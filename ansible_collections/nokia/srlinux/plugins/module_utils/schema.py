@@ -0,0 +1,201 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Offline validation of SR Linux paths and values against a compiled schema index.
+
+The index is a JSON file, optionally gzipped, produced by the
+scripts/compile_schema_index.py script of the repository
+from the SR Linux YANG models of one release:
+
+    {"format": 1, "version": "24.3.1", "root": {"c": {...}}}
+
+Every schema node is a dict with short keys to keep the file small:
+
+    "c"  children by name, containers, lists and leaves, choices and cases are flattened
+    "k"  list keys in order, name -> type
+    "t"  leaf type, "ll" set for leaf-lists
+    "e"  enum or identity names of enumeration and identityref leaves
+    "r"  [min, max] of integer leaves
+"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import gzip
+import json
+
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    split_path,
+    strip_identity,
+)
+
+INDEX_FORMAT = 1
+
+INT_RANGES = {
+    "int8": (-(2**7), 2**7 - 1),
+    "int16": (-(2**15), 2**15 - 1),
+    "int32": (-(2**31), 2**31 - 1),
+    "int64": (-(2**63), 2**63 - 1),
+    "uint8": (0, 2**8 - 1),
+    "uint16": (0, 2**16 - 1),
+    "uint32": (0, 2**32 - 1),
+    "uint64": (0, 2**64 - 1),
+}
+
+# reported per check, the first errors are enough to fix a path
+MAX_ERRORS = 20
+
+_indexes = {}
+
+
+def load_index(path):
+    """Load a schema index once per process"""
+    if path not in _indexes:
+        _indexes[path] = SchemaIndex(path)
+    return _indexes[path]
+
+
+def check_scalar(schema, value):
+    """Error message if a scalar does not fit the leaf type, None otherwise"""
+    kind = schema.get("t")
+    if kind in INT_RANGES:
+        if isinstance(value, bool):
+            return f"{value!r} is not a valid {kind}"
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            return f"{value!r} is not a valid {kind}"
+        low, high = schema.get("r") or INT_RANGES[kind]
+        if not low <= number <= high:
+            return f"{value!r} is out of range {low}..{high}"
+    elif kind == "boolean":
+        if value not in (True, False, "true", "false"):
+            return f"{value!r} is not a boolean"
+    elif kind in ("enumeration", "identityref") and schema.get("e"):
+        if strip_identity(value) not in schema["e"]:
+            choices = ", ".join(sorted(schema["e"])[:10])
+            return f"{value!r} is not one of {choices}"
+    elif kind == "string" and isinstance(value, (dict, list)):
+        return f"{value!r} is not a string"
+    return None
+
+
+class SchemaIndex:
+    """Compiled schema of one SR Linux release, read from disk on first use"""
+
+    def __init__(self, path):
+        self.path = path
+        self._data = None
+
+    @property
+    def data(self):
+        """The index, loaded lazily"""
+        if self._data is None:
+            opener = gzip.open if self.path.endswith(".gz") else open
+            with opener(self.path, "rb") as f:
+                data = json.loads(f.read())
+            if data.get("format") != INDEX_FORMAT:
+                raise ValueError(
+                    f"{self.path} has index format {data.get('format')}, expected {INDEX_FORMAT}"
+                )
+            self._data = data
+        return self._data
+
+    @property
+    def version(self):
+        """SR Linux release the index was compiled from"""
+        return self.data.get("version")
+
+    def resolve(self, path, errors):
+        """Schema node of a path, None with errors appended if it is not in the schema"""
+        node = self.data["root"]
+        walked = ""
+        for name, keys in split_path(path):
+            walked += "/" + name
+            child = (node.get("c") or {}).get(name)
+            if child is None:
+                errors.append(f"{path}: unknown element {name!r} under {walked.rsplit('/', 1)[0] or '/'}")
+                return None
+            if keys:
+                list_keys = child.get("k")
+                if list_keys is None:
+                    errors.append(f"{path}: {walked} is not a list, it takes no keys")
+                    return None
+                missing = [k for k in list_keys if k not in keys]
+                if missing:
+                    errors.append(f"{path}: {walked} is missing key {', '.join(missing)}")
+                for key, value in keys.items():
+                    if key not in list_keys:
+                        errors.append(
+                            f"{path}: unknown key {key!r} of {walked}, keys are {', '.join(list_keys)}"
+                        )
+                    elif value != "*":
+                        error = check_scalar({"t": list_keys[key]}, value)
+                        if error:
+                            errors.append(f"{path}: key {key} {error}")
+            node = child
+        return node
+
+    def check_value(self, node, value, path, errors):
+        """Check a value against the schema node it is set at"""
+        if len(errors) >= MAX_ERRORS:
+            return
+        if "t" in node:
+            values = value if node.get("ll") and isinstance(value, list) else [value]
+            for item in values:
+                error = check_scalar(node, item)
+                if error:
+                    errors.append(f"{path}: {error}")
+            return
+        if "k" in node and isinstance(value, list):
+            for entry in value:
+                missing = [k for k in node["k"] if not isinstance(entry, dict) or k not in entry]
+                if missing:
+                    errors.append(f"{path}: list entry without key {', '.join(missing)}")
+                    continue
+                self.check_value(node, entry, path, errors)
+            return
+        if not isinstance(value, dict):
+            if value not in (None, {}):
+                errors.append(f"{path}: {value!r} set on a container")
+            return
+        children = node.get("c") or {}
+        for key, child_value in value.items():
+            name = key.split(":", 1)[-1]
+            if name in children:
+                self.check_value(children[name], child_value, f"{path}/{name}", errors)
+            else:
+                errors.append(f"{path}: unknown element {name!r}")
+
+    def check_commands(self, commands):
+        """Check the paths and values of set commands, returns error messages"""
+        errors = []
+        for cmd in commands:
+            node = self.resolve(cmd["path"], errors)
+            if node is not None and cmd.get("action") != "delete" and "value" in cmd:
+                self.check_value(node, cmd["value"], cmd["path"].rstrip("/"), errors)
+            if len(errors) >= MAX_ERRORS:
+                break
+        return errors[:MAX_ERRORS]
+
+
+def precheck(module, commands):
+    """Fail the module if commands don't fit the schema index of its schema_index option"""
+    path = module.params.get("schema_index")
+    if not path:
+        return
+    try:
+        index = load_index(path)
+        errors = index.check_commands(commands)
+    except (OSError, ValueError, KeyError) as e:
+        module.fail_json(msg=f"cannot load schema index {path}: {e}")
+    if errors:
+        module.fail_json(
+            msg=f"{errors[0]} (schema {index.version})",
+            schema_errors=errors,
+            schema_version=index.version,
+        )
@@ -12,17 +12,22 @@ from typing import Any
 # pylint: disable=invalid-name
 __metaclass__ = type
 import json
+import re
 from datetime import datetime
 from time import sleep
 
 from ansible.module_utils._text import to_text
 from ansible.module_utils.connection import Connection
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    COMMIT_ID_PATH,
     JSON_RPC_VERSION,
     SAVE_CONFIG_PATH,
     TOOLS_DATASTORE,
 )
 
+# identityref values carry their module prefix, e.g. srl_nokia-common:static
+IDENTITY_RE = re.compile(r"^[A-Za-z_][\w.-]*:[A-Za-z_][\w.-]*$")
+
 
 class JSONRPCClient:
     """SRLinux JSON-RPC client"""
@@ -32,10 +37,10 @@ class JSONRPCClient:
         if module:
             self.connection = Connection(self.module._socket_path)
 
-    def _httpapi_error_handle(self, method="POST", path="/jsonrpc", payload=None):
+    def _httpapi_error_handle(self, method="POST", path="/jsonrpc", payload=None, **kwargs):
         try:
             code, response = self.connection.send_request(
-                data=payload, method=method, path=path
+                data=payload, method=method, path=path, **kwargs
             )
 
             if code == 404:
@@ -93,12 +98,135 @@ def convertResponseKeys(response):
         response["jsonrpc_req_id"] = response.pop("id")
 
 
+def strip_namespaces(data):
+    """Returns a copy of data with YANG module prefixes removed from the keys.
+
+    SR Linux prefixes augmented nodes with their module name in get responses,
+    e.g. `srl_nokia-bgp:bgp`, while the modules address them without the prefix.
+    """
+    if isinstance(data, list):
+        return [strip_namespaces(item) for item in data]
+    if isinstance(data, dict):
+        return {
+            key.split(":", 1)[-1]: strip_namespaces(value)
+            for key, value in data.items()
+        }
+    return data
+
+
+def strip_identity(value):
+    """Strip the module prefix from identityref values"""
+    if isinstance(value, str) and IDENTITY_RE.match(value):
+        return value.split(":", 1)[1]
+    return value
+
+
+def split_path(path):
+    """Splits an SR Linux path into a list of (name, keys) tuples.
+
+    `/network-instance[name="default"]/protocols/bgp/neighbor[peer-address=*]` becomes
+    `[("network-instance", {"name": "default"}), ("protocols", {}), ("bgp", {}),
+    ("neighbor", {"peer-address": "*"})]`. Module prefixes are removed from the names
+    and quotes from the key values.
+    """
+    elems = []
+    name, keys, key, buf = "", {}, None, ""
+    in_key = quoted = False
+    for char in path.strip("/") + "/":
+        if quoted:
+            if char == '"':
+                quoted = False
+            else:
+                buf += char
+        elif in_key:
+            if char == '"':
+                quoted = True
+            elif char == "=" and key is None:
+                key, buf = buf, ""
+            elif char == "]":
+                keys[key] = buf
+                key, buf, in_key = None, "", False
+            else:
+                buf += char
+        elif char == "[":
+            in_key = True
+            name, buf = name or buf, ""
+        elif char == "/":
+            name = name or buf
+            if name:
+                elems.append((name.split(":", 1)[-1], keys))
+            name, keys, buf = "", {}, ""
+        else:
+            buf += char
+    return elems
+
+
+def walk_path(data, path):
+    """Yields (key values, value) for every node of a get result that matches path.
+
+    A get with wildcard keys returns the data rooted at the first wildcarded list,
+    e.g. `{"neighbor": [...]}`, or higher up when the path starts with a wildcard.
+    Key values are returned as a tuple in path order, one per key, including the
+    keys of the elements above the result root.
+    """
+    elems = split_path(path)
+    wildcard = next(
+        (i for i, (_, keys) in enumerate(elems) if "*" in keys.values()), None
+    )
+    if wildcard is None:
+        # without wildcards the result is the addressed node itself
+        yield (), data
+        return
+
+    data = strip_namespaces(data)
+    for start in range(wildcard, -1, -1):
+        if isinstance(data, dict) and elems[start][0] in data:
+            known = tuple(v for _, keys in elems[:start] for v in keys.values())
+            yield from _walk_elems(data, elems[start:], known)
+            return
+
+
+def _walk_elems(node, elems, key_values):
+    if not elems:
+        yield key_values, node
+        return
+    if not isinstance(node, dict) or elems[0][0] not in node:
+        return
+    name, keys = elems[0]
+    child = node[name]
+    if not keys:
+        yield from _walk_elems(child, elems[1:], key_values)
+        return
+    for entry in child if isinstance(child, list) else [child]:
+        if all(v == "*" or str(entry.get(k)) == v for k, v in keys.items()):
+            values = tuple(entry.get(k) for k in keys)
+            yield from _walk_elems(entry, elems[1:], key_values + values)
+
+
 def rpcID():
     """Generates an id for the JSON-RPC request
     which follows the UTC datetime"""
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S:%f")
 
 
+def get_commit_id(client):
+    """Id of the last commit of the device, None if it can't be read"""
+    data = {
+        "jsonrpc": JSON_RPC_VERSION,
+        "id": rpcID(),
+        "method": "get",
+        "params": {"commands": [{"path": COMMIT_ID_PATH, "datastore": "state"}]},
+    }
+    response = client.post(payload=json.dumps(data))
+    if not response or response.get("error"):
+        return None
+    ids = [
+        value
+        for _, value in walk_path((response.get("result") or [{}])[0], COMMIT_ID_PATH)
+    ]
+    return max(ids, default=None)
+
+
 def process_save_when(client, json_output) -> Any:
     """Handle save_when operation"""
     data = {
@@ -0,0 +1,129 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Request traces of the httpapi plugin, for record and replay.
+
+A trace is a JSON lines file, one line per request with its response:
+
+    {"method":"POST","path":"/jsonrpc","rpc":"get","params":{...},"code":200,"response":{...},"elapsed":0.0123}
+
+Requests are matched on the HTTP method and path, the JSON-RPC method and the
+params; the id, a timestamp from rpcID(), is left out. Traces are read as a stream,
+only the records skipped while looking for a match are kept in memory.
+"""
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+import gzip
+import json
+import os
+import re
+from collections import deque
+
+_UNSAFE_RE = re.compile(r"[^\w.-]+")
+
+
+def trace_name(host, port=None, suffix=".jsonl"):
+    """File name of the trace of a host, or of another per-device file with suffix"""
+    name = host if port is None else f"{host}_{port}"
+    return _UNSAFE_RE.sub("_", name) + suffix
+
+
+def parse_request(data):
+    """JSON-RPC method and params of a request payload, (None, data) if it is not JSON-RPC"""
+    try:
+        request = json.loads(data)
+    except (TypeError, ValueError):
+        return None, data
+    if not isinstance(request, dict):
+        return None, request
+    return request.get("method"), request.get("params")
+
+
+def request_key(method, path, rpc, params):
+    """Key a request is matched on"""
+    return json.dumps([method, path, rpc, params], sort_keys=True, separators=(",", ":"))
+
+
+def record_key(record):
+    """Key of a trace record"""
+    return request_key(record["method"], record["path"], record.get("rpc"), record.get("params"))
+
+
+class TraceWriter:
+    """Appends requests and responses to a trace file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def write(self, method, path, data, code, response, elapsed):
+        """Record one request"""
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # line buffered, every record is on disk when the persistent connection is killed
+            self._file = open(self.path, "a", buffering=1)
+        rpc, params = parse_request(data)
+        record = {
+            "method": method,
+            "path": path,
+            "rpc": rpc,
+            "params": params,
+            "code": code,
+            "response": response,
+            "elapsed": round(elapsed, 6),
+        }
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self):
+        """Close the trace file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class TraceReader:
+    """Serves the records of a trace file, gzip compressed if it ends with .gz.
+
+    Identical requests get their records in the order they were recorded, the last
+    one again once they run out.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lines = None
+        self._pending = {}
+        self._last = {}
+
+    def _records(self):
+        if self._lines is None:
+            opener = gzip.open if self.path.endswith(".gz") else open
+            self._lines = opener(self.path, "rt")
+        for line in self._lines:
+            if line.strip():
+                yield json.loads(line)
+        self._lines.close()
+
+    def lookup(self, method, path, data):
+        """Record of a request, None if the trace has none"""
+        rpc, params = parse_request(data)
+        key = request_key(method, path, rpc, params)
+        pending = self._pending.get(key)
+        record = pending.popleft() if pending else None
+        exhausted = self._lines is not None and self._lines.closed
+        if record is None and not exhausted:
+            for candidate in self._records():
+                candidate_key = record_key(candidate)
+                if candidate_key == key:
+                    record = candidate
+                    break
+                self._pending.setdefault(candidate_key, deque()).append(candidate)
+        if record is None:
+            return self._last.get(key)
+        self._last[key] = record
+        return record
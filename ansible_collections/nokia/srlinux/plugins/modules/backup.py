@@ -0,0 +1,244 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for backing up SR Linux configuration into a deduplicated store"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+from datetime import datetime, timezone
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.backup import (
+    ConfigStore,
+    content_hash,
+    split_config,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    JSONRPCClient,
+    convertResponseKeys,
+    rpcID,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: backup
+short_description: "Back up the configuration of Nokia SR Linux devices into a deduplicated store."
+description:
+  - >-
+    Fetches the running config and stores it split into its top-level subtrees,
+    with top-level lists such as interfaces and network-instances split per entry.
+    Every subtree is stored once, gzipped and named by the sha256 of its canonical JSON,
+    so subtrees shared by the devices of a role or unchanged since the last run
+    take no extra space.
+  - >-
+    Every run writes a small manifest per device listing the subtrees of its config,
+    with I(state=restored) the config of any run is reassembled into one JSON document
+    without connecting to the device.
+version_added: "1.1.0"
+options:
+  store:
+    description:
+      - Directory of the backup store on the controller, created if missing.
+    type: path
+    required: true
+  device:
+    description:
+      - Name the backups of the device are filed under, usually C(inventory_hostname).
+      - In file names, characters other than letters, digits, C(.), C(-) and C(_) of I(device)
+        and I(run) become C(_), so that manifests stay inside I(store).
+    type: str
+    required: true
+  run:
+    description:
+      - Name of the run, the current UTC time (C(20240501T120000Z)) when omitted.
+      - With I(state=restored), the run to restore, the latest one when omitted.
+    type: str
+  state:
+    description:
+      - C(backed_up) fetches and stores the running config,
+        C(restored) reassembles a stored config.
+    type: str
+    choices: [backed_up, restored]
+    default: backed_up
+  dest:
+    description:
+      - With I(state=restored), file the restored config is written to as JSON.
+        The config is returned as C(config) when omitted.
+    type: path
+
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+- name: Nightly backup
+  nokia.srlinux.backup:
+    store: /srv/srl-backups
+    device: "{{ inventory_hostname }}"
+
+- name: Restore the latest backup into one JSON file
+  nokia.srlinux.backup:
+    store: /srv/srl-backups
+    device: "{{ inventory_hostname }}"
+    state: restored
+    dest: "/tmp/{{ inventory_hostname }}.cfg.json"
+
+- name: Push it back
+  nokia.srlinux.config:
+    replace:
+      - path: /
+        value: "{{ lookup('ansible.builtin.file', '/tmp/' + inventory_hostname + '.cfg.json') }}"
+"""
+
+RETURN = """
+manifest:
+  description: Path of the manifest of the run.
+  returned: success
+  type: str
+  sample: /srv/srl-backups/manifests/leaf1/20240501T120000Z.json
+run:
+  description: Name of the run.
+  returned: success
+  type: str
+config_hash:
+  description: sha256 of the canonical JSON of the whole config.
+  returned: success
+  type: str
+objects:
+  description: Number of subtrees the config is made of.
+  returned: success
+  type: int
+objects_written:
+  description: Number of subtrees that were not in the store yet.
+  returned: state is backed_up
+  type: int
+bytes_written:
+  description: Compressed size of the new subtrees.
+  returned: state is backed_up
+  type: int
+config:
+  description: The restored config.
+  returned: state is restored and dest is not set
+  type: dict
+"""
+
+
+def restore(module, store):
+    """Reassemble a stored config"""
+    device = module.params.get("device")
+    try:
+        manifest = store.load_manifest(device, module.params.get("run"))
+        config = store.restore(manifest)
+    except (OSError, ValueError) as e:
+        module.fail_json(msg=f"cannot restore {device}: {e}")
+
+    output = {
+        "changed": False,
+        "manifest": store.manifest_path(device, manifest["run"]),
+        "run": manifest["run"],
+        "config_hash": manifest["config_hash"],
+        "objects": len(
+            {d for item in manifest["tree"] for d in item.get("entries", [item.get("object")])}
+        ),
+    }
+    dest = module.params.get("dest")
+    if dest is None:
+        module.exit_json(config=config, **output)
+
+    data = json.dumps(config, indent=4)
+    if os.path.exists(dest):
+        with open(dest) as f:
+            if f.read() == data:
+                module.exit_json(dest=dest, **output)
+    if not module.check_mode:
+        with open(dest, "w") as f:
+            f.write(data)
+    module.exit_json(dest=dest, **dict(output, changed=True))
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    argspec = {
+        "store": {"type": "path", "required": True},
+        "device": {"type": "str", "required": True},
+        "run": {"type": "str"},
+        "state": {
+            "type": "str",
+            "choices": ["backed_up", "restored"],
+            "default": "backed_up",
+        },
+        "dest": {"type": "path"},
+    }
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+
+    store = ConfigStore(module.params.get("store"))
+    if module.params.get("state") == "restored":
+        restore(module, store)
+
+    client = JSONRPCClient(module)
+
+    data = {
+        "jsonrpc": JSON_RPC_VERSION,
+        "id": rpcID(),
+        "method": "get",
+        "params": {"commands": [{"path": "/", "datastore": "running"}]},
+    }
+    response = client.post(payload=json.dumps(data))
+    convertResponseKeys(response)
+    if not response or response.get("error"):
+        module.fail_json(
+            msg=response.get("error", {}).get("message", "No get response"),
+            jsonrpc_req_id=response.get("jsonrpc_req_id"),
+        )
+
+    config = (response.get("result") or [{}])[0]
+    tree, objects = split_config(config)
+    run = module.params.get("run") or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    manifest = {
+        "device": module.params.get("device"),
+        "run": run,
+        "config_hash": content_hash(config),
+        "tree": tree,
+    }
+
+    written, size = 0, 0
+    for digest, value in objects.items():
+        if store.has(digest):
+            continue
+        written += 1
+        if not module.check_mode:
+            size += store.put(digest, value)
+
+    path = store.manifest_path(manifest["device"], run)
+    if not module.check_mode:
+        path = store.save_manifest(manifest)
+
+    module.exit_json(
+        changed=True,
+        manifest=path,
+        run=run,
+        config_hash=manifest["config_hash"],
+        objects=len(objects),
+        objects_written=written,
+        bytes_written=size,
+        jsonrpc_req_id=response.get("jsonrpc_req_id"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,13 @@ import json
 import pprint
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.compact import compact_commands
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import JSON_RPC_VERSION
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import profiled
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     rpcID,
+    strip_namespaces,
 )
 
 __metaclass__ = type
@@ -119,9 +122,13 @@ options:
               keepalive-interval:
                 type: int
   state:
-    description: merged (set/update) or deleted (remove config)
+    description:
+      - merged (set/update) or deleted (remove config).
+      - rendered builds the JSON-RPC set payload offline, without connecting to the device.
+      - gathered reads the BGP config of I(network_instance) from the running datastore
+        in a single get and returns it in the shape of the I(config) option.
     type: str
-    choices: [merged, deleted]
+    choices: [merged, deleted, rendered, gathered]
     default: merged
 author:
   - Uzma Saman (@NetOpsChic)
@@ -135,22 +142,13 @@ def build_rpc(method, commands, req_id):
         "id": req_id
     }
 
-def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            config=dict(type='dict', required=True),
-            state=dict(type='str', choices=['merged', 'deleted'], default='merged')
-        ),
-        supports_check_mode=True
-    )
+def bgp_path_for(ni):
+    return f"/network-instance[name=\"{ni}\"]/protocols/bgp"
 
-    client = JSONRPCClient(module)
-    state = module.params["state"]
-    cfg = module.params['config']
-    ni = cfg["network_instance"]
-    bgp_path = f"/network-instance[name=\"{ni}\"]/protocols/bgp"
+def build_commands(cfg, state):
+    """Build the JSON-RPC set commands for the given BGP config and state"""
+    bgp_path = bgp_path_for(cfg["network_instance"])
     cmds = []
-    changed = False
 
     # Handle delete
     if state == "deleted":
@@ -158,123 +156,203 @@ def main():
             "action": "delete",
             "path": bgp_path
         })
-        changed = True
-    else:
-        # 1. Set global BGP process
-        bgp_global = {
-            "admin-state": cfg.get("admin_state", "enable"),
-            "router-id": cfg["router_id"],
-            "autonomous-system": cfg["autonomous_system"]
-        }
+        return cmds
+
+    # 1. Set global BGP process
+    bgp_global = {
+        "admin-state": cfg.get("admin_state", "enable"),
+        "router-id": cfg["router_id"],
+        "autonomous-system": cfg["autonomous_system"]
+    }
+    cmds.append({
+        "action": "update",
+        "path": bgp_path,
+        "value": bgp_global
+    })
+
+    # 2. Set BGP global afi-safi (must be done BEFORE group/neigh)
+    global_afi_safi = cfg.get("afi_safi", [])
+    if not global_afi_safi:
+        # Default to ipv4-unicast if not set
+        global_afi_safi = [{"afi_safi_name": "ipv4-unicast", "admin_state": "enable"}]
+    for af in global_afi_safi:
+        af_path = f"{bgp_path}/afi-safi[afi-safi-name={af['afi_safi_name']}]"
         cmds.append({
             "action": "update",
-            "path": bgp_path,
-            "value": bgp_global
+            "path": af_path + "/admin-state",
+            "value": af.get("admin_state", "enable")
         })
 
-        # 2. Set BGP global afi-safi (must be done BEFORE group/neigh)
-        global_afi_safi = cfg.get("afi_safi", [])
-        if not global_afi_safi:
-            # Default to ipv4-unicast if not set
-            global_afi_safi = [{"afi_safi_name": "ipv4-unicast", "admin_state": "enable"}]
-        for af in global_afi_safi:
-            af_path = f"{bgp_path}/afi-safi[afi-safi-name={af['afi_safi_name']}]"
+    # 3. Set BGP groups
+    for group in cfg.get("groups", []):
+        group_name = group["group-name"]
+        group_path = f"{bgp_path}/group[group-name=\"{group_name}\"]"
+        group_val = {
+            "admin-state": group.get("admin-state", "enable"),
+        }
+        if group.get("peer-as"):
+            group_val["peer-as"] = group["peer-as"]
+        if group.get("description"):
+            group_val["description"] = group["description"]
+        cmds.append({
+            "action": "update",
+            "path": group_path,
+            "value": group_val
+        })
+        # Per-group afi-safi
+        group_afis = group.get("afi-safi", [])
+        if not group_afis:
+            group_afis = [{"afi-safi-name": "ipv4-unicast", "admin_state": "enable"}]
+        for af in group_afis:
+            af_path = group_path + f"/afi-safi[afi-safi-name={af['afi-safi-name']}]"
             cmds.append({
                 "action": "update",
                 "path": af_path + "/admin-state",
                 "value": af.get("admin_state", "enable")
             })
-
-        # 3. Set BGP groups
-        for group in cfg.get("groups", []):
-            group_name = group["group-name"]
-            group_path = f"{bgp_path}/group[group-name=\"{group_name}\"]"
-            group_val = {
-                "admin-state": group.get("admin-state", "enable"),
-            }
-            if group.get("peer-as"):
-                group_val["peer-as"] = group["peer-as"]
-            if group.get("description"):
-                group_val["description"] = group["description"]
+        if group.get("export-policy"):
             cmds.append({
                 "action": "update",
-                "path": group_path,
-                "value": group_val
+                "path": group_path + "/export-policy",
+                "value": group["export-policy"]
+            })
+        if group.get("import-policy"):
+            cmds.append({
+                "action": "update",
+                "path": group_path + "/import-policy",
+                "value": group["import-policy"]
             })
-            # Per-group afi-safi
-            group_afis = group.get("afi-safi", [])
-            if not group_afis:
-                group_afis = [{"afi-safi-name": "ipv4-unicast", "admin_state": "enable"}]
-            for af in group_afis:
-                af_path = group_path + f"/afi-safi[afi-safi-name={af['afi-safi-name']}]"
-                cmds.append({
-                    "action": "update",
-                    "path": af_path + "/admin-state",
-                    "value": af.get("admin_state", "enable")
-                })
-            if group.get("export-policy"):
-                cmds.append({
-                    "action": "update",
-                    "path": group_path + "/export-policy",
-                    "value": group["export-policy"]
-                })
-            if group.get("import-policy"):
-                cmds.append({
-                    "action": "update",
-                    "path": group_path + "/import-policy",
-                    "value": group["import-policy"]
-                })
 
-        # 4. Set BGP neighbors
-        for nbr in cfg.get("neighbors", []):
-            nbr_addr = nbr["peer-address"]
-            nbr_path = f"{bgp_path}/neighbor[peer-address=\"{nbr_addr}\"]"
-            nbr_val = {
-                "admin-state": nbr.get("admin-state", "enable"),
-            }
-            if nbr.get("peer-group"):
-                nbr_val["peer-group"] = nbr["peer-group"]
-            if nbr.get("peer-as"):
-                nbr_val["peer-as"] = nbr["peer-as"]
-            if nbr.get("description"):
-                nbr_val["description"] = nbr["description"]
+    # 4. Set BGP neighbors
+    for nbr in cfg.get("neighbors", []):
+        nbr_addr = nbr["peer-address"]
+        nbr_path = f"{bgp_path}/neighbor[peer-address=\"{nbr_addr}\"]"
+        nbr_val = {
+            "admin-state": nbr.get("admin-state", "enable"),
+        }
+        if nbr.get("peer-group"):
+            nbr_val["peer-group"] = nbr["peer-group"]
+        if nbr.get("peer-as"):
+            nbr_val["peer-as"] = nbr["peer-as"]
+        if nbr.get("description"):
+            nbr_val["description"] = nbr["description"]
+        cmds.append({
+            "action": "update",
+            "path": nbr_path,
+            "value": nbr_val
+        })
+        # Per-neighbor afi-safi
+        nbr_afis = nbr.get("afi-safi", [])
+        if not nbr_afis:
+            nbr_afis = [{"afi-safi-name": "ipv4-unicast", "admin_state": "enable"}]
+        for af in nbr_afis:
+            af_path = nbr_path + f"/afi-safi[afi-safi-name={af['afi-safi-name']}]"
             cmds.append({
                 "action": "update",
-                "path": nbr_path,
-                "value": nbr_val
+                "path": af_path + "/admin-state",
+                "value": af.get("admin_state", "enable")
             })
-            # Per-neighbor afi-safi
-            nbr_afis = nbr.get("afi-safi", [])
-            if not nbr_afis:
-                nbr_afis = [{"afi-safi-name": "ipv4-unicast", "admin_state": "enable"}]
-            for af in nbr_afis:
-                af_path = nbr_path + f"/afi-safi[afi-safi-name={af['afi-safi-name']}]"
+        # Timers
+        if nbr.get("timers"):
+            timers = nbr["timers"]
+            timers_path = nbr_path + "/timers"
+            timer_val = {}
+            if "hold-time" in timers:
+                timer_val["hold-time"] = timers["hold-time"]
+            if "keepalive-interval" in timers:
+                timer_val["keepalive-interval"] = timers["keepalive-interval"]
+            if timer_val:
                 cmds.append({
                     "action": "update",
-                    "path": af_path + "/admin-state",
-                    "value": af.get("admin_state", "enable")
+                    "path": timers_path,
+                    "value": timer_val
                 })
-            # Timers
-            if nbr.get("timers"):
-                timers = nbr["timers"]
-                timers_path = nbr_path + "/timers"
-                timer_val = {}
-                if "hold-time" in timers:
-                    timer_val["hold-time"] = timers["hold-time"]
-                if "keepalive-interval" in timers:
-                    timer_val["keepalive-interval"] = timers["keepalive-interval"]
-                if timer_val:
-                    cmds.append({
-                        "action": "update",
-                        "path": timers_path,
-                        "value": timer_val
-                    })
 
-        changed = True
+    return cmds
+
+def parse_config(data, ni):
+    """Convert the running BGP subtree into the shape of the config option"""
+    data = strip_namespaces(data or {})
+    cfg = {
+        "network_instance": ni,
+        "router_id": data.get("router-id"),
+        "admin_state": data.get("admin-state", "enable"),
+        "autonomous_system": data.get("autonomous-system"),
+        "afi_safi": [
+            {"afi_safi_name": af["afi-safi-name"], "admin_state": af.get("admin-state", "enable")}
+            for af in data.get("afi-safi", [])
+        ],
+    }
+
+    groups = []
+    for group in data.get("group", []):
+        item = {"group-name": group["group-name"], "admin-state": group.get("admin-state", "enable")}
+        for leaf in ("peer-as", "description", "export-policy", "import-policy"):
+            if leaf in group:
+                item[leaf] = group[leaf]
+        item["afi-safi"] = [
+            {"afi-safi-name": af["afi-safi-name"], "admin_state": af.get("admin-state", "enable")}
+            for af in group.get("afi-safi", [])
+        ]
+        groups.append(item)
+    cfg["groups"] = groups
+
+    neighbors = []
+    for nbr in data.get("neighbor", []):
+        item = {"peer-address": nbr["peer-address"], "admin-state": nbr.get("admin-state", "enable")}
+        for leaf in ("peer-as", "peer-group", "description"):
+            if leaf in nbr:
+                item[leaf] = nbr[leaf]
+        item["afi-safi"] = [
+            {"afi-safi-name": af["afi-safi-name"], "admin_state": af.get("admin-state", "enable")}
+            for af in nbr.get("afi-safi", [])
+        ]
+        timers = {
+            k: v for k, v in nbr.get("timers", {}).items()
+            if k in ("hold-time", "keepalive-interval")
+        }
+        if timers:
+            item["timers"] = timers
+        neighbors.append(item)
+    cfg["neighbors"] = neighbors
+
+    return cfg
+
+@profiled
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            config=dict(type='dict', required=True),
+            state=dict(type='str', choices=['merged', 'deleted', 'rendered', 'gathered'], default='merged')
+        ),
+        supports_check_mode=True
+    )
+
+    state = module.params["state"]
+
+    # Gathered: one get of the BGP subtree, converted back to the config shape
+    if state == "gathered":
+        client = JSONRPCClient(module)
+        ni = module.params['config']["network_instance"]
+        get_rpc = build_rpc("get", [{"path": bgp_path_for(ni), "datastore": "running"}], rpcID())
+        response = client.post(payload=json.dumps(get_rpc))
+        if response.get("error"):
+            module.fail_json(msg="Server error (GET)", response=pprint.pformat(response))
+        result = response.get("result", [{}])
+        module.exit_json(changed=False, gathered=parse_config(result[0] if result else {}, ni))
+
+    cmds = build_commands(module.params['config'], state)
+
+    # Rendered: return the set payload without connecting to the device
+    if state == "rendered":
+        module.exit_json(changed=False, commands=cmds, rendered=build_rpc("set", compact_commands(cmds), rpcID()))
+
+    client = JSONRPCClient(module)
+    changed = True
 
     # Apply changes if needed
     if changed and not module.check_mode and cmds:
-        rpc = build_rpc("set", cmds, rpcID())
+        rpc = build_rpc("set", compact_commands(cmds), rpcID())
         response = client.post(payload=json.dumps(rpc))
         if response.get("error"):
             module.fail_json(msg="Server error (UPDATE)", response=pprint.pformat(response))
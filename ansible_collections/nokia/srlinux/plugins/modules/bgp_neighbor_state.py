@@ -0,0 +1,192 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for gathering BGP neighbor session state from SR Linux devices"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    JSONRPCClient,
+    convertResponseKeys,
+    rpcID,
+    walk_path,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: bgp_neighbor_state
+short_description: "Gather BGP neighbor session state from Nokia SR Linux devices."
+description:
+  - >-
+    Retrieves the session state, the last state change and the received/active prefix
+    counters of every BGP neighbor with a single get request using wildcard paths.
+    Only these leaves are requested from the state datastore, so thousands of
+    neighbors are returned in one round trip as compact per-neighbor records.
+version_added: "1.1.0"
+options:
+  network_instance:
+    description:
+      - Network-instance to gather the neighbors of. C(*) gathers all network-instances.
+    type: str
+    default: "*"
+  session_state:
+    description:
+      - Only return neighbors in one of these session states.
+    type: list
+    elements: str
+    choices: [idle, connect, active, opensent, openconfirm, established]
+  exclude_session_state:
+    description:
+      - Do not return neighbors in one of these session states,
+        e.g. C(established) to list the peers that are not up.
+    type: list
+    elements: str
+    choices: [idle, connect, active, opensent, openconfirm, established]
+  prefixes:
+    description:
+      - Also gather the per address-family received and active route counters.
+    type: bool
+    default: true
+
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+- name: List the BGP peers that are not established
+  nokia.srlinux.bgp_neighbor_state:
+    exclude_session_state:
+      - established
+  register: bgp
+  failed_when: bgp.neighbors | length > 0
+"""
+
+RETURN = """
+neighbors:
+  description: One record per neighbor that passed the session state filters.
+  returned: success
+  type: list
+  elements: dict
+  sample:
+    - network_instance: default
+      peer_address: 192.168.10.2
+      session_state: established
+      last_state_change: "2024-05-01T10:12:45.300Z"
+      afi_safi:
+        ipv4-unicast:
+          received: 12
+          active: 10
+summary:
+  description: Number of neighbors per session state, before filtering.
+  returned: success
+  type: dict
+  sample:
+    total: 2
+    established: 1
+    active: 1
+"""
+
+NEIGHBOR_PATH = "/network-instance[name={ni}]/protocols/bgp/neighbor[peer-address=*]"
+NEIGHBOR_LEAVES = ("session-state", "last-state-change")
+PREFIX_LEAVES = (("received-routes", "received"), ("active-routes", "active"))
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    states = ["idle", "connect", "active", "opensent", "openconfirm", "established"]
+    argspec = {
+        "network_instance": {"type": "str", "default": "*"},
+        "session_state": {"type": "list", "elements": "str", "choices": states},
+        "exclude_session_state": {
+            "type": "list",
+            "elements": "str",
+            "choices": states,
+        },
+        "prefixes": {"type": "bool", "default": True},
+    }
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+
+    client = JSONRPCClient(module)
+
+    ni = module.params.get("network_instance")
+    include = set(module.params.get("session_state") or [])
+    exclude = set(module.params.get("exclude_session_state") or [])
+
+    base = NEIGHBOR_PATH.format(ni=ni if ni == "*" else f'"{ni}"')
+    paths = [f"{base}/{leaf}" for leaf in NEIGHBOR_LEAVES]
+    if module.params.get("prefixes"):
+        paths += [
+            f"{base}/afi-safi[afi-safi-name=*]/{leaf}" for leaf, _ in PREFIX_LEAVES
+        ]
+
+    data = {
+        "jsonrpc": JSON_RPC_VERSION,
+        "id": rpcID(),
+        "method": "get",
+        "params": {
+            "commands": [{"path": path, "datastore": "state"} for path in paths],
+        },
+    }
+
+    response = client.post(payload=json.dumps(data))
+    convertResponseKeys(response)
+
+    if not response or response.get("error"):
+        module.fail_json(
+            msg=response.get("error", {}).get("message", "No get response"),
+            jsonrpc_req_id=response.get("jsonrpc_req_id"),
+        )
+
+    # neighbors are keyed by (network-instance, peer-address)
+    neighbors = {}
+    results = response.get("result") or []
+    for leaf, result in zip(NEIGHBOR_LEAVES, results):
+        for (ni_name, peer), value in walk_path(result, f"{base}/{leaf}"):
+            record = neighbors.setdefault(
+                (ni_name, peer),
+                {"network_instance": ni_name, "peer_address": peer},
+            )
+            record[leaf.replace("-", "_")] = value
+    for (leaf, counter), result in zip(PREFIX_LEAVES, results[len(NEIGHBOR_LEAVES):]):
+        path = f"{base}/afi-safi[afi-safi-name=*]/{leaf}"
+        for (ni_name, peer, afi), value in walk_path(result, path):
+            record = neighbors.get((ni_name, peer))
+            if record is not None:
+                afis = record.setdefault("afi_safi", {})
+                afis.setdefault(afi.split(":")[-1], {})[counter] = value
+
+    summary = {"total": len(neighbors)}
+    records = []
+    for record in neighbors.values():
+        state = record.get("session_state")
+        summary[state] = summary.get(state, 0) + 1
+        if (include and state not in include) or state in exclude:
+            continue
+        records.append(record)
+
+    module.exit_json(
+        changed=False,
+        neighbors=records,
+        summary=summary,
+        jsonrpc_req_id=response.get("jsonrpc_req_id"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
     JSON_RPC_VERSION,
 )
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     convertResponseKeys,
@@ -43,6 +46,23 @@ options:
     choices: ["json", "text", "table"]
     default: json
     required: false
+  cache:
+    description:
+      - Answer from the results of the same show commands run before through the same
+        connection, e.g. by an earlier task of the play, instead of running them again.
+      - Only tasks whose commands are all show commands are cached. Any other CLI command
+        or set, such as a commit, sent through the connection drops the cached results, as
+        does a commit of M(nokia.srlinux.config) with I(transport=gnmi).
+      - Changes made to the device by other means are not seen until C(cache_ttl) expires.
+    type: bool
+    default: false
+    version_added: "1.1.0"
+  cache_ttl:
+    description:
+      - Age in seconds up to which results of show commands are reused, with C(cache).
+    type: int
+    default: 60
+    version_added: "1.1.0"
 
 author:
   - Patrick Dumais (@Nokia)
@@ -56,9 +76,39 @@ EXAMPLES = """
     commands:
       - show version
   register: response
+
+- name: Check the route table, reusing the output of an earlier check
+  nokia.srlinux.cli:
+    commands:
+      - show network-instance blue route-table summary
+    cache: true
+    cache_ttl: 300
+"""
+
+RETURN = """
+result:
+  description: Output of the commands, one entry per command in the requested output format.
+  returned: success
+  type: list
+  elements: raw
+jsonrpc_version:
+  description: JSON-RPC version of the response.
+  returned: always
+  type: str
+  sample: "2.0"
+jsonrpc_req_id:
+  description: Id of the JSON-RPC request.
+  returned: always
+  type: str
+  sample: "2024-01-01 12:00:00:000000"
+cached:
+  description: Whether the output was reused from an earlier run of the same show commands.
+  returned: when cache is true
+  type: bool
 """
 
 
+@profiled
 def main():
     """Main function"""
     argspec = {
@@ -72,6 +122,8 @@ def main():
             "choices": ["json", "text", "table"],
             "default": "json",
         },
+        "cache": {"type": "bool", "default": False},
+        "cache_ttl": {"type": "int", "default": 60},
     }
 
     module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
@@ -87,7 +139,12 @@ def main():
         "method": "cli",
         "params": {"commands": commands, "output-format": out_format},
     }
-    response = client.post(payload=json.dumps(data))
+    if module.params.get("cache"):
+        response = client.post(payload=json.dumps(data), cache_ttl=module.params.get("cache_ttl"))
+        if response:
+            response.setdefault("cached", False)
+    else:
+        response = client.post(payload=json.dumps(data))
     convertResponseKeys(response)
 
     if response and response.get("result"):
@@ -9,19 +9,37 @@
 from __future__ import absolute_import, division, print_function
 
 import json
+import os
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.yaml import HAS_YAML, yaml_load
+from ansible_collections.nokia.srlinux.plugins.module_utils.backup import (
+    content_hash,
+    file_hash,
+)
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
     JSON_RPC_VERSION,
     TEXT_FORMAT,
     TOOLS_DATASTORE,
 )
+from ansible_collections.nokia.srlinux.plugins.module_utils.gnmi import (
+    transport_client,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
-    JSONRPCClient,
     convertResponseKeys,
+    get_commit_id,
     process_save_when,
     rpcID,
 )
+from ansible_collections.nokia.srlinux.plugins.module_utils.schema import (
+    precheck,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.trace import (
+    trace_name,
+)
 
 # pylint: disable=invalid-name
 __metaclass__ = type
@@ -106,6 +124,72 @@ options:
     type: int
     description:
       - The number of seconds to wait for a confirmation before reverting the commit.
+  src:
+    type: path
+    description:
+      - JSON or YAML file (by its C(.yml)/C(.yaml) extension) with the value to set at I(src_path).
+      - >-
+        The hash of the file and the commit id of the device are remembered after a
+        successful commit. As long as neither changes, later runs skip both the diff and
+        the set requests, the file is not even parsed.
+        A reformatted file with the same content is recognized by the hash of its canonical JSON.
+  src_path:
+    type: str
+    description:
+      - The path I(src) is set at.
+    default: /
+  src_operation:
+    type: str
+    description:
+      - The operation I(src) is set with, ordered with the other operations of the same kind.
+    choices:
+      - replace
+      - update
+    default: replace
+  src_state_dir:
+    type: path
+    description:
+      - Directory on the controller where the hashes and commit id of the last committed
+        I(src) are kept, one file per device, named after its host and port.
+    default: ~/.ansible/srlinux/config_state
+  schema_index:
+    type: path
+    description:
+      - >-
+        Schema index of the SR Linux release of the device, compiled from its YANG models
+        with C(scripts/compile_schema_index.py).
+        When set, every path, list key and leaf value set in the candidate datastore
+        is checked against the index on the controller, and the module fails before
+        sending the diff and set requests to the device.
+      - Values the index has no rule for (strings, unions, leafrefs) are left to the device.
+  transport:
+    type: str
+    description:
+      - Transport of the set requests.
+      - >-
+        C(gnmi) applies the operations on the candidate datastore as one gNMI Set request
+        with JSON_IETF encoded values, sent to I(gnmi_port) of the device with the host and
+        credentials of the httpapi connection, and reads the commit id for I(src) with gNMI Get.
+        Results are the same as with C(jsonrpc).
+      - >-
+        The diff, the tools datastore, I(confirm_timeout) and saving the config stay on
+        JSON-RPC, gNMI has no equivalent for them.
+      - >-
+        With C(ansible_httpapi_validate_certs=false) the certificate the device presents is
+        trusted, and checked against the name it is issued for (its first SAN, else its CN)
+        rather than the host.
+      - C(gnmi) requires the grpcio and pygnmi Python packages on the controller.
+    choices:
+      - jsonrpc
+      - gnmi
+    default: jsonrpc
+    version_added: "1.1.0"
+  gnmi_port:
+    type: int
+    description:
+      - gNMI port of the device, for I(transport=gnmi).
+    default: 57400
+    version_added: "1.1.0"
 author:
   - Patrick Dumais (@Nokia)
   - Roman Dodin (@Nokia)
@@ -120,9 +204,88 @@ EXAMPLES = """
         value:
           location: Some location
           contact: Some contact
+
+- name: Replace the entire config from a file, skipped when nothing changed since the last run
+  nokia.srlinux.config:
+    src: "configs/{{ inventory_hostname }}.json"
 """
 
+class SrcState:
+    """Hashes of the src file last committed to a device, with the commit id of the device"""
+
+    def __init__(self, module, client):
+        self.module = module
+        self.client = client
+        self.src = module.params.get("src")
+        self.key = f"{module.params.get('src_operation')}:{module.params.get('src_path')}"
+        # devices behind one address, e.g. port-forwarded lab nodes, have a file each
+        name = trace_name(
+            client.connection.get_option("host"), client.connection.get_option("port"), ".json"
+        )
+        self.path = os.path.join(module.params.get("src_state_dir"), name)
+        self.saved = self._read().get(self.key, {})
+        self.file_hash = None
+        self.canonical_hash = None
+        self.commit_id = None
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def unchanged(self):
+        """Whether the src file and the device are as they were after the last commit"""
+        self.file_hash = file_hash(self.src)
+        self.commit_id = get_commit_id(self.client)
+        return (
+            self.commit_id is not None
+            and self.saved.get("commit_id") == self.commit_id
+            and self.saved.get("file_hash") == self.file_hash
+        )
+
+    def load(self):
+        """Parse the src file"""
+        try:
+            with open(self.src, "rb") as f:
+                if self.src.endswith((".yml", ".yaml")):
+                    if not HAS_YAML:
+                        self.module.fail_json(msg="PyYAML is required to load YAML src files")
+                    value = yaml_load(f)
+                else:
+                    value = json.load(f)
+        except (OSError, ValueError) as e:
+            self.module.fail_json(msg=f"cannot load src {self.src}: {e}")
+        self.canonical_hash = content_hash(value)
+        return value
+
+    def same_content(self):
+        """Whether the parsed src equals the last committed one, e.g. after a reformat"""
+        return (
+            self.commit_id is not None
+            and self.saved.get("commit_id") == self.commit_id
+            and self.saved.get("canonical_hash") == self.canonical_hash
+        )
+
+    def save(self, commit_id):
+        """Remember the hashes of the committed src along with the device commit id"""
+        if self.module.check_mode or commit_id is None:
+            return
+        state = self._read()
+        state[self.key] = {
+            "file_hash": self.file_hash,
+            "canonical_hash": self.canonical_hash,
+            "commit_id": commit_id,
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.path)
 
+
+@profiled
 def main():
     """Main entrypoint for module execution"""
     argspec = {
@@ -156,11 +319,18 @@ def main():
         "datastore": {"choices": ["candidate", "tools"], "default": "candidate"},
         "yang_models": {"choices": ["srl", "oc"], "default": "srl"},
         "confirm_timeout": {"type": "int"},
+        "src": {"type": "path"},
+        "src_path": {"type": "str", "default": "/"},
+        "src_operation": {"choices": ["replace", "update"], "default": "replace"},
+        "src_state_dir": {"type": "path", "default": "~/.ansible/srlinux/config_state"},
+        "schema_index": {"type": "path"},
+        "transport": {"choices": ["jsonrpc", "gnmi"], "default": "jsonrpc"},
+        "gnmi_port": {"type": "int", "default": 57400},
     }
 
     module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
 
-    client = JSONRPCClient(module)
+    client = transport_client(module)
 
     # used to track if the module changed anything
     # default state is False
@@ -176,6 +346,28 @@ def main():
     yang_models = module.params.get("yang_models")
     confirm_timeout = module.params.get("confirm_timeout")
 
+    src_state = None
+    if module.params.get("src"):
+        if not os.path.isfile(module.params["src"]):
+            module.fail_json(msg=f"src {module.params['src']} not found")
+        if datastore == TOOLS_DATASTORE:
+            module.fail_json(msg="src can't be used with the tools datastore")
+        src_state = SrcState(module, client)
+        # the skip only holds when src is all there is to set
+        only_src = not (updates or deletes or replaces)
+        if src_state.unchanged() and only_src:
+            json_output["skipped_src"] = True
+            module.exit_json(**json_output)
+        src_cmd = {"path": module.params.get("src_path"), "value": src_state.load()}
+        if src_state.same_content() and only_src:
+            src_state.save(src_state.commit_id)
+            json_output["skipped_src"] = True
+            module.exit_json(**json_output)
+        if module.params.get("src_operation") == "replace":
+            replaces = replaces + [src_cmd]
+        else:
+            updates = updates + [src_cmd]
+
     # since operations are modelled as a dict in this collection
     # an ordering is implied when multiple operations are provided.
     # we add all deletes, followed by replaces, and then followed by updates.
@@ -193,6 +385,10 @@ def main():
         obj["action"] = "update"
         commands += [obj]
 
+    # the index holds the config models, tools commands are left to the device
+    if datastore != TOOLS_DATASTORE and yang_models == "srl":
+        precheck(module, commands)
+
     diff_resp = {}
     # if datastore is tools, collecting diff is a noop, as well as check and diff modes
     if datastore != TOOLS_DATASTORE:
@@ -221,6 +417,9 @@ def main():
         # if diff response is empty, the operation is a noop and we can exit the module
         if not [x for x in diff_resp.get("result") if x.strip() != ""]:
             json_output["jsonrpc_req_id"] = diff_resp["jsonrpc_req_id"]
+            if src_state:
+                # nothing to commit, the device is already at src
+                src_state.save(src_state.commit_id)
             module.exit_json(**json_output)
 
     # if diff response is not empty, we have a diff
@@ -281,6 +480,10 @@ def main():
         json_output["changed"] = changed
         json_output["jsonrpc_req_id"] = set_resp["jsonrpc_req_id"]
 
+        # a commit pending confirmation may still be reverted, it is not remembered
+        if src_state and not confirm_timeout:
+            src_state.save(get_commit_id(client))
+
         # saving configuration if needed
         if not module.check_mode and (
             save_when == "always" or (save_when == "changed" and changed)
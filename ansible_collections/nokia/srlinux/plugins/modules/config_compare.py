@@ -0,0 +1,196 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for comparing SR Linux configuration against a golden config"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.compare import (
+    ConfigDelta,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    JSONRPCClient,
+    convertResponseKeys,
+    rpcID,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: config_compare
+short_description: "Compare the configuration of Nokia SR Linux devices against a golden config."
+description:
+  - >-
+    Compares a running configuration with a golden JSON configuration on the controller,
+    without opening a candidate session on the device.
+    Keyed lists are matched by their keys rather than by position, and module prefixes
+    in names and identityref values are ignored.
+  - >-
+    The result is the set of delete, replace and update commands that turns the running
+    config into the golden one, in the format of the M(nokia.srlinux.config) options.
+  - >-
+    When I(running) is not given the running config at I(path) is fetched with one get
+    request, otherwise no connection to the device is opened.
+version_added: "1.1.0"
+options:
+  golden:
+    description:
+      - The golden configuration, a dict or a JSON string rooted at I(path).
+    type: raw
+    required: true
+  running:
+    description:
+      - The running configuration rooted at I(path), a dict or a JSON string.
+      - Fetched from the device when omitted.
+    type: raw
+  path:
+    description:
+      - Path the configurations are rooted at.
+    type: str
+    default: /
+  ignore_paths:
+    description:
+      - Paths excluded from the comparison, together with everything below them.
+      - C(*) matches within a path element, C(**) across elements,
+        e.g. C(/system/information) or C(/interface[name=*]/statistics).
+    type: list
+    elements: str
+  list_keys:
+    description:
+      - Key leaves of lists, by list name, for lists the built-in table and key detection
+        get wrong, e.g. C({"prefix": ["ip-prefix", "mask-length-range"]}).
+    type: dict
+
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+- name: Compare the running config with the golden config
+  nokia.srlinux.config_compare:
+    golden: "{{ lookup('ansible.builtin.template', 'golden/' + inventory_hostname + '-golden.cfg.json.j2') }}"
+    ignore_paths:
+      - /system/information
+      - /system/tls
+  register: drift
+
+- name: Remediate the drift
+  nokia.srlinux.config:
+    delete: "{{ drift.deletes }}"
+    replace: "{{ drift.replaces }}"
+    update: "{{ drift.updates }}"
+  when: not drift.compliant
+"""
+
+RETURN = """
+compliant:
+  description: Whether the running config matches the golden config.
+  returned: success
+  type: bool
+deletes:
+  description: Paths present in running but not in golden, for the I(delete) option of M(nokia.srlinux.config).
+  returned: success
+  type: list
+  elements: dict
+  sample:
+    - path: /interface[name=ethernet-1/2]
+replaces:
+  description: Leaf-lists and unkeyed lists that differ with their golden value, for the I(replace) option.
+  returned: success
+  type: list
+  elements: dict
+updates:
+  description: Paths missing from running or with another value, with their golden value, for the I(update) option.
+  returned: success
+  type: list
+  elements: dict
+  sample:
+    - path: /interface[name=ethernet-1/1]/description
+      value: to spine1
+summary:
+  description: Number of commands per operation.
+  returned: success
+  type: dict
+  sample:
+    delete: 1
+    replace: 0
+    update: 1
+"""
+
+
+def load_config(module, value, name):
+    """Accept a config as a dict or a JSON string"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError as e:
+            module.fail_json(msg=f"{name} is not valid JSON: {e}")
+    return value
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    argspec = {
+        "golden": {"type": "raw", "required": True},
+        "running": {"type": "raw"},
+        "path": {"type": "str", "default": "/"},
+        "ignore_paths": {"type": "list", "elements": "str"},
+        "list_keys": {"type": "dict"},
+    }
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+
+    path = module.params.get("path")
+    golden = load_config(module, module.params.get("golden"), "golden")
+    running = load_config(module, module.params.get("running"), "running")
+
+    if running is None:
+        client = JSONRPCClient(module)
+        data = {
+            "jsonrpc": JSON_RPC_VERSION,
+            "id": rpcID(),
+            "method": "get",
+            "params": {"commands": [{"path": path, "datastore": "running"}]},
+        }
+        response = client.post(payload=json.dumps(data))
+        convertResponseKeys(response)
+        if not response or response.get("error"):
+            module.fail_json(
+                msg=response.get("error", {}).get("message", "No get response"),
+                jsonrpc_req_id=response.get("jsonrpc_req_id"),
+            )
+        running = (response.get("result") or [{}])[0]
+
+    delta = ConfigDelta(
+        list_keys=module.params.get("list_keys"),
+        ignore_paths=module.params.get("ignore_paths"),
+    ).compare(golden, running, path)
+    commands = delta.commands()
+
+    # returned as plural keys, `result.update` would resolve to dict.update in templates
+    module.exit_json(
+        changed=False,
+        compliant=not any(commands.values()),
+        summary={op: len(cmds) for op, cmds in commands.items()},
+        deletes=commands["delete"],
+        replaces=commands["replace"],
+        updates=commands["update"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for diffing one change set across many SR Linux devices"""
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import http.client
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.urls import basic_auth_header, get_ca_certs, make_context
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+    TEXT_FORMAT,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    rpcID,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: diff_fleet
+short_description: "Diff one change set against many Nokia SR Linux devices at once."
+description:
+  - >-
+    Sends the same update, replace and delete operations, or per-device ones, as JSON-RPC
+    C(diff) requests to many devices concurrently from a single controller process,
+    nothing is committed. Run it with C(connection: local) and C(run_once: true).
+  - >-
+    Identical diffs are grouped, so that a change reviewed on 500 devices reads as a few
+    distinct diffs with the devices they apply to. Only one copy of every distinct diff
+    is kept in memory.
+version_added: "1.1.0"
+options:
+  devices:
+    description:
+      - Devices to diff.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+          - Name of the device in the report, usually C(inventory_hostname).
+        type: str
+        required: true
+      host:
+        description:
+          - Address of the device, I(name) when omitted.
+        type: str
+      port:
+        description:
+          - JSON-RPC port of the device, I(port) when omitted.
+        type: int
+      update:
+        description:
+          - Update operations of this device, replacing the top-level I(update).
+        type: list
+        elements: dict
+      replace:
+        description:
+          - Replace operations of this device, replacing the top-level I(replace).
+        type: list
+        elements: dict
+      delete:
+        description:
+          - Delete operations of this device, replacing the top-level I(delete).
+        type: list
+        elements: dict
+  update:
+    description:
+      - Update operations, C(path) and C(value) dicts as in M(nokia.srlinux.config).
+    type: list
+    elements: dict
+  replace:
+    description:
+      - Replace operations, C(path) and C(value) dicts as in M(nokia.srlinux.config).
+    type: list
+    elements: dict
+  delete:
+    description:
+      - Delete operations, C(path) dicts as in M(nokia.srlinux.config).
+    type: list
+    elements: dict
+  yang_models:
+    type: str
+    description:
+      - YANG models the paths refer to.
+    choices:
+      - srl
+      - oc
+    default: srl
+  username:
+    description:
+      - Username of the JSON-RPC server.
+    type: str
+    required: true
+  password:
+    description:
+      - Password of the JSON-RPC server.
+    type: str
+    required: true
+  use_ssl:
+    description:
+      - Whether to connect over HTTPS.
+    type: bool
+    default: true
+  validate_certs:
+    description:
+      - Whether to validate the TLS certificates of the devices.
+    type: bool
+    default: true
+  ca_path:
+    description:
+      - CA bundle the certificates of the devices are validated with.
+    type: path
+  port:
+    description:
+      - JSON-RPC port of the devices, 443 or 80 depending on I(use_ssl) when omitted.
+    type: int
+  timeout:
+    description:
+      - Timeout of every request, in seconds.
+    type: int
+    default: 30
+  workers:
+    description:
+      - Number of devices diffed concurrently.
+    type: int
+    default: 32
+
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+- name: Review a change on all leaves
+  nokia.srlinux.diff_fleet:
+    devices: >-
+      [{% for h in groups['leaf'] %}
+        {"name": "{{ h }}", "host": "{{ hostvars[h].ansible_host }}"},
+      {% endfor %}]
+    username: admin
+    password: "{{ ansible_password }}"
+    ca_path: /etc/ssl/clab-ca.pem
+    update:
+      - path: /system/information
+        value:
+          location: DC1
+  connection: local
+  run_once: true
+  register: review
+
+- name: Per-device values, rendered beforehand
+  nokia.srlinux.diff_fleet:
+    devices: "{{ leaf_devices }}"
+    username: admin
+    password: "{{ ansible_password }}"
+  vars:
+    leaf_devices: >-
+      [{% for h in groups['leaf'] %}
+        {"name": "{{ h }}", "host": "{{ hostvars[h].ansible_host }}",
+         "update": [{"path": "/system/name/host-name", "value": "{{ h }}"}]},
+      {% endfor %}]
+  connection: local
+  run_once: true
+
+- name: Show the distinct diffs
+  ansible.builtin.debug:
+    msg: "{{ review.report }}"
+"""
+
+RETURN = """
+summary:
+  description: Number of devices per outcome.
+  returned: success
+  type: dict
+  sample:
+    total: 500
+    changed: 500
+    unchanged: 0
+    failed: 0
+    distinct_diffs: 2
+diffs:
+  description: Distinct diffs, the most common first.
+  returned: success
+  type: list
+  elements: dict
+  sample:
+    - id: 3f1a9c2e0b7d
+      count: 320
+      devices: [leaf1, leaf2]
+      diff: "      system {\\n          information {\\n+             location DC1\\n"
+unchanged:
+  description: Devices the change set makes no difference to.
+  returned: success
+  type: list
+  elements: str
+failures:
+  description: Devices the diff failed on, with the error.
+  returned: success
+  type: list
+  elements: dict
+  sample:
+    - device: leaf9
+      error: "<urlopen error timed out>"
+report:
+  description: One line per distinct diff and outcome.
+  returned: success
+  type: list
+  elements: str
+  sample:
+    - "320 devices: diff 3f1a9c2e0b7d"
+    - "180 devices: diff 8e02d4b61f05"
+    - "1 device: failed"
+"""
+
+OPERATIONS = ("delete", "replace", "update")
+
+
+def build_commands(source):
+    """Diff commands of a device, ordered deletes, replaces, updates like config does"""
+    commands = []
+    for action in OPERATIONS:
+        for obj in source.get(action) or []:
+            cmd = {"action": action, "path": obj["path"]}
+            if action != "delete":
+                cmd["value"] = obj.get("value")
+            commands.append(cmd)
+    return commands
+
+
+def diff_payload(commands, yang_models):
+    """Serialized diff request, built once for all devices sharing the commands"""
+    return json.dumps(
+        {
+            "jsonrpc": JSON_RPC_VERSION,
+            "id": rpcID(),
+            "method": "diff",
+            "params": {
+                "commands": commands,
+                "output-format": TEXT_FORMAT,
+                "yang-models": yang_models,
+            },
+        }
+    ).encode("utf-8")
+
+
+def diff_device(device, payload, params, headers, context):
+    """Send a diff request to one device, returns (name, diff text, error).
+
+    The TLS context is shared by all requests, open_url would load the CA bundle
+    again for every device.
+    """
+    host = device.get("host") or device["name"]
+    port = device.get("port") or params["port"] or (443 if params["use_ssl"] else 80)
+    if params["use_ssl"]:
+        conn = http.client.HTTPSConnection(host, port, timeout=params["timeout"], context=context)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=params["timeout"])
+    try:
+        conn.request("POST", "/jsonrpc", body=payload, headers=headers)
+        response = conn.getresponse()
+        data = response.read()
+        if response.status != 200:
+            return device["name"], None, f"HTTP {response.status} {response.reason}"
+        body = json.loads(data)
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        return device["name"], None, str(e) or type(e).__name__
+    finally:
+        conn.close()
+
+    if body.get("error"):
+        return device["name"], None, body["error"].get("message", str(body["error"]))
+    lines = [x for x in body.get("result") or [] if x.strip()]
+    return device["name"], "\n".join(lines), None
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    operation = {"type": "list", "elements": "dict"}
+    argspec = {
+        "devices": {
+            "type": "list",
+            "elements": "dict",
+            "required": True,
+            "options": {
+                "name": {"type": "str", "required": True},
+                "host": {"type": "str"},
+                "port": {"type": "int"},
+                "update": operation,
+                "replace": operation,
+                "delete": operation,
+            },
+        },
+        "update": operation,
+        "replace": operation,
+        "delete": operation,
+        "yang_models": {"choices": ["srl", "oc"], "default": "srl"},
+        "username": {"type": "str", "required": True},
+        "password": {"type": "str", "required": True, "no_log": True},
+        "use_ssl": {"type": "bool", "default": True},
+        "validate_certs": {"type": "bool", "default": True},
+        "ca_path": {"type": "path"},
+        "port": {"type": "int"},
+        "timeout": {"type": "int", "default": 30},
+        "workers": {"type": "int", "default": 32},
+    }
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+
+    params = module.params
+    devices = params.get("devices")
+    try:
+        shared = build_commands(params)
+        for device in devices:
+            device["commands"] = build_commands(device)
+    except KeyError:
+        module.fail_json(msg="every update, replace and delete operation needs a path")
+    shared_payload = diff_payload(shared, params["yang_models"])
+
+    jobs = []
+    for device in devices:
+        if any(device.get(action) is not None for action in OPERATIONS):
+            commands = device["commands"]
+            payload = diff_payload(commands, params["yang_models"])
+        else:
+            commands, payload = shared, shared_payload
+        if not commands:
+            module.fail_json(msg=f"no operations to diff for {device['name']}")
+        jobs.append((device, payload))
+
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": basic_auth_header(params["username"], params["password"]),
+    }
+    context = None
+    if params["use_ssl"]:
+        cafile, cadata, _ = get_ca_certs(params["ca_path"])
+        context = make_context(
+            cafile=cafile, cadata=cadata, validate_certs=params["validate_certs"]
+        )
+
+    # one copy of every distinct diff, devices only hold its id
+    groups, unchanged, failures = {}, [], []
+    with ThreadPoolExecutor(max_workers=max(1, params.get("workers"))) as pool:
+        futures = [
+            pool.submit(diff_device, device, payload, params, headers, context)
+            for device, payload in jobs
+        ]
+        for future in as_completed(futures):
+            name, diff, error = future.result()
+            if error is not None:
+                failures.append({"device": name, "error": error})
+            elif not diff:
+                unchanged.append(name)
+            else:
+                digest = hashlib.sha256(diff.encode("utf-8")).hexdigest()[:12]
+                group = groups.setdefault(digest, {"id": digest, "diff": diff, "devices": []})
+                group["devices"].append(name)
+
+    diffs = sorted(groups.values(), key=lambda g: (-len(g["devices"]), g["id"]))
+    for group in diffs:
+        group["devices"].sort()
+        group["count"] = len(group["devices"])
+    unchanged.sort()
+    failures.sort(key=lambda f: f["device"])
+
+    def plural(count):
+        return f"{count} device{'' if count == 1 else 's'}"
+
+    report = [f"{plural(g['count'])}: diff {g['id']}" for g in diffs]
+    if unchanged:
+        report.append(f"{plural(len(unchanged))}: no changes")
+    if failures:
+        report.append(f"{plural(len(failures))}: failed")
+
+    module.exit_json(
+        changed=False,
+        summary={
+            "total": len(jobs),
+            "changed": sum(g["count"] for g in diffs),
+            "unchanged": len(unchanged),
+            "failed": len(failures),
+            "distinct_diffs": len(diffs),
+        },
+        diffs=diffs,
+        unchanged=unchanged,
+        failures=failures,
+        report=report,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for gathering facts from SR Linux devices"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    COMMIT_ID_PATH,
+    JSON_RPC_VERSION,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.facts import (
+    resolve_subsets,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    JSONRPCClient,
+    convertResponseKeys,
+    get_commit_id,
+    rpcID,
+    strip_identity,
+    walk_path,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: facts
+short_description: "Gather facts from Nokia SR Linux devices."
+description:
+  - >-
+    Gathers the system information, interfaces, network-instances and LLDP neighbors of the
+    device as compact C(ansible_net_*) facts, with one get of all selected subsets across the
+    running and state datastores.
+  - >-
+    With C(cache_ttl) the facts Ansible already has of the host, from an earlier play of the
+    run or from the fact cache, are reused instead of gathered again while they are younger
+    than C(cache_ttl) seconds and the device did not commit a change since.
+version_added: "1.1.0"
+options:
+  gather_subset:
+    description:
+      - Subsets of facts to gather, C(all), C(min), C(system), C(interfaces),
+        C(network_instances) or C(lldp). Prefix a subset with C(!) to leave it out,
+        e.g. C(!lldp) gathers all subsets but C(lldp).
+      - C(system), the C(min) subset, is always gathered.
+    type: list
+    elements: str
+    default: [all]
+  cache_ttl:
+    description:
+      - Seconds facts gathered before are reused for. C(0) always gathers.
+      - Facts of the host are found in the facts Ansible has of it, enable fact caching,
+        e.g. C(fact_caching = jsonfile), to reuse them across playbook runs.
+      - Interface and network-instance oper-state and LLDP neighbors change without commits,
+        reused facts show them as they were up to C(cache_ttl) seconds ago.
+    type: int
+    default: 0
+  validate_commit:
+    description:
+      - Before reusing facts, check with one small get that the device is still at the commit
+        the facts were gathered at, and gather them again when it is not.
+      - With C(false) reused facts are returned without contacting the device.
+    type: bool
+    default: true
+  cached_commit_id:
+    description:
+      - Commit id of facts gathered before. Nothing is gathered and C(cached) is returned
+        when the device is still at this commit.
+      - Set by the action plugin of the module from the facts of the host, tasks leave it unset.
+    type: str
+notes:
+  - The C(cache_ttl) lookup runs in the action plugin of the module, on the controller.
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+- name: Gather all facts
+  nokia.srlinux.facts:
+
+- name: Gather interfaces, reuse the facts of an earlier play for an hour
+  nokia.srlinux.facts:
+    gather_subset:
+      - interfaces
+    cache_ttl: 3600
+
+- name: Show the software version
+  ansible.builtin.debug:
+    var: ansible_net_version
+"""
+
+RETURN = """
+cached:
+  description: Whether the facts were reused rather than gathered.
+  returned: success
+  type: bool
+ansible_facts:
+  description: Facts of the device.
+  returned: success
+  type: dict
+  contains:
+    ansible_net_gather_subset:
+      description: Subsets the facts were gathered for.
+      type: list
+      elements: str
+      sample: [system, interfaces]
+    ansible_net_gathered_at:
+      description: Time the facts were gathered at, in seconds since the epoch.
+      type: int
+    ansible_net_commit_id:
+      description: Id of the last commit of the device when the facts were gathered.
+      type: int
+    ansible_net_hostname:
+      description: Host name of the device.
+      type: str
+    ansible_net_version:
+      description: Software version of the device.
+      type: str
+    ansible_net_model:
+      description: Chassis type of the device.
+      type: str
+      sample: 7220 IXR-D2L
+    ansible_net_serialnum:
+      description: Chassis serial number of the device.
+      type: str
+    ansible_net_system_mac:
+      description: Chassis MAC address of the device.
+      type: str
+    ansible_net_interfaces:
+      description: Interfaces by name, with the addresses of their subinterfaces by index.
+      returned: when the interfaces subset is gathered
+      type: dict
+      sample:
+        ethernet-1/1:
+          admin_state: enable
+          oper_state: up
+          mtu: 9232
+          subinterfaces:
+            "0":
+              ipv4: [192.168.10.1/30]
+    ansible_net_network_instances:
+      description: Network-instances by name.
+      returned: when the network_instances subset is gathered
+      type: dict
+      sample:
+        default:
+          type: default
+          admin_state: enable
+          oper_state: up
+          interfaces: [ethernet-1/1.0, system0.0]
+    ansible_net_neighbors:
+      description: LLDP neighbors by local interface.
+      returned: when the lldp subset is gathered
+      type: dict
+      sample:
+        ethernet-1/1:
+          - host: leaf2
+            port: ethernet-1/1
+            chassis_id: 1A:2B:00:FF:00:00
+"""
+
+# (subset, path, datastore, fact) of every path gathered
+PATHS = (
+    ("system", "/system/name/host-name", "state", "hostname"),
+    ("system", "/system/information/version", "state", "version"),
+    ("system", "/platform/chassis/type", "state", "model"),
+    ("system", "/platform/chassis/serial-number", "state", "serialnum"),
+    ("system", "/platform/chassis/hw-mac-address", "state", "system_mac"),
+    ("system", COMMIT_ID_PATH, "state", "commit_id"),
+    ("interfaces", "/interface[name=*]/admin-state", "running", "admin_state"),
+    ("interfaces", "/interface[name=*]/description", "running", "description"),
+    ("interfaces", "/interface[name=*]/mtu", "running", "mtu"),
+    ("interfaces", "/interface[name=*]/oper-state", "state", "oper_state"),
+    (
+        "interfaces",
+        "/interface[name=*]/subinterface[index=*]/ipv4/address[ip-prefix=*]",
+        "running",
+        "ipv4",
+    ),
+    (
+        "interfaces",
+        "/interface[name=*]/subinterface[index=*]/ipv6/address[ip-prefix=*]",
+        "running",
+        "ipv6",
+    ),
+    ("network_instances", "/network-instance[name=*]/type", "running", "type"),
+    ("network_instances", "/network-instance[name=*]/admin-state", "running", "admin_state"),
+    ("network_instances", "/network-instance[name=*]/oper-state", "state", "oper_state"),
+    ("network_instances", "/network-instance[name=*]/interface[name=*]", "running", "interfaces"),
+    ("lldp", "/system/lldp/interface[name=*]/neighbor[id=*]/system-name", "state", "host"),
+    ("lldp", "/system/lldp/interface[name=*]/neighbor[id=*]/port-id", "state", "port"),
+    ("lldp", "/system/lldp/interface[name=*]/neighbor[id=*]/chassis-id", "state", "chassis_id"),
+)
+
+
+def build_facts(subsets, paths, results):
+    """ansible_net_* facts of the get results of paths"""
+    facts = {"ansible_net_gather_subset": subsets, "ansible_net_gathered_at": int(time.time())}
+    interfaces, instances, neighbors = {}, {}, {}
+    for (subset, path, _, fact), result in zip(paths, results):
+        for keys, value in walk_path(result, path):
+            value = strip_identity(value)
+            if subset == "system":
+                if fact == "commit_id":
+                    current = facts.get("ansible_net_commit_id")
+                    facts["ansible_net_commit_id"] = value if current is None else max(current, value)
+                elif value != {}:
+                    # an unset leaf comes back as an empty container
+                    facts[f"ansible_net_{fact}"] = value
+            elif subset == "interfaces":
+                interface = interfaces.setdefault(keys[0], {})
+                if fact in ("ipv4", "ipv6"):
+                    subinterface = interface.setdefault("subinterfaces", {}).setdefault(str(keys[1]), {})
+                    subinterface.setdefault(fact, []).append(keys[2])
+                else:
+                    interface[fact] = value
+            elif subset == "network_instances":
+                instance = instances.setdefault(keys[0], {})
+                if fact == "interfaces":
+                    instance.setdefault("interfaces", []).append(keys[1])
+                else:
+                    instance[fact] = value
+            else:
+                neighbors.setdefault(keys, {})[fact] = value
+
+    if "interfaces" in subsets:
+        facts["ansible_net_interfaces"] = interfaces
+    if "network_instances" in subsets:
+        facts["ansible_net_network_instances"] = instances
+    if "lldp" in subsets:
+        facts["ansible_net_neighbors"] = {}
+        for (interface, _), neighbor in neighbors.items():
+            facts["ansible_net_neighbors"].setdefault(interface, []).append(neighbor)
+    return facts
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    argspec = {
+        "gather_subset": {"type": "list", "elements": "str", "default": ["all"]},
+        "cache_ttl": {"type": "int", "default": 0},
+        "validate_commit": {"type": "bool", "default": True},
+        "cached_commit_id": {"type": "str"},
+    }
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+
+    try:
+        subsets = resolve_subsets(module.params.get("gather_subset"))
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    client = JSONRPCClient(module)
+
+    cached_commit_id = module.params.get("cached_commit_id")
+    if cached_commit_id is not None:
+        commit_id = get_commit_id(client)
+        if commit_id is not None and str(commit_id) == cached_commit_id:
+            module.exit_json(changed=False, cached=True)
+
+    paths = [p for p in PATHS if p[0] in subsets]
+    data = {
+        "jsonrpc": JSON_RPC_VERSION,
+        "id": rpcID(),
+        "method": "get",
+        "params": {
+            "commands": [
+                {"path": path, "datastore": datastore} for _, path, datastore, _ in paths
+            ],
+        },
+    }
+
+    response = client.post(payload=json.dumps(data))
+    convertResponseKeys(response)
+
+    if not response or response.get("error"):
+        module.fail_json(
+            msg=response.get("error", {}).get("message", "No get response"),
+            jsonrpc_req_id=response.get("jsonrpc_req_id"),
+        )
+
+    facts = build_facts(subsets, paths, response.get("result") or [])
+    module.exit_json(
+        changed=False,
+        cached=False,
+        ansible_facts=facts,
+        jsonrpc_req_id=response.get("jsonrpc_req_id"),
+    )
+
+
+if __name__ == "__main__":
+    main()
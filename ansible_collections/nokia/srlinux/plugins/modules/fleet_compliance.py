@@ -0,0 +1,321 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for checking config snapshots of an SR Linux fleet against golden configs"""
+
+from __future__ import absolute_import, division, print_function
+
+import fnmatch
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.compare import (
+    ConfigDelta,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: fleet_compliance
+short_description: "Check config snapshots of an SR Linux fleet against per-role golden configs."
+description:
+  - >-
+    Compares a directory of running config snapshots, one JSON file per device, with the
+    golden config of the role of every device, without connecting to the devices.
+    Run it with C(connection: local) on the controller, once for the whole fleet.
+  - >-
+    Snapshots are read, parsed and compared by a pool of worker processes, each worker
+    loads a golden config once and reuses it for all devices of the role.
+    The parent process only sees the per-device summaries, the full drift of every
+    device is written by the workers to I(output_dir) as soon as it is computed.
+  - >-
+    Golden configs are JSON files, render Jinja templates beforehand with
+    M(ansible.builtin.template) if needed.
+  - >-
+    The task is changed when a drift file or C(summary.json) in I(output_dir) changes. In check
+    mode nothing is written, changed tells whether the files would change. A device whose
+    comparison fails is reported with an error, the other devices are compared all the same.
+version_added: "1.1.0"
+options:
+  snapshots_dir:
+    description:
+      - Directory with one C(<device>.json) running config snapshot per device.
+    type: path
+    required: true
+  roles:
+    description:
+      - Roles of the fleet, a device gets the first role one of whose patterns matches its name.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+          - Name of the role.
+        type: str
+        required: true
+      golden:
+        description:
+          - Path of the golden JSON config of the role.
+        type: path
+        required: true
+      devices:
+        description:
+          - Shell-style patterns of the device names of the role.
+        type: list
+        elements: str
+        default: ["*"]
+  output_dir:
+    description:
+      - Directory the per-device drift is written to as C(<device>.drift.json),
+        along with C(summary.json). Created if missing.
+    type: path
+    required: true
+  ignore_paths:
+    description:
+      - Paths excluded from the comparison, see M(nokia.srlinux.config_compare).
+    type: list
+    elements: str
+  list_keys:
+    description:
+      - Key leaves of lists by list name, see M(nokia.srlinux.config_compare).
+    type: dict
+  workers:
+    description:
+      - Number of worker processes, defaults to the number of CPUs. C(1) compares in-process.
+    type: int
+
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+- name: Nightly compliance report
+  nokia.srlinux.fleet_compliance:
+    snapshots_dir: /srv/backups/2024-05-01
+    roles:
+      - name: leaf
+        golden: /srv/golden/leaf.json
+        devices: ["leaf*"]
+      - name: spine
+        golden: /srv/golden/spine.json
+        devices: ["spine*"]
+    ignore_paths:
+      - /system/information
+      - /interface[name=mgmt0]
+    output_dir: /srv/reports/2024-05-01
+  connection: local
+  run_once: true
+  register: report
+"""
+
+RETURN = """
+summary:
+  description: Number of devices per outcome.
+  returned: success
+  type: dict
+  sample:
+    total: 2000
+    compliant: 1987
+    drifted: 12
+    failed: 0
+    unassigned: 1
+devices:
+  description: Per-device outcome, sorted by device name. The full drift is in I(output_dir).
+  returned: success
+  type: list
+  elements: dict
+  sample:
+    - device: leaf1
+      role: leaf
+      compliant: false
+      delete: 0
+      replace: 0
+      update: 2
+"""
+
+SNAPSHOT_SUFFIX = ".json"
+DRIFT_SUFFIX = ".drift.json"
+
+# golden configs loaded by a worker process, by path
+_goldens = {}
+
+
+def load_json(path):
+    """Read and parse a JSON file"""
+    with open(path, "rb") as f:
+        return json.loads(f.read())
+
+
+def write_json(path, data, check_mode):
+    """Write data to a JSON file unless the file already has it, whether it changed"""
+    content = json.dumps(data, indent=2)
+    try:
+        with open(path) as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    if not check_mode:
+        with open(path, "w") as f:
+            f.write(content)
+    return True
+
+
+def compare_snapshot(device, role, golden_path, snapshot, output_dir, options, check_mode):
+    """Compare one snapshot with its golden config and write the drift file.
+
+    Runs in a worker process, only the summary and whether the drift file
+    changed go back to the parent.
+    """
+    record = {"device": device, "role": role}
+    try:
+        if golden_path not in _goldens:
+            _goldens[golden_path] = load_json(golden_path)
+        commands = (
+            ConfigDelta(**options)
+            .compare(_goldens[golden_path], load_json(snapshot))
+            .commands()
+        )
+    except (OSError, ValueError) as e:
+        record["error"] = str(e)
+        return record, False
+
+    record["compliant"] = not any(commands.values())
+    record.update({op: len(cmds) for op, cmds in commands.items()})
+    changed = write_json(
+        os.path.join(output_dir, device + DRIFT_SUFFIX),
+        {
+            "device": device,
+            "role": role,
+            "golden": golden_path,
+            "compliant": record["compliant"],
+            "deletes": commands["delete"],
+            "replaces": commands["replace"],
+            "updates": commands["update"],
+        },
+        check_mode,
+    )
+    return record, changed
+
+
+def failed_record(job, error):
+    """Record of a device whose comparison raised an error"""
+    device, role = job[:2]
+    return {"device": device, "role": role, "error": f"{type(error).__name__}: {error}"}
+
+
+def assign_role(device, roles):
+    """First role with a pattern matching the device name"""
+    for role in roles:
+        if any(fnmatch.fnmatchcase(device, p) for p in role["devices"]):
+            return role
+    return None
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    argspec = {
+        "snapshots_dir": {"type": "path", "required": True},
+        "roles": {
+            "type": "list",
+            "elements": "dict",
+            "required": True,
+            "options": {
+                "name": {"type": "str", "required": True},
+                "golden": {"type": "path", "required": True},
+                "devices": {"type": "list", "elements": "str", "default": ["*"]},
+            },
+        },
+        "output_dir": {"type": "path", "required": True},
+        "ignore_paths": {"type": "list", "elements": "str"},
+        "list_keys": {"type": "dict"},
+        "workers": {"type": "int"},
+    }
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+
+    snapshots_dir = module.params.get("snapshots_dir")
+    output_dir = module.params.get("output_dir")
+    roles = module.params.get("roles")
+    options = {
+        "list_keys": module.params.get("list_keys"),
+        "ignore_paths": module.params.get("ignore_paths"),
+    }
+    workers = module.params.get("workers") or os.cpu_count() or 1
+
+    if not os.path.isdir(snapshots_dir):
+        module.fail_json(msg=f"snapshots_dir {snapshots_dir} is not a directory")
+    for role in roles:
+        if not os.path.isfile(role["golden"]):
+            module.fail_json(msg=f"golden config {role['golden']} of role {role['name']} not found")
+    if not module.check_mode:
+        os.makedirs(output_dir, exist_ok=True)
+
+    jobs, records = [], []
+    for name in sorted(os.listdir(snapshots_dir)):
+        if not name.endswith(SNAPSHOT_SUFFIX) or name.endswith(DRIFT_SUFFIX):
+            continue
+        device = name[: -len(SNAPSHOT_SUFFIX)]
+        role = assign_role(device, roles)
+        if role is None:
+            records.append({"device": device, "role": None})
+            continue
+        jobs.append(
+            (device, role["name"], role["golden"], os.path.join(snapshots_dir, name))
+        )
+
+    # a device failing for any reason is reported as such, the others are compared all the same
+    results = []
+    if workers == 1 or len(jobs) < 2:
+        for job in jobs:
+            try:
+                results.append(compare_snapshot(*job, output_dir, options, module.check_mode))
+            except Exception as e:  # pylint: disable=broad-except
+                results.append((failed_record(job, e), False))
+    else:
+        # fork so that the workers inherit the loaded module instead of re-importing it
+        ctx = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {
+                pool.submit(compare_snapshot, *job, output_dir, options, module.check_mode): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:  # pylint: disable=broad-except
+                    results.append((failed_record(futures[future], e), False))
+    records += [record for record, _ in results]
+    changed = any(device_changed for _, device_changed in results)
+
+    records.sort(key=lambda r: r["device"])
+    summary = {
+        "total": len(records),
+        "compliant": sum(1 for r in records if r.get("compliant")),
+        "drifted": sum(1 for r in records if r.get("compliant") is False),
+        "failed": sum(1 for r in records if "error" in r),
+        "unassigned": sum(1 for r in records if r["role"] is None),
+    }
+    changed |= write_json(
+        os.path.join(output_dir, "summary.json"),
+        {"summary": summary, "devices": records},
+        module.check_mode,
+    )
+
+    module.exit_json(changed=changed, summary=summary, devices=records)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,13 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
     JSON_RPC_VERSION,
 )
+from ansible_collections.nokia.srlinux.plugins.module_utils.gnmi import (
+    transport_client,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
-    JSONRPCClient,
     convertIdentifiers,
     convertResponseKeys,
     rpcID,
@@ -62,6 +67,31 @@ options:
         choices:
           - srl
           - oc
+  transport:
+    type: str
+    description:
+      - Transport of the get requests.
+      - >-
+        C(gnmi) sends the paths of the running and state datastores as gNMI Get requests
+        with JSON_IETF encoding to I(gnmi_port) of the device, with the host and credentials
+        of the httpapi connection. Results are the same as with C(jsonrpc).
+        The other datastores are read over JSON-RPC.
+      - >-
+        With C(ansible_httpapi_validate_certs=false) the certificate the device presents is
+        trusted, and checked against the name it is issued for (its first SAN, else its CN)
+        rather than the host.
+      - C(gnmi) requires the grpcio and pygnmi Python packages on the controller.
+    choices:
+      - jsonrpc
+      - gnmi
+    default: jsonrpc
+    version_added: "1.1.0"
+  gnmi_port:
+    type: int
+    description:
+      - gNMI port of the device, for I(transport=gnmi).
+    default: 57400
+    version_added: "1.1.0"
 
 author:
   - Patrick Dumais (@Nokia)
@@ -78,6 +108,7 @@ EXAMPLES = """
 """
 
 
+@profiled
 def main():
     """Main entrypoint for module execution"""
 
@@ -98,11 +129,13 @@ def main():
                 },
             },
         },
+        "transport": {"choices": ["jsonrpc", "gnmi"], "default": "jsonrpc"},
+        "gnmi_port": {"type": "int", "default": 57400},
     }
 
     module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
 
-    client = JSONRPCClient(module)
+    client = transport_client(module)
 
     paths = module.params.get("paths")
     convertIdentifiers(paths)
@@ -10,6 +10,8 @@ import pprint
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import JSON_RPC_VERSION
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import profiled
+from ansible_collections.nokia.srlinux.plugins.module_utils.response import GetResponse
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     rpcID,
@@ -33,8 +35,9 @@ options:
   state:
     description:
       - Whether to set (merged) or delete the hostname.
+      - rendered builds the JSON-RPC set payload offline, without connecting to the device.
     type: str
-    choices: [merged, deleted]
+    choices: [merged, deleted, rendered]
     default: merged
 author:
   - Uzma Saman (@NetOpsChic)
@@ -51,6 +54,13 @@ EXAMPLES = r'''
   nokia.srlinux.hostname:
     config: {}
     state: deleted
+
+- name: Render the hostname set payload (no device connection)
+  nokia.srlinux.hostname:
+    config:
+      hostname: srl01
+    state: rendered
+  delegate_to: localhost
 '''
 
 RETURN = r'''
@@ -63,19 +73,22 @@ after:
 changed:
   description: Whether a change was made.
   type: bool
+rendered:
+  description: JSON-RPC set request that would be sent to the device.
+  returned: when state is rendered
+  type: dict
 '''
 
+@profiled
 def main():
     module = AnsibleModule(
         argument_spec=dict(
             config=dict(type='dict', required=True),
-            state=dict(type='str', choices=['merged', 'deleted'], default='merged'),
+            state=dict(type='str', choices=['merged', 'deleted', 'rendered'], default='merged'),
         ),
         supports_check_mode=True
     )
 
-    client = JSONRPCClient(module)
-
     def build_rpc(method, commands, req_id):
         return {
             "jsonrpc": JSON_RPC_VERSION,
@@ -84,6 +97,20 @@ def main():
             "id": req_id
         }
 
+    # Rendered: return the set payload without connecting to the device
+    if module.params["state"] == "rendered":
+        desired = module.params["config"].get("hostname")
+        if not desired:
+            module.fail_json(msg="config.hostname is required when state=rendered")
+        set_commands = [{"action": "update", "path": "/system/name/host-name", "value": desired}]
+        module.exit_json(
+            changed=False,
+            commands=set_commands,
+            rendered=build_rpc("set", set_commands, rpcID())
+        )
+
+    client = JSONRPCClient(module)
+
     # 1) GET current hostname
     get_commands = [{"path": "/system/name/host-name"}]
     get_rpc = build_rpc("get", get_commands, rpcID())
@@ -93,16 +120,7 @@ def main():
     if response.get("error"):
         module.fail_json(msg="Server error (GET)", response=pprint.pformat(response))
 
-    # --- Normalize result: handle both list and dict ---
-    result = response.get("result", {})
-    if isinstance(result, list):
-        if len(result) > 0 and isinstance(result[0], dict):
-            result = result[0]
-        else:
-            result = {}
-
-    entry = result.get("/system/name/host-name")
-    before = entry["value"] if entry and "value" in entry else None
+    before = GetResponse(response, [c["path"] for c in get_commands]).get("/system/name/host-name")
 
     # Prepare outputs
     desired = module.params["config"].get("hostname")
@@ -7,7 +7,13 @@ import json
 import pprint
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.compact import compact_commands
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import JSON_RPC_VERSION
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import profiled
+from ansible_collections.nokia.srlinux.plugins.module_utils.response import (
+    GetResponse,
+    to_data,
+)
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     rpcID,
@@ -51,9 +57,11 @@ options:
         type: str
         required: true
   state:
-    description: merged (create/update) or deleted (remove config)
+    description:
+      - merged (create/update) or deleted (remove config).
+      - rendered builds the JSON-RPC set payload offline, without connecting to the device.
     type: str
-    choices: [merged, deleted]
+    choices: [merged, deleted, rendered]
     default: merged
 author:
   - Uzma Saman (@NetOpsChic)
@@ -71,10 +79,7 @@ def ni_exists(client, ni_name):
     path = f"/network-instance[name=\"{ni_name}\"]"
     get_rpc = build_rpc("get", [{"path": path}], rpcID())
     resp = client.post(payload=json.dumps(get_rpc))
-    result = resp.get("result", [{}])
-    if isinstance(result, list):
-        result = result[0]
-    return bool(result.get(path))
+    return path in GetResponse(resp, [path])
 
 def create_ni(client, ni_name, desc=None):
     path = f"/network-instance[name=\"{ni_name}\"]"
@@ -90,26 +95,89 @@ def create_ni(client, ni_name, desc=None):
     resp = client.post(payload=json.dumps(rpc))
     return resp
 
+def build_interface_value(iface_item):
+    """Build the interface container value (trunk, access or plain) from a config item"""
+    admin_state = iface_item.get('admin_state', 'enable')
+    desc = iface_item.get('description')
+    trunk_vlans = iface_item.get('trunk_vlans')
+    access_vlan = iface_item.get('access_vlan')
+
+    # --- Trunk logic ---
+    if trunk_vlans:
+        subifs = []
+        for vlan in trunk_vlans:
+            subifs.append({
+                "index": vlan,
+                "vlan": {
+                    "encap": {
+                        "single-tagged": {
+                            "vlan-id": vlan
+                        }
+                    }
+                }
+            })
+        return {
+            "admin-state": admin_state,
+            "description": desc or "",
+            "subinterface": subifs
+        }
+    # --- Access logic ---
+    if access_vlan is not None:
+        return {
+            "admin-state": admin_state,
+            "description": desc or "",
+            "vlan-tagging": True,
+            "subinterface": [{
+                "index": 0,
+                "type": "bridged",
+                "vlan": {
+                    "encap": {
+                        "untagged": {}
+                    }
+                }
+            }]
+        }
+    # Just bring up interface (no VLAN)
+    return {
+        "admin-state": admin_state,
+        "description": desc or "",
+    }
+
+@profiled
 def main():
     module = AnsibleModule(
         argument_spec=dict(
             config=dict(type='list', elements='dict', required=True),
-            state=dict(type='str', choices=['merged', 'deleted'], default='merged'),
+            state=dict(type='str', choices=['merged', 'deleted', 'rendered'], default='merged'),
         ),
         supports_check_mode=True
     )
 
-    client = JSONRPCClient(module)
     state = module.params["state"]
+
+    # Rendered: return the set payload without connecting to the device.
+    # The mac-vrf NI is rendered too, as its presence on the device is unknown.
+    if state == "rendered":
+        cmds = []
+        for iface_item in module.params['config']:
+            cmds.append({
+                "action": "update",
+                "path": f"/network-instance[name=\"{iface_item['network_instance']}\"]",
+                "value": {"type": "mac-vrf"}
+            })
+            cmds.append({
+                "action": "update",
+                "path": f"/interface[name=\"{iface_item['name']}\"]",
+                "value": build_interface_value(iface_item)
+            })
+        module.exit_json(changed=False, commands=cmds, rendered=build_rpc("set", compact_commands(cmds), rpcID()))
+
+    client = JSONRPCClient(module)
     results = []
 
     for iface_item in module.params['config']:
         name = iface_item['name']
         ni = iface_item.get('network_instance')
-        admin_state = iface_item.get('admin_state', 'enable')
-        desc = iface_item.get('description')
-        trunk_vlans = iface_item.get('trunk_vlans')
-        access_vlan = iface_item.get('access_vlan')
         changed = False
         before = {}
         after = {}
@@ -126,10 +194,7 @@ def main():
         response = client.post(payload=json.dumps(get_rpc))
         if response.get("error"):
             module.fail_json(msg=f"Server error (GET) on {name}", response=pprint.pformat(response))
-        result = response.get("result", {})
-        if isinstance(result, list):
-            result = result[0] if result and isinstance(result[0], dict) else {}
-        before = result.get(get_path, {})
+        before = to_data(GetResponse(response, [get_path]).get(get_path, {}))
 
         cmds = []
 
@@ -142,68 +207,15 @@ def main():
                         "path": get_path
                     })
         else:
-            # --- Trunk logic ---
-            if trunk_vlans:
-                subifs = []
-                for vlan in trunk_vlans:
-                    subifs.append({
-                        "index": vlan,
-                        "vlan": {
-                            "encap": {
-                                "single-tagged": {
-                                    "vlan-id": vlan
-                                }
-                            }
-                        }
-                    })
-                iface_val = {
-                    "admin-state": admin_state,
-                    "description": desc or "",
-                    "subinterface": subifs
-                }
-                cmds.append({
-                    "action": "update",
-                    "path": get_path,
-                    "value": iface_val
-                })
-                changed = True
-            # --- Access logic ---
-            elif access_vlan is not None:
-                iface_val = {
-                    "admin-state": admin_state,
-                    "description": desc or "",
-                    "vlan-tagging": True,
-                    "subinterface": [{
-                        "index": 0,
-                        "type": "bridged",
-                        "vlan": {
-                            "encap": {
-                                "untagged": {}
-                            }
-                        }
-                    }]
-                }
-                cmds.append({
-                    "action": "update",
-                    "path": get_path,
-                    "value": iface_val
-                })
-                changed = True
-            else:
-                # Just bring up interface (no VLAN)
-                iface_val = {
-                    "admin-state": admin_state,
-                    "description": desc or "",
-                }
-                cmds.append({
-                    "action": "update",
-                    "path": get_path,
-                    "value": iface_val
-                })
-                changed = True
+            cmds.append({
+                "action": "update",
+                "path": get_path,
+                "value": build_interface_value(iface_item)
+            })
+            changed = True
 
         if changed and not module.check_mode and cmds:
-            rpc = build_rpc("set", cmds, rpcID())
+            rpc = build_rpc("set", compact_commands(cmds), rpcID())
             response = client.post(payload=json.dumps(rpc))
             if response.get("error"):
                 module.fail_json(msg=f"Server error (UPDATE) on {name}", response=pprint.pformat(response))
@@ -7,7 +7,10 @@ import json
 import pprint
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.compact import compact_commands
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import JSON_RPC_VERSION
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import profiled
+from ansible_collections.nokia.srlinux.plugins.module_utils.response import GetResponse
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     rpcID,
@@ -47,9 +50,11 @@ options:
         type: str
         required: true
   state:
-    description: merged (create/update) or deleted (remove config)
+    description:
+      - merged (create/update) or deleted (remove config).
+      - rendered builds the JSON-RPC set payload offline, without connecting to the device.
     type: str
-    choices: [merged, deleted]
+    choices: [merged, deleted, rendered]
     default: merged
 author:
   - Uzma Saman (@NetOpsChic)
@@ -67,10 +72,7 @@ def ni_exists(client, ni_name):
     path = f"/network-instance[name=\"{ni_name}\"]"
     get_rpc = build_rpc("get", [{"path": path}], rpcID())
     resp = client.post(payload=json.dumps(get_rpc))
-    result = resp.get("result", [{}])
-    if isinstance(result, list):
-        result = result[0]
-    return bool(result.get(path))
+    return path in GetResponse(resp, [path])
 
 def create_ni(client, ni_name, desc=None):
     path = f"/network-instance[name=\"{ni_name}\"]"
@@ -85,26 +87,98 @@ def create_ni(client, ni_name, desc=None):
     rpc = build_rpc("set", cmd, rpcID())
     return client.post(payload=json.dumps(rpc))
 
+def build_commands(iface_item):
+    """Build the JSON-RPC set commands for one L3 interface config item"""
+    name = iface_item['name']
+    ni = iface_item.get('network_instance')
+    admin_state = iface_item.get('admin_state', 'enable')
+    ipv4_address = iface_item.get('ipv4_address')
+    cmds = []
+    parent = name.split('.')[0]
+
+    # Enable parent interface
+    cmds.append({
+        "action": "update",
+        "path": f"/interface[name=\"{parent}\"]/admin-state",
+        "value": admin_state
+    })
+
+    if '.' in name:
+        base, idx = name.split('.')
+        idx = int(idx)
+        # Enable subinterface
+        cmds.append({
+            "action": "update",
+            "path": f"/interface[name=\"{base}\"]/subinterface[index={idx}]/admin-state",
+            "value": admin_state
+        })
+        # Enable IPv4 on subinterface
+        cmds.append({
+            "action": "update",
+            "path": f"/interface[name=\"{base}\"]/subinterface[index={idx}]/ipv4/admin-state",
+            "value": "enable"
+        })
+        # Set IPv4 address
+        if ipv4_address:
+            cmds.append({
+                "action": "update",
+                "path": f"/interface[name=\"{base}\"]/subinterface[index={idx}]/ipv4/address[ip-prefix=\"{ipv4_address}\"]",
+                "value": {}
+            })
+        # Attach subinterface to NI
+        cmds.append({
+            "action": "update",
+            "path": f"/network-instance[name=\"{ni}\"]/interface[name=\"{name}\"]",
+            "value": {}
+        })
+    else:
+        # Base interface IPv4
+        if ipv4_address:
+            cmds.append({
+                "action": "update",
+                "path": f"/interface[name=\"{parent}\"]/ipv4/address[ip-prefix=\"{ipv4_address}\"]",
+                "value": {}
+            })
+        cmds.append({
+            "action": "update",
+            "path": f"/network-instance[name=\"{ni}\"]/interface[name=\"{name}\"]",
+            "value": {}
+        })
+
+    return cmds
 
+
+@profiled
 def main():
     module = AnsibleModule(
         argument_spec=dict(
             config=dict(type='list', elements='dict', required=True),
-            state=dict(type='str', choices=['merged', 'deleted'], default='merged'),
+            state=dict(type='str', choices=['merged', 'deleted', 'rendered'], default='merged'),
         ),
         supports_check_mode=True
     )
 
-    client = JSONRPCClient(module)
     state = module.params["state"]
+
+    # Rendered: return the set payload without connecting to the device.
+    # The ip-vrf NI is rendered too, as its presence on the device is unknown.
+    if state == "rendered":
+        cmds = []
+        for iface_item in module.params['config']:
+            cmds.append({
+                "action": "update",
+                "path": f"/network-instance[name=\"{iface_item['network_instance']}\"]",
+                "value": {"type": "ip-vrf"}
+            })
+            cmds.extend(build_commands(iface_item))
+        module.exit_json(changed=False, commands=cmds, rendered=build_rpc("set", compact_commands(cmds), rpcID()))
+
+    client = JSONRPCClient(module)
     results = []
 
     for iface_item in module.params['config']:
         name = iface_item['name']
         ni = iface_item.get('network_instance')
-        admin_state = iface_item.get('admin_state', 'enable')
-        desc = iface_item.get('description', '')
-        ipv4_address = iface_item.get('ipv4_address')
         changed = False
         before = {}
         after = {}
@@ -115,61 +189,11 @@ def main():
                 create_ni(client, ni)
             changed = True
 
-        cmds = []
-        parent = name.split('.')[0]
-
-        # Enable parent interface
-        cmds.append({
-            "action": "update",
-            "path": f"/interface[name=\"{parent}\"]/admin-state",
-            "value": admin_state
-        })
-
-        if '.' in name:
-            base, idx = name.split('.')
-            idx = int(idx)
-            # Enable subinterface
-            cmds.append({
-                "action": "update",
-                "path": f"/interface[name=\"{base}\"]/subinterface[index={idx}]/admin-state",
-                "value": admin_state
-            })
-            # Enable IPv4 on subinterface
-            cmds.append({
-                "action": "update",
-                "path": f"/interface[name=\"{base}\"]/subinterface[index={idx}]/ipv4/admin-state",
-                "value": "enable"
-            })
-            # Set IPv4 address
-            if ipv4_address:
-                cmds.append({
-                    "action": "update",
-                    "path": f"/interface[name=\"{base}\"]/subinterface[index={idx}]/ipv4/address[ip-prefix=\"{ipv4_address}\"]",
-                    "value": {}
-                })
-            # Attach subinterface to NI
-            cmds.append({
-                "action": "update",
-                "path": f"/network-instance[name=\"{ni}\"]/interface[name=\"{name}\"]",
-                "value": {}
-            })
-        else:
-            # Base interface IPv4
-            if ipv4_address:
-                cmds.append({
-                    "action": "update",
-                    "path": f"/interface[name=\"{parent}\"]/ipv4/address[ip-prefix=\"{ipv4_address}\"]",
-                    "value": {}
-                })
-            cmds.append({
-                "action": "update",
-                "path": f"/network-instance[name=\"{ni}\"]/interface[name=\"{name}\"]",
-                "value": {}
-            })
+        cmds = build_commands(iface_item)
 
         # Execute updates
         if cmds and not module.check_mode:
-            rpc = build_rpc("set", cmds, rpcID())
+            rpc = build_rpc("set", compact_commands(cmds), rpcID())
             response = client.post(payload=json.dumps(rpc))
             if response.get("error"):
                 module.fail_json(msg=f"Server error (UPDATE) on {name}", response=pprint.pformat(response))
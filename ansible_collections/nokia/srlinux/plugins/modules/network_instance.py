@@ -7,7 +7,10 @@ import json
 import pprint
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.compact import compact_commands
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import JSON_RPC_VERSION
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import profiled
+from ansible_collections.nokia.srlinux.plugins.module_utils.response import GetResponse
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     rpcID,
@@ -46,9 +49,11 @@ options:
         choices: [enable, disable]
       # Add more suboptions as needed for advanced config (e.g., route-distinguisher)
   state:
-    description: Whether config should be merged or deleted.
+    description:
+      - Whether config should be merged or deleted.
+      - rendered builds the JSON-RPC set payload offline, without connecting to the device.
     type: str
-    choices: [merged, deleted]
+    choices: [merged, deleted, rendered]
     default: merged
 author:
   - Uzma Saman (@NetOpsChic)
@@ -75,13 +80,29 @@ EXAMPLES = r'''
       - name: old-vrf
         type: ip-vrf
     state: deleted
+
+- name: Render the set payload for review (no device connection)
+  nokia.srlinux.network_instance:
+    config:
+      - name: blue
+        type: ip-vrf
+    state: rendered
+  delegate_to: localhost
 '''
 
 RETURN = r'''
 results:
-  description: Per-NI before/after state.
+  description: Per-NI before/after values of the managed leaves (type, admin-state, description).
   type: list
   elements: dict
+commands:
+  description: Set commands sent to the device, empty when every NI is already converged.
+  type: list
+  elements: dict
+rendered:
+  description: JSON-RPC set request that would be sent to the device (state=rendered only).
+  returned: when state is rendered
+  type: dict
 '''
 
 def build_rpc(method, commands, req_id):
@@ -92,74 +113,96 @@ def build_rpc(method, commands, req_id):
         "id": req_id
     }
 
+# leaves of /network-instance this module manages
+MANAGED_LEAVES = ("type", "admin-state", "description")
+
+def build_ni_value(ni_item):
+    """Build the network-instance container value from a config item"""
+    ni_value = {
+        "type": ni_item.get('type'),
+        "admin-state": ni_item.get('admin_state', 'enable'),
+    }
+    if ni_item.get('description'):
+        ni_value["description"] = ni_item['description']
+    return ni_value
+
+def get_managed_leaves(module, client):
+    """Fetch only the leaves this module manages, for every NI, in one get.
+
+    Returns a dict keyed by NI name with the `type`, `admin-state` and
+    `description` leaves, so the rest of the NI subtree never leaves the device.
+    """
+    paths = [
+        {"path": f"/network-instance[name=*]/{leaf}", "datastore": "running"}
+        for leaf in MANAGED_LEAVES
+    ]
+    response = client.post(payload=json.dumps(build_rpc("get", paths, rpcID())))
+    if response.get("error"):
+        module.fail_json(msg="Server error (GET)", response=pprint.pformat(response))
+
+    current = {}
+    result = GetResponse(response, [p["path"] for p in paths])
+    for leaf in MANAGED_LEAVES:
+        for (name,), value in result.walk(f"/network-instance[name=*]/{leaf}"):
+            # identityref values carry the module prefix, e.g. srl_nokia-network-instance:ip-vrf
+            if leaf == "type" and isinstance(value, str):
+                value = value.split(":")[-1]
+            current.setdefault(name, {})[leaf] = value
+    return current
+
+@profiled
 def main():
     module = AnsibleModule(
         argument_spec=dict(
             config=dict(type='list', elements='dict', required=True),
-            state=dict(type='str', choices=['merged', 'deleted'], default='merged'),
+            state=dict(type='str', choices=['merged', 'deleted', 'rendered'], default='merged'),
         ),
         supports_check_mode=True
     )
 
-    client = JSONRPCClient(module)
     state = module.params["state"]
+
+    # Rendered: return the set payload without connecting to the device
+    if state == "rendered":
+        cmds = [{
+            "action": "update",
+            "path": f"/network-instance[name=\"{ni_item['name']}\"]",
+            "value": build_ni_value(ni_item)
+        } for ni_item in module.params['config']]
+        module.exit_json(changed=False, commands=cmds, rendered=build_rpc("set", compact_commands(cmds), rpcID()))
+
+    client = JSONRPCClient(module)
+    current = get_managed_leaves(module, client)
     results = []
+    cmds = []
 
     for ni_item in module.params['config']:
         name = ni_item['name']
-        ni_type = ni_item.get('type')
-        desc = ni_item.get('description')
-        admin_state = ni_item.get('admin_state', 'enable')
-        changed = False
-        before = {}
-        after = {}
-
-        # Path to this network-instance
         ni_path = f"/network-instance[name=\"{name}\"]"
-        get_rpc = build_rpc("get", [{"path": ni_path}], rpcID())
-        response = client.post(payload=json.dumps(get_rpc))
-        if response.get("error"):
-            module.fail_json(msg=f"Server error (GET) on {name}", response=pprint.pformat(response))
-        result = response.get("result", {})
-        if isinstance(result, list):
-            result = result[0] if result and isinstance(result[0], dict) else {}
-        before = result.get(ni_path, {})
-
-        cmds = []
+        before = current.get(name, {})
+        after = {}
+        changed = False
 
         if state == "deleted":
             if before:
                 changed = True
-                if not module.check_mode:
-                    cmds.append({
-                        "action": "delete",
-                        "path": ni_path
-                    })
+                cmds.append({
+                    "action": "delete",
+                    "path": ni_path
+                })
         else:
             # Build NI value dict
-            ni_value = {
-                "type": ni_type,
-                "admin-state": admin_state,
-            }
-            if desc:
-                ni_value["description"] = desc
-
-            # Only push if changed or not present
-            if not before or before != ni_value:
+            ni_value = build_ni_value(ni_item)
+
+            # Only push if absent or any managed leaf differs
+            if not before or any(before.get(k) != v for k, v in ni_value.items()):
                 changed = True
-                if not module.check_mode:
-                    cmds.append({
-                        "action": "update",
-                        "path": ni_path,
-                        "value": ni_value
-                    })
-
-        if changed and not module.check_mode and cmds:
-            rpc = build_rpc("set", cmds, rpcID())
-            response = client.post(payload=json.dumps(rpc))
-            if response.get("error"):
-                module.fail_json(msg=f"Server error (UPDATE) on {name}", response=pprint.pformat(response))
-            after = response.get("result", {})
+                after = ni_value
+                cmds.append({
+                    "action": "update",
+                    "path": ni_path,
+                    "value": ni_value
+                })
 
         results.append({
             "name": name,
@@ -168,7 +211,14 @@ def main():
             "after": after,
         })
 
-    module.exit_json(results=results)
+    # All NIs go out in a single transaction
+    if cmds and not module.check_mode:
+        rpc = build_rpc("set", compact_commands(cmds), rpcID())
+        response = client.post(payload=json.dumps(rpc))
+        if response.get("error"):
+            module.fail_json(msg="Server error (UPDATE)", response=pprint.pformat(response))
+
+    module.exit_json(changed=bool(cmds), commands=cmds, results=results)
 
 if __name__ == "__main__":
     main()
@@ -7,10 +7,13 @@ import json
 import pprint
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.compact import compact_commands
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import JSON_RPC_VERSION
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import profiled
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     rpcID,
+    strip_namespaces,
 )
 
 __metaclass__ = type
@@ -143,9 +146,13 @@ options:
           policy:
             type: str
   state:
-    description: merged (set/update) or deleted (remove config)
+    description:
+      - merged (set/update) or deleted (remove config).
+      - rendered builds the JSON-RPC set payload offline, without connecting to the device.
+      - gathered reads the OSPFv2 instance of I(network_instance) from the running datastore
+        in a single get and returns it in the shape of the I(config) option.
     type: str
-    choices: [merged, deleted]
+    choices: [merged, deleted, rendered, gathered]
     default: merged
 author:
   - Uzma Saman (@NetOpsChic)
@@ -159,22 +166,24 @@ def build_rpc(method, commands, req_id):
         "id": req_id
     }
 
-def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            config=dict(type='dict', required=True),
-            state=dict(type='str', choices=['merged', 'deleted'], default='merged')
-        ),
-        supports_check_mode=True
-    )
+# (module option, YANG leaf) pairs of the OSPF interface leaves
+IFACE_LEAVES = (
+    ("admin_state", "admin-state"),
+    ("cost", "cost"),
+    ("priority", "priority"),
+    ("hello_interval", "hello-interval"),
+    ("dead_interval", "dead-interval"),
+    ("network_type", "network-type"),
+    ("passive", "passive"),
+)
 
-    client = JSONRPCClient(module)
-    state = module.params["state"]
-    cfg = module.params['config']
-    ni = cfg["network_instance"]
-    ospf_path = f"/network-instance[name=\"{ni}\"]/protocols/ospf/instance[name=\"1\"]"
+def ospf_path_for(ni):
+    return f"/network-instance[name=\"{ni}\"]/protocols/ospf/instance[name=\"1\"]"
+
+def build_commands(cfg, state):
+    """Build the JSON-RPC set commands for the given OSPFv2 config and state"""
+    ospf_path = ospf_path_for(cfg["network_instance"])
     cmds = []
-    changed = False
 
     # Handle deleted
     if state == "deleted":
@@ -182,104 +191,185 @@ def main():
             "action": "delete",
             "path": ospf_path
         })
-        changed = True
-    else:
-        ospf_conf = {
-            "admin-state": cfg.get("admin_state", "enable"),
-            "router-id": cfg["router_id"],
-            "version": "ospf-v2"
-        }
-        if cfg.get("reference_bandwidth") is not None:
-            ospf_conf["reference-bandwidth"] = cfg["reference_bandwidth"]
-        if cfg.get("max_metric"):
-            mm = cfg["max_metric"]
-            ospf_conf["max-metric"] = {}
-            if "on_startup" in mm:
-                ospf_conf["max-metric"]["on-startup"] = mm["on_startup"]
-            if "router_lsa" in mm:
-                ospf_conf["max-metric"]["router-lsa"] = mm["router_lsa"]
-        if cfg.get("spf_timers"):
-            spf = cfg["spf_timers"]
-            ospf_conf["spf-timers"] = {}
-            for k, v in spf.items():
-                ospf_conf["spf-timers"][k.replace('_', '-')] = v
-        if cfg.get("lsa_timers"):
-            lsa = cfg["lsa_timers"]
-            ospf_conf["lsa-timers"] = {}
-            for k, v in lsa.items():
-                ospf_conf["lsa-timers"][k.replace('_', '-')] = v
-        if cfg.get("graceful_restart") is not None:
-            ospf_conf["graceful-restart"] = cfg["graceful_restart"]
-        if cfg.get("export_policy"):
-            ospf_conf["export-policy"] = cfg["export_policy"]
+        return cmds
 
-        # 1. Set the OSPF instance itself
-        cmds.append({
-            "action": "update",
-            "path": ospf_path,
-            "value": ospf_conf
-        })
+    ospf_conf = {
+        "admin-state": cfg.get("admin_state", "enable"),
+        "router-id": cfg["router_id"],
+        "version": "ospf-v2"
+    }
+    if cfg.get("reference_bandwidth") is not None:
+        ospf_conf["reference-bandwidth"] = cfg["reference_bandwidth"]
+    if cfg.get("max_metric"):
+        mm = cfg["max_metric"]
+        ospf_conf["max-metric"] = {}
+        if "on_startup" in mm:
+            ospf_conf["max-metric"]["on-startup"] = mm["on_startup"]
+        if "router_lsa" in mm:
+            ospf_conf["max-metric"]["router-lsa"] = mm["router_lsa"]
+    if cfg.get("spf_timers"):
+        spf = cfg["spf_timers"]
+        ospf_conf["spf-timers"] = {}
+        for k, v in spf.items():
+            ospf_conf["spf-timers"][k.replace('_', '-')] = v
+    if cfg.get("lsa_timers"):
+        lsa = cfg["lsa_timers"]
+        ospf_conf["lsa-timers"] = {}
+        for k, v in lsa.items():
+            ospf_conf["lsa-timers"][k.replace('_', '-')] = v
+    if cfg.get("graceful_restart") is not None:
+        ospf_conf["graceful-restart"] = cfg["graceful_restart"]
+    if cfg.get("export_policy"):
+        ospf_conf["export-policy"] = cfg["export_policy"]
+
+    # 1. Set the OSPF instance itself
+    cmds.append({
+        "action": "update",
+        "path": ospf_path,
+        "value": ospf_conf
+    })
+
+    # 2. Area configs
+    if cfg.get("areas"):
+        for area in cfg["areas"]:
+            area_id = area["area_id"]
+            area_path = ospf_path + f"/area[area-id=\"{area_id}\"]"
+            area_conf = {}
+            if area.get("type"):
+                area_conf["type"] = area["type"]
+            if area.get("range"):
+                area_conf["range"] = []
+                for r in area["range"]:
+                    ritem = {"prefix": r["prefix"]}
+                    if "advertise" in r:
+                        ritem["advertise"] = r["advertise"]
+                    area_conf["range"].append(ritem)
+            cmds.append({
+                "action": "update",
+                "path": area_path,
+                "value": area_conf
+            })
+
+            # 3. Interface configs within area
+            if area.get("interfaces"):
+                for iface in area["interfaces"]:
+                    iface_path = area_path + f"/interface[interface-name=\"{iface['name']}\"]"
+                    iface_conf = {}
+                    for option, leaf in IFACE_LEAVES:
+                        if iface.get(option) not in (None, ""):
+                            iface_conf[leaf] = iface[option]
+                    if iface.get("authentication"):
+                        auth = iface["authentication"]
+                        iface_conf["authentication"] = {
+                            "type": auth.get("type", "none"),
+                        }
+                        if "key_id" in auth:
+                            iface_conf["authentication"]["key-id"] = auth["key_id"]
+                        if "key" in auth:
+                            iface_conf["authentication"]["key"] = auth["key"]
+                    cmds.append({
+                        "action": "update",
+                        "path": iface_path,
+                        "value": iface_conf
+                    })
 
-        # 2. Area configs
-        if cfg.get("areas"):
-            for area in cfg["areas"]:
-                area_id = area["area_id"]
-                area_path = ospf_path + f"/area[area-id=\"{area_id}\"]"
-                area_conf = {}
-                if area.get("type"):
-                    area_conf["type"] = area["type"]
-                if area.get("range"):
-                    area_conf["range"] = []
-                    for r in area["range"]:
-                        ritem = {"prefix": r["prefix"]}
-                        if "advertise" in r:
-                            ritem["advertise"] = r["advertise"]
-                        area_conf["range"].append(ritem)
-                cmds.append({
-                    "action": "update",
-                    "path": area_path,
-                    "value": area_conf
-                })
+    return cmds
 
-                # 3. Interface configs within area
-                if area.get("interfaces"):
-                    for iface in area["interfaces"]:
-                        iface_path = area_path + f"/interface[interface-name=\"{iface['name']}\"]"
-                        iface_conf = {}
-                        if iface.get("admin_state"):
-                            iface_conf["admin-state"] = iface["admin_state"]
-                        if iface.get("cost") is not None:
-                            iface_conf["cost"] = iface["cost"]
-                        if iface.get("priority") is not None:
-                            iface_conf["priority"] = iface["priority"]
-                        if iface.get("hello_interval") is not None:
-                            iface_conf["hello-interval"] = iface["hello_interval"]
-                        if iface.get("dead_interval") is not None:
-                            iface_conf["dead-interval"] = iface["dead_interval"]
-                        if iface.get("network_type"):
-                            iface_conf["network-type"] = iface["network_type"]
-                        if iface.get("passive") is not None:
-                            iface_conf["passive"] = iface["passive"]
-                        if iface.get("authentication"):
-                            auth = iface["authentication"]
-                            iface_conf["authentication"] = {
-                                "type": auth.get("type", "none"),
-                            }
-                            if "key_id" in auth:
-                                iface_conf["authentication"]["key-id"] = auth["key_id"]
-                            if "key" in auth:
-                                iface_conf["authentication"]["key"] = auth["key"]
-                        cmds.append({
-                            "action": "update",
-                            "path": iface_path,
-                            "value": iface_conf
-                        })
-        
+def parse_config(data, ni):
+    """Convert the running OSPF instance subtree into the shape of the config option"""
+    data = strip_namespaces(data or {})
+    cfg = {
+        "network_instance": ni,
+        "router_id": data.get("router-id"),
+        "admin_state": data.get("admin-state", "enable"),
+    }
+    if "reference-bandwidth" in data:
+        cfg["reference_bandwidth"] = data["reference-bandwidth"]
+    if "max-metric" in data:
+        mm = data["max-metric"]
+        cfg["max_metric"] = {}
+        if "on-startup" in mm:
+            cfg["max_metric"]["on_startup"] = mm["on-startup"]
+        if "router-lsa" in mm:
+            cfg["max_metric"]["router_lsa"] = mm["router-lsa"]
+    for timers in ("spf-timers", "lsa-timers"):
+        if timers in data:
+            cfg[timers.replace('-', '_')] = {
+                k.replace('-', '_'): v for k, v in data[timers].items()
+            }
+    if "graceful-restart" in data:
+        cfg["graceful_restart"] = data["graceful-restart"]
+    if "export-policy" in data:
+        cfg["export_policy"] = data["export-policy"]
+
+    areas = []
+    for area in data.get("area", []):
+        area_cfg = {"area_id": area["area-id"]}
+        if "type" in area:
+            area_cfg["type"] = area["type"]
+        if "range" in area:
+            area_cfg["range"] = []
+            for r in area["range"]:
+                ritem = {"prefix": r["prefix"]}
+                if "advertise" in r:
+                    ritem["advertise"] = r["advertise"]
+                area_cfg["range"].append(ritem)
+        interfaces = []
+        for iface in area.get("interface", []):
+            iface_cfg = {"name": iface["interface-name"]}
+            for option, leaf in IFACE_LEAVES:
+                if leaf in iface:
+                    iface_cfg[option] = iface[leaf]
+            if "authentication" in iface:
+                auth = iface["authentication"]
+                iface_cfg["authentication"] = {"type": auth.get("type", "none")}
+                if "key-id" in auth:
+                    iface_cfg["authentication"]["key_id"] = auth["key-id"]
+                if "key" in auth:
+                    iface_cfg["authentication"]["key"] = auth["key"]
+            interfaces.append(iface_cfg)
+        if interfaces:
+            area_cfg["interfaces"] = interfaces
+        areas.append(area_cfg)
+    if areas:
+        cfg["areas"] = areas
+
+    return cfg
+
+@profiled
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            config=dict(type='dict', required=True),
+            state=dict(type='str', choices=['merged', 'deleted', 'rendered', 'gathered'], default='merged')
+        ),
+        supports_check_mode=True
+    )
 
-        changed = True
+    state = module.params["state"]
+
+    # Gathered: one get of the OSPF instance, converted back to the config shape
+    if state == "gathered":
+        client = JSONRPCClient(module)
+        ni = module.params['config']["network_instance"]
+        get_rpc = build_rpc("get", [{"path": ospf_path_for(ni), "datastore": "running"}], rpcID())
+        response = client.post(payload=json.dumps(get_rpc))
+        if response.get("error"):
+            module.fail_json(msg="Server error (GET)", response=pprint.pformat(response))
+        result = response.get("result", [{}])
+        module.exit_json(changed=False, gathered=parse_config(result[0] if result else {}, ni))
+
+    cmds = build_commands(module.params['config'], state)
+
+    # Rendered: return the set payload without connecting to the device
+    if state == "rendered":
+        module.exit_json(changed=False, commands=cmds, rendered=build_rpc("set", compact_commands(cmds), rpcID()))
+
+    client = JSONRPCClient(module)
+    changed = True
 
     if changed and not module.check_mode and cmds:
-        rpc = build_rpc("set", cmds, rpcID())
+        rpc = build_rpc("set", compact_commands(cmds), rpcID())
         response = client.post(payload=json.dumps(rpc))
         if response.get("error"):
             module.fail_json(msg="Server error (UPDATE)", response=pprint.pformat(response))
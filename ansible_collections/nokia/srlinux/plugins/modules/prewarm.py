@@ -0,0 +1,116 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for opening the connections to SR Linux devices ahead of the real tasks"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    JSONRPCClient,
+    convertResponseKeys,
+    rpcID,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: prewarm
+short_description: "Open the connection to Nokia SR Linux devices ahead of the real tasks."
+description:
+  - >-
+    Starts the persistent connection to the device and sends one small authenticated
+    request, a get of the software version, so the TLS handshake and the authentication
+    are done before the first real task. With the C(srlinux_keepalive) option of the
+    httpapi plugin enabled the connection stays open for the tasks that follow.
+  - >-
+    Run it as the first task of a play, with C(strategy: free) and forks up to the number
+    of hosts to open the connections to all targeted devices in parallel. Unreachable
+    devices and wrong credentials then fail this task instead of the first change.
+version_added: "1.1.0"
+options: {}
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+# with ansible_srlinux_keepalive: true set for the hosts in the inventory
+- name: Open the connections to all devices
+  hosts: srl
+  gather_facts: false
+  strategy: free
+  tasks:
+    - name: Pre-warm the connection
+      nokia.srlinux.prewarm:
+
+- name: Configure the devices
+  hosts: srl
+  gather_facts: false
+  tasks:
+    - name: Set system information
+      nokia.srlinux.config:
+        update:
+          - path: /system/information
+            value:
+              location: Some location
+"""
+
+RETURN = """
+version:
+  description: Software version of the device.
+  returned: success
+  type: str
+  sample: v24.3.2-118-g706b4f0d99
+elapsed:
+  description: Seconds the request took, with the TLS handshake and the authentication.
+  returned: success
+  type: float
+  sample: 0.182
+"""
+
+VERSION_PATH = "/system/information/version"
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    module = AnsibleModule(argument_spec={}, supports_check_mode=True)
+
+    client = JSONRPCClient(module)
+
+    data = {
+        "jsonrpc": JSON_RPC_VERSION,
+        "id": rpcID(),
+        "method": "get",
+        "params": {"commands": [{"path": VERSION_PATH, "datastore": "state"}]},
+    }
+
+    started = time.perf_counter()
+    response = client.post(payload=json.dumps(data))
+    elapsed = time.perf_counter() - started
+    convertResponseKeys(response)
+
+    if response.get("error"):
+        module.fail_json(
+            msg=response["error"]["message"], jsonrpc_req_id=response.get("jsonrpc_req_id")
+        )
+
+    version = (response.get("result") or [None])[0]
+    module.exit_json(changed=False, version=version, elapsed=round(elapsed, 3))
+
+
+if __name__ == "__main__":
+    main()
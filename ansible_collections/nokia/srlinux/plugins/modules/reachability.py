@@ -0,0 +1,247 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for checking reachability of a list of targets from SR Linux devices"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import math
+import re
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import ConnectionError
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+    TEXT_FORMAT,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    JSONRPCClient,
+    convertResponseKeys,
+    rpcID,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: reachability
+short_description: "Ping a list of targets from Nokia SR Linux devices and return structured results."
+description:
+  - >-
+    Runs a ping to every target from a network-instance, batching the pings into one CLI
+    request per I(batch_size) targets, and parses the output into
+    packet loss and round-trip times per target.
+    A full-mesh check therefore is one task per node instead of one task per target.
+  - >-
+    Should a batch fail as a whole (e.g. an unresolvable target), its targets are retried
+    one request each so that the failure is reported against the right target.
+version_added: "1.1.0"
+options:
+  targets:
+    description:
+      - IP addresses or host names to ping.
+    type: list
+    elements: str
+    required: true
+  network_instance:
+    description:
+      - Network-instance to ping from.
+    type: str
+    default: default
+  count:
+    description:
+      - Number of echo requests per target.
+    type: int
+    default: 2
+  interval:
+    description:
+      - Seconds between echo requests, passed as C(-i).
+    type: float
+  deadline:
+    description:
+      - Maximum seconds a single ping may run, passed as C(-w).
+      - Defaults to I(count) times I(interval) (1 second by default) plus one second, so that
+        an unreachable target does not hold up its batch for the 10 seconds ping waits otherwise.
+    type: int
+  batch_size:
+    description:
+      - Maximum number of targets per CLI request. C(0) sends all targets in one request.
+      - The pings of a request run one after another and take up to I(deadline) seconds each.
+        Batches are made smaller where needed so that a batch of unreachable targets still
+        finishes within the command timeout of the persistent connection,
+        C(ansible_command_timeout), 30 seconds by default.
+    type: int
+    default: 10
+  fail_on_unreachable:
+    description:
+      - Fail the task if any target is unreachable.
+    type: bool
+    default: false
+
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+- name: Ping all next-hops in VRF blue
+  nokia.srlinux.reachability:
+    targets: "{{ test_ips }}"
+    network_instance: blue
+    fail_on_unreachable: true
+"""
+
+RETURN = """
+results:
+  description: Per-target ping outcome.
+  returned: success
+  type: list
+  elements: dict
+  sample:
+    - target: 10.1.1.2
+      reachable: true
+      transmitted: 2
+      received: 2
+      loss: 0.0
+      rtt_min: 0.051
+      rtt_avg: 0.064
+      rtt_max: 0.078
+unreachable_targets:
+  description: Targets that did not answer.
+  returned: success
+  type: list
+  elements: str
+"""
+
+# seconds of the command timeout kept free for the request itself
+TIMEOUT_MARGIN = 5
+DEFAULT_COMMAND_TIMEOUT = 30
+
+STATS_RE = re.compile(r"(\d+) packets transmitted, (\d+) (?:packets )?received")
+LOSS_RE = re.compile(r"([\d.]+)% packet loss")
+RTT_RE = re.compile(r"= ([\d.]+)/([\d.]+)/([\d.]+)(?:/[\d.]+)? ms")
+
+
+def ping_command(target, params):
+    """Build the CLI ping command for a target"""
+    cmd = f"ping {target} -c {params['count']}"
+    if params.get("interval") is not None:
+        cmd += f" -i {params['interval']}"
+    if params.get("deadline") is not None:
+        cmd += f" -w {params['deadline']}"
+    return cmd + f" network-instance {params['network_instance']}"
+
+
+def default_deadline(params):
+    """Seconds a ping of count echo requests takes at most when nothing answers"""
+    interval = params.get("interval")
+    return math.ceil(params["count"] * (1 if interval is None else interval)) + 1
+
+
+def command_timeout(client):
+    """Command timeout of the persistent connection"""
+    try:
+        return int(client.connection.get_option("persistent_command_timeout"))
+    except (AttributeError, ConnectionError, TypeError, ValueError):
+        return DEFAULT_COMMAND_TIMEOUT
+
+
+def parse_ping(target, text):
+    """Parse the summary lines of a ping output"""
+    record = {"target": target, "reachable": False}
+    stats = STATS_RE.search(text or "")
+    if stats:
+        record["transmitted"] = int(stats.group(1))
+        record["received"] = int(stats.group(2))
+        record["reachable"] = record["received"] > 0
+    loss = LOSS_RE.search(text or "")
+    if loss:
+        record["loss"] = float(loss.group(1))
+    rtt = RTT_RE.search(text or "")
+    if rtt:
+        record["rtt_min"], record["rtt_avg"], record["rtt_max"] = (
+            float(v) for v in rtt.groups()
+        )
+    return record
+
+
+def run_batch(client, targets, params):
+    """Ping a batch of targets in one cli request, returns the response"""
+    data = {
+        "jsonrpc": JSON_RPC_VERSION,
+        "id": rpcID(),
+        "method": "cli",
+        "params": {
+            "commands": [ping_command(t, params) for t in targets],
+            "output-format": TEXT_FORMAT,
+        },
+    }
+    response = client.post(payload=json.dumps(data))
+    convertResponseKeys(response)
+    return response
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    argspec = {
+        "targets": {"type": "list", "elements": "str", "required": True},
+        "network_instance": {"type": "str", "default": "default"},
+        "count": {"type": "int", "default": 2},
+        "interval": {"type": "float"},
+        "deadline": {"type": "int"},
+        "batch_size": {"type": "int", "default": 10},
+        "fail_on_unreachable": {"type": "bool", "default": False},
+    }
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+
+    client = JSONRPCClient(module)
+
+    targets = module.params.get("targets")
+    if module.params.get("deadline") is None:
+        module.params["deadline"] = default_deadline(module.params)
+    # a batch of unreachable targets must still answer within the command timeout
+    fits = max(1, (command_timeout(client) - TIMEOUT_MARGIN) // max(1, module.params["deadline"]))
+    batch_size = min(module.params.get("batch_size") or len(targets) or 1, fits)
+
+    results = []
+    for i in range(0, len(targets), batch_size):
+        batch = targets[i:i + batch_size]
+        response = run_batch(client, batch, module.params)
+        if response and not response.get("error"):
+            for target, out in zip(batch, response.get("result") or []):
+                results.append(parse_ping(target, (out or {}).get("text")))
+            continue
+
+        # the whole batch failed, retry target by target to pin the error down
+        for target in batch:
+            single = run_batch(client, [target], module.params) if len(batch) > 1 else response
+            if single and not single.get("error"):
+                results.append(parse_ping(target, (single["result"][0] or {}).get("text")))
+            else:
+                record = parse_ping(target, "")
+                record["error"] = (single or {}).get("error", {}).get("message", "No cli response")
+                results.append(record)
+
+    unreachable = [r["target"] for r in results if not r["reachable"]]
+    output = {
+        "changed": False,
+        "results": results,
+        "unreachable_targets": unreachable,
+    }
+
+    if unreachable and module.params.get("fail_on_unreachable"):
+        module.fail_json(msg=f"{len(unreachable)} of {len(targets)} targets unreachable", **output)
+
+    module.exit_json(**output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for gathering and checking the route table of SR Linux devices"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.route_table import (
+    PREFIX_LEAF,
+    RouteTable,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    JSONRPCClient,
+    convertResponseKeys,
+    rpcID,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: route_table
+short_description: "Gather and check the route table of a network-instance on Nokia SR Linux devices."
+description:
+  - >-
+    Reads the IPv4 or IPv6 route table of a network-instance from the state datastore
+    and keeps it in a compact columnar form (packed prefixes, protocol and next-hop-group
+    indices) instead of returning the raw JSON, so that full tables of a border leaf
+    can be checked without templating over every route.
+  - >-
+    Expected prefixes are checked with an exact match, addresses are resolved with
+    a longest-prefix-match. Only the per-protocol summary and the outcome of these
+    checks are returned unless I(return_routes) is set.
+version_added: "1.1.0"
+options:
+  network_instance:
+    description:
+      - Network-instance whose route table is read.
+    type: str
+    required: true
+  afi:
+    description:
+      - Address family of the route table.
+    type: str
+    choices: [ipv4-unicast, ipv6-unicast]
+    default: ipv4-unicast
+  expected:
+    description:
+      - Prefixes that must be present in the route table.
+    type: list
+    elements: dict
+    suboptions:
+      prefix:
+        description:
+          - The prefix, host bits are ignored.
+        type: str
+        required: true
+      protocol:
+        description:
+          - Protocol the route must be learned from, e.g. C(static), C(bgp) or C(local).
+        type: str
+  lookup:
+    description:
+      - Addresses to resolve with a longest-prefix-match.
+    type: list
+    elements: str
+  only_mismatches:
+    description:
+      - Only return the expected prefixes that are missing or have another protocol.
+    type: bool
+    default: false
+  return_routes:
+    description:
+      - Also return every route of the table. Not recommended for full tables.
+    type: bool
+    default: false
+
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+- name: Check the static routes of VRF blue
+  nokia.srlinux.route_table:
+    network_instance: blue
+    expected:
+      - prefix: 192.168.20.0/24
+        protocol: static
+      - prefix: 192.168.30.0/24
+        protocol: static
+    lookup:
+      - 192.168.20.10
+    only_mismatches: true
+  register: rt
+  failed_when: rt.mismatches | length > 0
+"""
+
+RETURN = """
+summary:
+  description: Number of routes in the table, in total and per protocol.
+  returned: success
+  type: dict
+  sample:
+    total: 6
+    protocols:
+      local: 2
+      host: 2
+      static: 2
+expected:
+  description: Outcome per expected prefix, only the failing ones with I(only_mismatches).
+  returned: when expected is set
+  type: list
+  elements: dict
+  sample:
+    - prefix: 192.168.20.0/24
+      present: true
+      protocol: static
+      next_hop_group: "1234"
+      ok: true
+mismatches:
+  description: Expected prefixes that are missing or have another protocol.
+  returned: when expected is set
+  type: list
+  elements: str
+lookup:
+  description: Longest-prefix-match route per looked up address, null when there is no match.
+  returned: when lookup is set
+  type: dict
+  sample:
+    192.168.20.10:
+      prefix: 192.168.20.0/24
+      protocol: static
+      next_hop_group: "1234"
+routes:
+  description: All routes of the table.
+  returned: when return_routes is true
+  type: list
+  elements: dict
+"""
+
+ROUTE_TABLE_PATH = "/network-instance[name={ni}]/route-table/{afi}"
+
+
+def find_routes(node):
+    """Find the route list in a route-table get result.
+
+    The result is rooted at the route-table or the afi container depending on the
+    release, and keys may carry their module prefix.
+    """
+    if not isinstance(node, dict):
+        return None
+    for key, value in node.items():
+        name = key.split(":")[-1]
+        if name == "route" and isinstance(value, list):
+            return value
+        if name in ("route-table", "ipv4-unicast", "ipv6-unicast"):
+            return find_routes(value)
+    return None
+
+
+def check_expected(table, expected):
+    """Check the expected prefixes, returns the records and the failing prefixes"""
+    records, mismatches = [], []
+    for item in expected:
+        record = {"prefix": item["prefix"], "present": False}
+        route = table.get(item["prefix"])
+        if route is not None:
+            record.update(present=True, protocol=route["protocol"],
+                          next_hop_group=route["next_hop_group"])
+        record["ok"] = record["present"] and (
+            not item.get("protocol") or item["protocol"] == record["protocol"]
+        )
+        if item.get("protocol"):
+            record["expected_protocol"] = item["protocol"]
+        if not record["ok"]:
+            mismatches.append(item["prefix"])
+        records.append(record)
+    return records, mismatches
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    argspec = {
+        "network_instance": {"type": "str", "required": True},
+        "afi": {
+            "type": "str",
+            "choices": list(PREFIX_LEAF),
+            "default": "ipv4-unicast",
+        },
+        "expected": {
+            "type": "list",
+            "elements": "dict",
+            "options": {
+                "prefix": {"type": "str", "required": True},
+                "protocol": {"type": "str"},
+            },
+        },
+        "lookup": {"type": "list", "elements": "str"},
+        "only_mismatches": {"type": "bool", "default": False},
+        "return_routes": {"type": "bool", "default": False},
+    }
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+
+    client = JSONRPCClient(module)
+
+    afi = module.params.get("afi")
+    path = ROUTE_TABLE_PATH.format(
+        ni=f'"{module.params.get("network_instance")}"', afi=afi
+    )
+
+    data = {
+        "jsonrpc": JSON_RPC_VERSION,
+        "id": rpcID(),
+        "method": "get",
+        "params": {"commands": [{"path": path, "datastore": "state"}]},
+    }
+
+    response = client.post(payload=json.dumps(data))
+    convertResponseKeys(response)
+    if not response or response.get("error"):
+        module.fail_json(
+            msg=response.get("error", {}).get("message", "No get response"),
+            jsonrpc_req_id=response.get("jsonrpc_req_id"),
+        )
+    req_id = response.get("jsonrpc_req_id")
+
+    # the route list is converted row by row and dropped with the response,
+    # only the columns are kept around
+    entries = find_routes((response.pop("result") or [{}])[0]) or []
+    del response
+    try:
+        table = RouteTable.from_entries(entries, afi)
+    except (KeyError, ValueError) as e:
+        module.fail_json(msg=f"Unexpected route entry: {e}", jsonrpc_req_id=req_id)
+
+    output = {
+        "changed": False,
+        "summary": {"total": len(table), "protocols": table.protocol_summary()},
+        "jsonrpc_req_id": req_id,
+    }
+
+    if module.params.get("expected") is not None:
+        try:
+            records, mismatches = check_expected(table, module.params["expected"])
+        except (OSError, ValueError) as e:
+            module.fail_json(msg=f"Invalid prefix: {e}", **output)
+        if module.params.get("only_mismatches"):
+            records = [r for r in records if not r["ok"]]
+        output["expected"] = records
+        output["mismatches"] = mismatches
+
+    if module.params.get("lookup") is not None:
+        try:
+            output["lookup"] = {a: table.lookup(a) for a in module.params["lookup"]}
+        except (OSError, ValueError) as e:
+            module.fail_json(msg=f"Invalid address: {e}", **output)
+
+    if module.params.get("return_routes"):
+        output["routes"] = list(table.routes())
+
+    module.exit_json(**output)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,13 @@ import json
 import pprint
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.compact import compact_commands
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import JSON_RPC_VERSION
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import profiled
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     rpcID,
+    strip_namespaces,
 )
 
 __metaclass__ = type
@@ -25,6 +28,7 @@ options:
   config:
     description:
       - Routing policy config.
+      - Not required when I(state=gathered).
     type: dict
     suboptions:
       prefix_sets:
@@ -69,14 +73,48 @@ options:
                   policy_result:
                     type: str
   state:
-    description: merged (set/update) or deleted (remove config)
+    description:
+      - merged (set/update) or deleted (remove config).
+      - rendered builds the JSON-RPC set payload offline, without connecting to the device.
+      - gathered reads the prefix-sets and policies from the running datastore in a single get
+        and returns them in the shape of the I(config) option.
     type: str
-    choices: [merged, deleted]
+    choices: [merged, deleted, rendered, gathered]
     default: merged
 author:
   - Uzma Saman (@NetOpsChic)
 '''
 
+RETURN = r'''
+commands:
+  description: Set commands built from I(config).
+  returned: when state is rendered
+  type: list
+  elements: dict
+rendered:
+  description: JSON-RPC set request that would be sent to the device.
+  returned: when state is rendered
+  type: dict
+gathered:
+  description: Routing policy of the device, in the shape of the I(config) option.
+  returned: when state is gathered
+  type: dict
+  sample:
+    prefix_sets:
+      - name: loopbacks
+        prefixes:
+          - ip_prefix: 10.0.0.0/24
+            mask_length_range: 32..32
+    policies:
+      - name: export-loopbacks
+        statements:
+          - name: "10"
+            match:
+              prefix_set: loopbacks
+            action:
+              policy_result: accept
+'''
+
 def build_rpc(method, commands, req_id):
     return {
         "jsonrpc": JSON_RPC_VERSION,
@@ -85,20 +123,9 @@ def build_rpc(method, commands, req_id):
         "id": req_id
     }
 
-def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            config=dict(type='dict', required=True),
-            state=dict(type='str', choices=['merged', 'deleted'], default='merged')
-        ),
-        supports_check_mode=True
-    )
-
-    client = JSONRPCClient(module)
-    state = module.params["state"]
-    config = module.params['config']
+def build_commands(config, state):
+    """Build the JSON-RPC set commands for the given routing policy config and state"""
     cmds = []
-    changed = False
 
     if state == "deleted":
         # Delete policies first, then prefix-sets
@@ -112,45 +139,116 @@ def main():
                 "action": "delete",
                 "path": f"/routing-policy/prefix-set[name={ps['name']}]"
             })
-        changed = True
-    else:
-        # 1. Prefix-sets (must exist before policy uses them)
-        for ps in config.get("prefix_sets", []):
+        return cmds
+
+    # 1. Prefix-sets (must exist before policy uses them)
+    for ps in config.get("prefix_sets", []):
+        cmds.append({
+            "action": "update",
+            "path": f"/routing-policy/prefix-set[name={ps['name']}]",
+            "value": {}
+        })
+        for prfx in ps.get("prefixes", []):
             cmds.append({
                 "action": "update",
-                "path": f"/routing-policy/prefix-set[name={ps['name']}]",
-                "value": {}
+                "path": f"/routing-policy/prefix-set[name={ps['name']}]/prefix[ip-prefix={prfx['ip_prefix']}][mask-length-range={prfx['mask_length_range']}]",
+                "value": {
+                    "ip-prefix": prfx['ip_prefix'],
+                    "mask-length-range": prfx['mask_length_range'],
+                }
             })
-            for prfx in ps.get("prefixes", []):
-                cmds.append({
-                    "action": "update",
-                    "path": f"/routing-policy/prefix-set[name={ps['name']}]/prefix[ip-prefix={prfx['ip_prefix']}][mask-length-range={prfx['mask_length_range']}]",
-                    "value": {
-                        "ip-prefix": prfx['ip_prefix'],
-                        "mask-length-range": prfx['mask_length_range'],
-                    }
-                })
-
-        # 2. Policies & statements
-        # Prefix-sets
-        for ps in config.get("prefix_sets", []):
+
+    # 2. Policies & statements
+    for pol in config.get("policies", []):
+        cmds.append({
+            "action": "update",
+            "path": f"/routing-policy/policy[name={pol['name']}]",
+            "value": {}
+        })
+        for stmt in pol.get("statements", []):
+            stmt_val = {}
+            if (stmt.get("match") or {}).get("prefix_set"):
+                stmt_val["match"] = {"prefix-set": stmt["match"]["prefix_set"]}
+            if (stmt.get("action") or {}).get("policy_result"):
+                stmt_val["action"] = {"policy-result": stmt["action"]["policy_result"]}
             cmds.append({
                 "action": "update",
-                "path": f"/routing-policy/prefix-set[name={ps['name']}]",
-                "value": {}
+                "path": f"/routing-policy/policy[name={pol['name']}]/statement[name={stmt['name']}]",
+                "value": stmt_val
             })
-            for prfx in ps.get("prefixes", []):
-                base_path = f"/routing-policy/prefix-set[name={ps['name']}]/prefix[ip-prefix={prfx['ip_prefix']}][mask-length-range={prfx['mask_length_range']}]"
-                cmds.append({
-                    "action": "update",
-                    "path": base_path,
-                    "value": {}
-                })
-        changed = True
+
+    return cmds
+
+def parse_config(data):
+    """Convert the running routing-policy subtree into the shape of the config option"""
+    data = strip_namespaces(data or {})
+
+    prefix_sets = []
+    for ps in data.get("prefix-set", []):
+        prefix_sets.append({
+            "name": ps["name"],
+            "prefixes": [
+                {"ip_prefix": prfx["ip-prefix"], "mask_length_range": prfx["mask-length-range"]}
+                for prfx in ps.get("prefix", [])
+            ],
+        })
+
+    policies = []
+    for pol in data.get("policy", []):
+        statements = []
+        for stmt in pol.get("statement", []):
+            item = {"name": stmt["name"]}
+            match = stmt.get("match", {})
+            # newer releases nest the prefix-set reference under match/prefix
+            prefix_set = match.get("prefix-set") or match.get("prefix", {}).get("prefix-set")
+            if prefix_set:
+                item["match"] = {"prefix_set": prefix_set}
+            if "policy-result" in stmt.get("action", {}):
+                item["action"] = {"policy_result": stmt["action"]["policy-result"]}
+            statements.append(item)
+        policies.append({"name": pol["name"], "statements": statements})
+
+    return {"prefix_sets": prefix_sets, "policies": policies}
+
+@profiled
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            config=dict(type='dict'),
+            state=dict(type='str', choices=['merged', 'deleted', 'rendered', 'gathered'], default='merged')
+        ),
+        required_if=[
+            ('state', 'merged', ['config']),
+            ('state', 'deleted', ['config']),
+            ('state', 'rendered', ['config']),
+        ],
+        supports_check_mode=True
+    )
+
+    state = module.params["state"]
+
+    # Gathered: one get of /routing-policy, converted back to the config shape
+    if state == "gathered":
+        client = JSONRPCClient(module)
+        get_rpc = build_rpc("get", [{"path": "/routing-policy", "datastore": "running"}], rpcID())
+        response = client.post(payload=json.dumps(get_rpc))
+        if response.get("error"):
+            module.fail_json(msg="Server error (GET)", response=pprint.pformat(response))
+        result = response.get("result", [{}])
+        module.exit_json(changed=False, gathered=parse_config(result[0] if result else {}))
+
+    cmds = build_commands(module.params['config'], state)
+
+    # Rendered: return the set payload without connecting to the device
+    if state == "rendered":
+        module.exit_json(changed=False, commands=cmds, rendered=build_rpc("set", compact_commands(cmds), rpcID()))
+
+    client = JSONRPCClient(module)
+    changed = True
 
     # Apply commands
     if changed and not module.check_mode and cmds:
-        rpc = build_rpc("set", cmds, rpcID())
+        rpc = build_rpc("set", compact_commands(cmds), rpcID())
         response = client.post(payload=json.dumps(rpc))
         if response.get("error"):
             module.fail_json(msg="Server error (UPDATE)", response=pprint.pformat(response))
@@ -7,10 +7,13 @@ import json
 import pprint
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.compact import compact_commands
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import JSON_RPC_VERSION
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import profiled
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     rpcID,
+    strip_namespaces,
 )
 
 __metaclass__ = type
@@ -74,9 +77,13 @@ options:
           blackhole:
             type: bool
   state:
-    description: merged (set/update) or deleted (remove config)
+    description:
+      - merged (set/update) or deleted (remove config).
+      - rendered builds the JSON-RPC set payload offline, without connecting to the device.
+      - gathered reads the next-hop-groups and static routes of I(network_instance) from the
+        running datastore in a single get and returns them in the shape of the I(config) option.
     type: str
-    choices: [merged, deleted]
+    choices: [merged, deleted, rendered, gathered]
     default: merged
 author:
   - Uzma Saman (@NetOpsChic)
@@ -90,21 +97,20 @@ def build_rpc(method, commands, req_id):
         "id": req_id
     }
 
-def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            config=dict(type='dict', required=True),
-            state=dict(type='str', choices=['merged', 'deleted'], default='merged')
-        ),
-        supports_check_mode=True
-    )
+# (module option, YANG leaf) pairs of the static route leaves
+ROUTE_LEAVES = (
+    ("admin_state", "admin-state"),
+    ("metric", "metric"),
+    ("preference", "preference"),
+    ("next_hop_group", "next-hop-group"),
+    ("description", "description"),
+    ("blackhole", "blackhole"),
+)
 
-    client = JSONRPCClient(module)
-    state = module.params["state"]
-    cfg = module.params['config']
+def build_commands(cfg, state):
+    """Build the JSON-RPC set commands for the given static routes config and state"""
     ni = cfg["network_instance"]
     cmds = []
-    changed = False
 
     # --- Configure next-hop-groups first ---
     for nhg in cfg.get("next_hop_groups", []):
@@ -121,35 +127,97 @@ def main():
                 }
                 nhg_val["nexthop"].append(nh_item)
         cmds.append({
-            "action": "update" if state == "merged" else "delete",
+            "action": "update" if state != "deleted" else "delete",
             "path": nhg_path,
-            "value": nhg_val if state == "merged" else None
+            "value": nhg_val if state != "deleted" else None
         })
 
     # --- Now configure static routes ---
     for route in cfg.get("routes", []):
         route_path = f"/network-instance[name=\"{ni}\"]/static-routes/route[prefix={route['prefix']}]"
         route_val = {}
-        if "admin_state" in route:
-            route_val["admin-state"] = route["admin_state"]
-        if "metric" in route:
-            route_val["metric"] = route["metric"]
-        if "preference" in route:
-            route_val["preference"] = route["preference"]
-        if "next_hop_group" in route:
-            route_val["next-hop-group"] = route["next_hop_group"]
-        if "description" in route:
-            route_val["description"] = route["description"]
-        if "blackhole" in route:
-            route_val["blackhole"] = route["blackhole"]
+        for option, leaf in ROUTE_LEAVES:
+            if option in route:
+                route_val[leaf] = route[option]
         cmds.append({
-            "action": "update" if state == "merged" else "delete",
+            "action": "update" if state != "deleted" else "delete",
             "path": route_path,
-            "value": route_val if state == "merged" else None
+            "value": route_val if state != "deleted" else None
         })
 
+    return cmds
+
+def parse_config(nhg_data, routes_data, ni):
+    """Convert the running next-hop-groups and static-routes subtrees into the shape of the config option"""
+    nhg_data = strip_namespaces(nhg_data or {})
+    routes_data = strip_namespaces(routes_data or {})
+
+    next_hop_groups = []
+    for nhg in nhg_data.get("group", []):
+        item = {"name": nhg["name"]}
+        if "admin-state" in nhg:
+            item["admin_state"] = nhg["admin-state"]
+        if "nexthop" in nhg:
+            item["nexthops"] = [
+                {"index": nh["index"], "ip_address": nh.get("ip-address")}
+                for nh in nhg["nexthop"]
+            ]
+        next_hop_groups.append(item)
+
+    routes = []
+    for route in routes_data.get("route", []):
+        item = {"prefix": route["prefix"]}
+        for option, leaf in ROUTE_LEAVES:
+            if leaf in route:
+                item[option] = route[leaf]
+        # blackhole is a presence container on the device, a bool in the module
+        if "blackhole" in item and not isinstance(item["blackhole"], bool):
+            item["blackhole"] = True
+        routes.append(item)
+
+    return {
+        "network_instance": ni,
+        "next_hop_groups": next_hop_groups,
+        "routes": routes,
+    }
+
+@profiled
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            config=dict(type='dict', required=True),
+            state=dict(type='str', choices=['merged', 'deleted', 'rendered', 'gathered'], default='merged')
+        ),
+        supports_check_mode=True
+    )
+
+    state = module.params["state"]
+
+    # Gathered: both subtrees in one get, converted back to the config shape
+    if state == "gathered":
+        client = JSONRPCClient(module)
+        ni = module.params['config']["network_instance"]
+        ni_path = f"/network-instance[name=\"{ni}\"]"
+        get_rpc = build_rpc("get", [
+            {"path": ni_path + "/next-hop-groups", "datastore": "running"},
+            {"path": ni_path + "/static-routes", "datastore": "running"},
+        ], rpcID())
+        response = client.post(payload=json.dumps(get_rpc))
+        if response.get("error"):
+            module.fail_json(msg="Server error (GET)", response=pprint.pformat(response))
+        result = response.get("result") or [{}, {}]
+        module.exit_json(changed=False, gathered=parse_config(result[0], result[1], ni))
+
+    cmds = build_commands(module.params['config'], state)
+
+    # Rendered: return the set payload without connecting to the device
+    if state == "rendered":
+        module.exit_json(changed=False, commands=cmds, rendered=build_rpc("set", compact_commands(cmds), rpcID()))
+
+    client = JSONRPCClient(module)
+
     if cmds and not module.check_mode:
-        rpc = build_rpc("set", cmds, rpcID())
+        rpc = build_rpc("set", compact_commands(cmds), rpcID())
         response = client.post(payload=json.dumps(rpc))
         if response.get("error"):
             module.fail_json(msg="Server error (UPDATE)", response=pprint.pformat(response))
@@ -12,11 +12,17 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
     JSON_RPC_VERSION,
 )
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
 from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
     JSONRPCClient,
     convertResponseKeys,
     rpcID,
 )
+from ansible_collections.nokia.srlinux.plugins.module_utils.schema import (
+    precheck,
+)
 
 # pylint: disable=invalid-name
 __metaclass__ = type
@@ -83,6 +89,15 @@ options:
       - srl
       - oc
     default: srl
+  schema_index:
+    type: path
+    description:
+      - >-
+        Schema index of the SR Linux release of the device, compiled from its YANG models
+        with C(scripts/compile_schema_index.py).
+        When set, every path, list key and leaf value is checked against the index
+        on the controller first, typos fail without a round trip to the device.
+      - Values the index has no rule for (strings, unions, leafrefs) are left to the device.
 
 author:
   - Patrick Dumais (@Nokia)
@@ -101,6 +116,7 @@ EXAMPLES = """
 """
 
 
+@profiled
 def main():
     """Main function"""
     argspec = {
@@ -131,6 +147,7 @@ def main():
             },
         },
         "yang_models": {"choices": ["srl", "oc"], "default": "srl"},
+        "schema_index": {"type": "path"},
     }
 
     module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
@@ -153,6 +170,9 @@ def main():
         obj["action"] = "delete"
         commands += [obj]
 
+    if yang_models == "srl":
+        precheck(module, commands)
+
     data = {
         "jsonrpc": JSON_RPC_VERSION,
         "id": rpcID(),
@@ -0,0 +1,296 @@
+#!/usr/bin/python
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Ansible module for waiting until state leaves on SR Linux devices match predicates"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.nokia.srlinux.plugins.module_utils.const import (
+    JSON_RPC_VERSION,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.profiling import (
+    profiled,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    JSONRPCClient,
+    convertResponseKeys,
+    rpcID,
+    strip_identity,
+    walk_path,
+)
+
+# pylint: disable=invalid-name
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: wait_for
+short_description: "Wait until state leaves on Nokia SR Linux devices satisfy a set of conditions."
+description:
+  - >-
+    Polls only the leaves referenced by the conditions, all of them in a single get request
+    per attempt, and returns as soon as every condition holds.
+    The polling interval starts at I(interval) and doubles after every attempt until it
+    reaches I(max_interval), where it stays until I(timeout) expires.
+  - Paths may use wildcard keys, in which case the condition is evaluated against every matching leaf.
+  - >-
+    A path that does not exist yet, e.g. of a BGP neighbor still coming up, and errors of the get
+    count as conditions not met yet, polling goes on until I(timeout). The failure after
+    I(timeout) reports the error of the last attempt, if it had one.
+version_added: "1.1.0"
+options:
+  conditions:
+    description:
+      - Conditions that must all hold at the same time.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      path:
+        description:
+          - Path of the leaf to check, wildcard keys (C([name=*])) are allowed.
+        type: str
+        required: true
+      datastore:
+        description:
+          - The datastore to query.
+        type: str
+        choices: [running, state]
+        default: state
+      equals:
+        description:
+          - The leaf value must be equal to this value.
+        type: raw
+      not_equals:
+        description:
+          - The leaf value must differ from this value.
+        type: raw
+      in:
+        description:
+          - The leaf value must be one of these values.
+        type: list
+        elements: raw
+      match:
+        description:
+          - Whether all or at least one of the matched leaves must satisfy the condition.
+        type: str
+        choices: [all, any]
+        default: all
+      min_count:
+        description:
+          - Minimum number of leaves the path must match, so that an empty result
+            (e.g. no neighbors configured yet) does not count as converged.
+        type: int
+        default: 1
+  timeout:
+    description:
+      - Seconds to wait for the conditions before failing.
+    type: int
+    default: 300
+  interval:
+    description:
+      - Seconds to wait before the second attempt.
+    type: float
+    default: 1
+  max_interval:
+    description:
+      - Upper bound of the polling interval in seconds.
+    type: float
+    default: 10
+
+author:
+  - Uzma Saman (@NetOpsChic)
+"""
+
+EXAMPLES = """
+- name: Wait for all BGP sessions to come up
+  nokia.srlinux.wait_for:
+    conditions:
+      - path: /network-instance[name=*]/protocols/bgp/neighbor[peer-address=*]/session-state
+        equals: established
+    timeout: 120
+
+- name: Wait for all OSPF adjacencies in the default NI to reach full
+  nokia.srlinux.wait_for:
+    conditions:
+      - path: /network-instance[name=default]/protocols/ospf/instance[name=*]/area[area-id=*]/interface[interface-name=*]/neighbor[router-id=*]/adjacency-state
+        equals: full
+        min_count: 4
+"""
+
+RETURN = """
+converged:
+  description: Whether all conditions held before the timeout.
+  returned: always
+  type: bool
+elapsed:
+  description: Seconds from the first attempt until the conditions held (time-to-converge).
+  returned: always
+  type: float
+attempts:
+  description: Number of get requests sent.
+  returned: always
+  type: int
+conditions:
+  description:
+    - Per-condition outcome of the last attempt, with up to 10 failing leaves.
+    - Empty when the get of the last attempt failed.
+  returned: always
+  type: list
+  elements: dict
+error:
+  description: Error of the get of the last attempt, e.g. for a path that does not exist yet.
+  returned: when the conditions were not met
+  type: str
+"""
+
+MAX_FAILING_SAMPLES = 10
+
+
+def holds(cond, value):
+    """Whether a single leaf value satisfies the condition's predicates"""
+    value = strip_identity(value)
+    if cond.get("equals") is not None and value != cond["equals"]:
+        return False
+    if cond.get("not_equals") is not None and value == cond["not_equals"]:
+        return False
+    if cond.get("in") is not None and value not in cond["in"]:
+        return False
+    return True
+
+
+def evaluate(cond, result):
+    """Evaluate one condition against its get result"""
+    passed, failing, count = 0, [], 0
+    for keys, value in walk_path(result, cond["path"]):
+        if value == {}:
+            # an unset leaf comes back as an empty container
+            continue
+        count += 1
+        if holds(cond, value):
+            passed += 1
+        elif len(failing) < MAX_FAILING_SAMPLES:
+            failing.append({"keys": list(keys), "value": value})
+
+    if count < cond["min_count"]:
+        ok = False
+    elif cond["match"] == "any":
+        ok = passed > 0
+    else:
+        ok = passed == count
+    return {
+        "path": cond["path"],
+        "ok": ok,
+        "matched": count,
+        "passed": passed,
+        "failing": failing,
+    }
+
+
+@profiled
+def main():
+    """Main entrypoint for module execution"""
+    argspec = {
+        "conditions": {
+            "type": "list",
+            "elements": "dict",
+            "required": True,
+            "options": {
+                "path": {"type": "str", "required": True},
+                "datastore": {
+                    "type": "str",
+                    "choices": ["running", "state"],
+                    "default": "state",
+                },
+                "equals": {"type": "raw"},
+                "not_equals": {"type": "raw"},
+                "in": {"type": "list", "elements": "raw"},
+                "match": {"type": "str", "choices": ["all", "any"], "default": "all"},
+                "min_count": {"type": "int", "default": 1},
+            },
+        },
+        "timeout": {"type": "int", "default": 300},
+        "interval": {"type": "float", "default": 1},
+        "max_interval": {"type": "float", "default": 10},
+    }
+
+    module = AnsibleModule(argument_spec=argspec, supports_check_mode=True)
+
+    client = JSONRPCClient(module)
+
+    conditions = module.params.get("conditions")
+    timeout = module.params.get("timeout")
+    interval = module.params.get("interval")
+    max_interval = module.params.get("max_interval")
+
+    # the request is the same for every attempt
+    payload = json.dumps(
+        {
+            "jsonrpc": JSON_RPC_VERSION,
+            "id": rpcID(),
+            "method": "get",
+            "params": {
+                "commands": [
+                    {"path": c["path"], "datastore": c["datastore"]} for c in conditions
+                ],
+            },
+        }
+    )
+
+    start = time.monotonic()
+    deadline = start + timeout
+    attempts = 0
+    outcome = []
+    error = None
+
+    while True:
+        attempts += 1
+        response = client.post(payload=payload)
+        if not response or response.get("error"):
+            # the client returns nothing for paths that do not exist (yet), one missing
+            # path fails the get of all of them
+            error = (response or {}).get("error", {}).get("message", "Object not found")
+            outcome = []
+        else:
+            convertResponseKeys(response)
+            error = None
+            outcome = [
+                evaluate(cond, result)
+                for cond, result in zip(conditions, response.get("result") or [])
+            ]
+        elapsed = round(time.monotonic() - start, 3)
+        if len(outcome) == len(conditions) and all(c["ok"] for c in outcome):
+            module.exit_json(
+                changed=False,
+                converged=True,
+                elapsed=elapsed,
+                attempts=attempts,
+                conditions=outcome,
+            )
+
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        time.sleep(min(interval, deadline - now))
+        # exponential backoff until max_interval, then steady polling
+        interval = min(interval * 2, max_interval)
+
+    module.fail_json(
+        msg=f"conditions not met within {timeout} seconds"
+        + (f", last attempt failed: {error}" if error else ""),
+        converged=False,
+        elapsed=round(time.monotonic() - start, 3),
+        attempts=attempts,
+        conditions=outcome,
+        error=error,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Microbenchmarks of the Python hot paths of the collection.
+
+Runs in-process, without devices: command generation of the resource modules,
+command compaction, key translation, payload serialization, response parsing
+of the httpapi plugin through a fake connection and path lookups in get results.
+
+    # measure, keep the results
+    python tests/benchmarks/bench.py --output /tmp/bench-main.json
+    # measure a change and compare with them, exits 1 on regressions
+    python tests/benchmarks/bench.py --baseline /tmp/bench-main.json
+
+ansible-core and ansible.netcommon must be importable, the collections in
+ANSIBLE_COLLECTIONS_PATH are added to sys.path.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+# <root>/ansible_collections/nokia/srlinux/tests/benchmarks/bench.py
+COLLECTIONS_ROOT = os.path.abspath(os.path.join(__file__, *[os.pardir] * 6))
+for _path in [COLLECTIONS_ROOT] + os.environ.get("ANSIBLE_COLLECTIONS_PATH", "").split(os.pathsep):
+    if _path and _path not in sys.path:
+        sys.path.append(_path)
+
+# pylint: disable=wrong-import-position
+from ansible.plugins.loader import httpapi_loader, init_plugin_loader
+
+init_plugin_loader([COLLECTIONS_ROOT])
+
+from ansible_collections.nokia.srlinux.plugins.module_utils.compact import (
+    compact_commands,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.response import (
+    GetResponse,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    convertIdentifiers,
+    convertResponseKeys,
+)
+from ansible_collections.nokia.srlinux.plugins.modules import (
+    bgp,
+    ospf_v2,
+    routing_policy,
+    static_routes,
+)
+
+DEFAULT_SIZES = (10, 1000, 100000)
+
+
+def bgp_config(n):
+    """BGP config with n neighbors spread over n/100 groups"""
+    groups = max(1, n // 100)
+    return {
+        "network_instance": "default",
+        "router_id": "10.0.0.1",
+        "autonomous_system": 65000,
+        "afi_safi": [
+            {"afi_safi_name": "ipv4-unicast", "admin_state": "enable"},
+            {"afi_safi_name": "ipv6-unicast", "admin_state": "enable"},
+        ],
+        "groups": [
+            {
+                "group-name": f"group{g}",
+                "peer-as": 65100 + g,
+                "description": f"group {g}",
+                "afi-safi": [{"afi-safi-name": "ipv4-unicast", "admin-state": "enable"}],
+                "export-policy": "export-all",
+            }
+            for g in range(groups)
+        ],
+        "neighbors": [
+            {
+                "peer-address": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+                "peer-group": f"group{i % groups}",
+                "peer-as": 65100 + i % groups,
+                "description": f"neighbor {i}",
+                "afi-safi": [{"afi-safi-name": "ipv4-unicast", "admin_state": "enable"}],
+                "timers": {"hold-time": 90, "keepalive-interval": 30},
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def ospf_config(n):
+    """OSPFv2 config with n interfaces spread over n/100 areas"""
+    areas = max(1, n // 100)
+    return {
+        "network_instance": "default",
+        "router_id": "10.0.0.1",
+        "reference_bandwidth": 400000000,
+        "areas": [
+            {
+                "area_id": f"0.0.{a >> 8 & 255}.{a & 255}",
+                "interfaces": [
+                    {
+                        "name": f"ethernet-1/{i}.0",
+                        "admin_state": "enable",
+                        "cost": 10,
+                        "network_type": "point-to-point",
+                        "authentication": {"type": "md5", "key_id": 1, "key": "secret"},
+                    }
+                    for i in range(a, n, areas)
+                ],
+            }
+            for a in range(areas)
+        ],
+    }
+
+
+def static_routes_config(n):
+    """n static routes using n/100 next-hop groups"""
+    groups = max(1, n // 100)
+    return {
+        "network_instance": "default",
+        "next_hop_groups": [
+            {
+                "name": f"nhg{g}",
+                "admin_state": "enable",
+                "nexthops": [{"index": 0, "ip_address": f"192.168.{g >> 8 & 255}.{g & 255}"}],
+            }
+            for g in range(groups)
+        ],
+        "routes": [
+            {
+                "prefix": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}/32",
+                "next_hop_group": f"nhg{i % groups}",
+                "admin_state": "enable",
+                "metric": 1,
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def routing_policy_config(n):
+    """n prefixes in n/10 prefix-sets, one policy statement per prefix-set"""
+    sets = max(1, n // 10)
+    return {
+        "prefix_sets": [
+            {
+                "name": f"ps{s}",
+                "prefixes": [
+                    {
+                        "ip_prefix": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}/32",
+                        "mask_length_range": "exact",
+                    }
+                    for i in range(s, n, sets)
+                ],
+            }
+            for s in range(sets)
+        ],
+        "policies": [
+            {
+                "name": "import",
+                "statements": [
+                    {
+                        "name": f"s{s}",
+                        "match": {"prefix_set": f"ps{s}"},
+                        "action": {"policy_result": "accept"},
+                    }
+                    for s in range(sets)
+                ],
+            }
+        ],
+    }
+
+
+RESOURCE_MODULES = (
+    ("bgp", bgp, bgp_config),
+    ("ospf_v2", ospf_v2, ospf_config),
+    ("static_routes", static_routes, static_routes_config),
+    ("routing_policy", routing_policy, routing_policy_config),
+)
+
+
+def interfaces_tree(n):
+    """Get response of n interfaces, with namespaced keys like SR Linux returns"""
+    return {
+        "srl_nokia-interfaces:interface": [
+            {
+                "name": f"ethernet-1/{i}",
+                "admin_state": "enable",
+                "mtu": 9232,
+                "srl_nokia-interfaces-vlans:vlan_tagging": True,
+                # SR Linux returns containers without leaves as empty dicts
+                "ethernet": {"port_speed": "100G"} if i % 2 else {},
+                "subinterface": [
+                    {
+                        "index": s,
+                        "admin_state": "enable",
+                        "ipv4": {
+                            "admin_state": "enable",
+                            "address": [{"ip_prefix": f"10.{i >> 8 & 255}.{i & 255}.{s}/31"}],
+                        },
+                        "srl_nokia-interfaces-vlans:vlan": {
+                            "encap": {"single_tagged": {"vlan_id": s + 1}}
+                        },
+                    }
+                    for s in range(2)
+                ],
+                "statistics": {"in_octets": "123456789", "out_octets": "987654321"},
+            }
+            for i in range(n)
+        ]
+    }
+
+
+class FakeConnection:
+    """Stands in for the persistent connection of the httpapi plugin"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def queue_message(self, level, message):
+        """Messages are dropped"""
+
+    def send(self, path, data, **kwargs):
+        """Returns the canned body for every request"""
+        return FakeResponse(), io.BytesIO(self.body)
+
+
+class FakeResponse:
+    """HTTP response with a status code only"""
+
+    def getcode(self):
+        """Always 200"""
+        return 200
+
+
+def cases(sizes):
+    """(name, setup, func) benchmarks, setup returns the args of func and is not timed"""
+    for size in sizes:
+        for name, module, make_config in RESOURCE_MODULES:
+            cfg = make_config(size)
+            cmds = module.build_commands(cfg, "merged")
+            compacted = compact_commands(cmds)
+            yield (
+                f"{name}.build_commands[{size}]",
+                lambda cfg=cfg: (cfg, "merged"),
+                module.build_commands,
+            )
+            yield (f"{name}.compact_commands[{size}]", lambda cmds=cmds: (cmds,), compact_commands)
+            yield (
+                f"{name}.json_dumps[{size}]",
+                lambda rpc=module.build_rpc("set", compacted, 1): (rpc,),
+                json.dumps,
+            )
+
+        tree = interfaces_tree(size)
+        text = json.dumps(tree)
+        yield (
+            f"convertIdentifiers[{size}]",
+            # convertIdentifiers works in place, every call gets a fresh copy
+            lambda text=text: (json.loads(text),),
+            convertIdentifiers,
+        )
+        yield (
+            f"convertResponseKeys[{size}]",
+            lambda tree=tree: ({"jsonrpc": "2.0", "id": 1, "result": [tree]},),
+            convertResponseKeys,
+        )
+        yield (
+            f"GetResponse[{size}]",
+            lambda tree=tree: ({"result": [tree]}, ["/interface[name=*]"]),
+            GetResponse,
+        )
+        view = GetResponse({"result": [tree]}, ["/interface[name=*]"])
+        yield (
+            f"GetResponse.get[{size}]",
+            lambda size=size: (f"/interface[name=ethernet-1/{size - 1}]/subinterface[index=1]/ipv4",),
+            view.get,
+        )
+        # a container set in some entries and empty in others is found in all of them
+        if len(list(view.walk("/interface[name=*]/ethernet"))) != size:
+            raise AssertionError("GetResponse.walk misses ethernet containers")
+        yield (
+            f"GetResponse.walk[{size}]",
+            lambda: ("/interface[name=*]/ethernet",),
+            lambda path, view=view: list(view.walk(path)),
+        )
+        body = json.dumps({"jsonrpc": "2.0", "id": 1, "result": [tree]}).encode("utf-8")
+        # loaded by name, so its options have their documented defaults
+        api = httpapi_loader.get("nokia.srlinux.srlinux", FakeConnection(body))
+        yield (
+            f"HttpApi.send_request[{size}:{len(body) / 2**20:.2f}MB]",
+            lambda: ('{"jsonrpc": "2.0", "id": 1, "method": "get"}',),
+            api.send_request,
+        )
+
+
+def measure(setup, func, min_time, max_calls):
+    """Per-call timings of func, until min_time is spent in it or after max_calls calls"""
+    timings = []
+    spent = 0.0
+    while not timings or (spent < min_time and len(timings) < max_calls):
+        args = setup()
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        spent += elapsed
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "calls": len(timings),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Lines of the comparison with a baseline and the names of the regressions"""
+    lines, regressions = [], []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f"{name:60s} {result['min'] * 1e3:12.3f} ms  (new)")
+            continue
+        ratio = result["min"] / base["min"] if base["min"] else 1.0
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        lines.append(
+            f"{name:60s} {result['min'] * 1e3:12.3f} ms  {base['min'] * 1e3:12.3f} ms  x{ratio:5.2f}{flag}"
+        )
+    return lines, regressions
+
+
+def main():
+    """Main entrypoint"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="comma-separated object counts, default %(default)s",
+    )
+    parser.add_argument("--filter", help="only run benchmarks whose name matches this regex")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per benchmark")
+    parser.add_argument("--max-calls", type=int, default=1000, help="calls per benchmark")
+    parser.add_argument("--output", help="JSON file the results are written to")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="slowdown of the fastest call that counts as a regression, default %(default)s",
+    )
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    pattern = re.compile(args.filter) if args.filter else None
+    results = {}
+    for name, setup, func in cases(sizes):
+        if pattern and not pattern.search(name):
+            continue
+        results[name] = measure(setup, func, args.min_time, args.max_calls)
+        print(
+            f"{name:60s} {results[name]['min'] * 1e3:12.3f} ms  "
+            f"(median {results[name]['median'] * 1e3:.3f} ms, {results[name]['calls']} calls)",
+            flush=True,
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        lines, regressions = compare(results, baseline, args.threshold)
+        print(f"\n{'benchmark':60s} {'current':>15s}  {'baseline':>15s}")
+        print("\n".join(lines))
+        if regressions:
+            print(f"\n{len(regressions)} regressions over x{args.threshold}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Callback recording when every task starts, for the scenario benchmarks"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+__metaclass__ = type  # pylint: disable=invalid-name
+
+DOCUMENTATION = """
+---
+name: task_marks
+type: aggregate
+short_description: Writes the start time of every task to a JSON lines file
+description:
+  - Appends a JSON line with the task name and the epoch time to the file
+    named by the E(SRLINUX_BENCH_MARKS) environment variable when a task
+    starts, and a line with a null task when the playbook ends.
+requirements:
+  - enable in configuration
+"""
+
+
+class CallbackModule(CallbackBase):
+    """Task start times, the scenario harness attributes requests to tasks with them"""
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "task_marks"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self):
+        super().__init__()
+        self.path = os.environ.get("SRLINUX_BENCH_MARKS")
+
+    def _mark(self, task):
+        if self.path:
+            with open(self.path, "a") as f:
+                f.write(json.dumps({"task": task, "time": time.time()}) + "\n")
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self._mark(task.get_name())
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self._mark(task.get_name())
+
+    def v2_playbook_on_stats(self, stats):
+        self._mark(None)
@@ -0,0 +1,141 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Stand-in gNMI server on top of a stand-in device of standin.py.
+
+Answers Get with one JSON_IETF update per requested path and applies Set through
+the set handling of the device, so the JSON-RPC and gNMI endpoints of a device
+share its running config, commit and request counters. Message sizes count into
+the byte counters of the device.
+
+    python tests/benchmarks/gnmi_standin.py --port 57400
+
+Requires grpcio and pygnmi.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent import futures
+
+from standin import Device
+
+# pylint: disable=wrong-import-position,wrong-import-order
+import grpc
+from ansible_collections.nokia.srlinux.plugins.module_utils.gnmi import (
+    MAX_MESSAGE_LENGTH,
+    decode_value,
+    from_gnmi_path,
+)
+from pygnmi.spec.v080 import gnmi_pb2, gnmi_pb2_grpc
+
+
+def path_string(prefix, path):
+    """SR Linux path of a gNMI path under its prefix"""
+    return "/" + "/".join(
+        name + "".join(f"[{k}={v}]" for k, v in keys.items())
+        for name, keys in from_gnmi_path(prefix, path)
+    )
+
+
+class Servicer(gnmi_pb2_grpc.gNMIServicer):
+    """gNMI Get and Set of a stand-in device, credentials are not checked"""
+
+    def __init__(self, device):
+        self.device = device
+
+    def _count(self, request, response):
+        with self.device.lock:
+            self.device.bytes_in += request.ByteSize()
+            self.device.bytes_out += response.ByteSize()
+
+    def Get(self, request, context):  # pylint: disable=invalid-name
+        """Whole node of every path, in one update"""
+        notifications = []
+        for path in request.path:
+            value = self.device.handle(
+                {
+                    "method": "get",
+                    "params": {"commands": [{"path": path_string(request.prefix, path)}]},
+                }
+            )[0]
+            notifications.append(
+                gnmi_pb2.Notification(
+                    timestamp=time.time_ns(),
+                    prefix=request.prefix,
+                    update=[
+                        gnmi_pb2.Update(
+                            path=path,
+                            val=gnmi_pb2.TypedValue(json_ietf_val=json.dumps(value).encode("utf-8")),
+                        )
+                    ],
+                )
+            )
+        response = gnmi_pb2.GetResponse(notification=notifications)
+        self._count(request, response)
+        return response
+
+    def Set(self, request, context):  # pylint: disable=invalid-name
+        """Deletes, replaces and updates in one transaction"""
+        commands = [
+            {"action": "delete", "path": path_string(request.prefix, path)}
+            for path in request.delete
+        ]
+        results = [
+            gnmi_pb2.UpdateResult(path=path, op=gnmi_pb2.UpdateResult.DELETE)
+            for path in request.delete
+        ]
+        for action, op in (("replace", gnmi_pb2.UpdateResult.REPLACE), ("update", gnmi_pb2.UpdateResult.UPDATE)):
+            for update in getattr(request, action):
+                commands.append(
+                    {
+                        "action": action,
+                        "path": path_string(request.prefix, update.path),
+                        "value": decode_value(update.val),
+                    }
+                )
+                results.append(gnmi_pb2.UpdateResult(path=update.path, op=op))
+        try:
+            self.device.handle({"method": "set", "params": {"commands": commands}})
+        except (KeyError, TypeError, ValueError) as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        response = gnmi_pb2.SetResponse(
+            prefix=request.prefix, response=results, timestamp=time.time_ns()
+        )
+        self._count(request, response)
+        return response
+
+
+def serve(device, port):
+    """Started gNMI server of device on a local port"""
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=4),
+        options=[
+            ("grpc.max_receive_message_length", MAX_MESSAGE_LENGTH),
+            ("grpc.max_send_message_length", MAX_MESSAGE_LENGTH),
+        ],
+    )
+    gnmi_pb2_grpc.add_gNMIServicer_to_server(Servicer(device), server)
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    return server
+
+
+def main():
+    """Serve a stand-in device over gNMI until interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--port", type=int, default=57400)
+    args = parser.parse_args()
+    server = serve(Device("node1"), args.port)
+    print(f"node1 gNMI 127.0.0.1:{args.port}", flush=True)
+    try:
+        server.wait_for_termination()
+    except KeyboardInterrupt:
+        server.stop(0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
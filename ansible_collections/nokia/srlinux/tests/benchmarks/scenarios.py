@@ -0,0 +1,331 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""End-to-end rollout benchmarks of playbooks against stand-in devices.
+
+Runs the playbooks of example-scenarios, or scaled-up variants of them with any
+number of nodes and routes or neighbors per node, with ansible-playbook against
+the stand-in JSON-RPC endpoints of standin.py, and reports:
+
+- the wall time of the run and of every task
+- the requests per task, by JSON-RPC method, and per device
+- the commits per device
+- the peak RSS of the controller, all ansible processes of the run together
+
+    python tests/benchmarks/scenarios.py bgp_routes ospf-routes static-routes
+    python tests/benchmarks/scenarios.py scale-bgp --nodes 50 --objects 1000 --forks 10 \\
+        --output /tmp/scale-bgp.json
+
+The stand-ins keep config only, playbooks that verify protocol state can't pass.
+ansible-core and ansible.netcommon must be installed for the Python running this.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench import bgp_config, ospf_config, static_routes_config
+from standin import COLLECTIONS_ROOT, Fleet
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EXAMPLES_DIR = os.path.join(COLLECTIONS_ROOT, "example-scenarios")
+MARKS_ENV = "SRLINUX_BENCH_MARKS"
+
+EXAMPLES = {
+    "bgp_routes": "bgp_routes/bgp_routes.yaml",
+    "ospf-routes": "ospf-routes/ospf_v2.yaml",
+    "static-routes": "static-routes/static_routing.yaml",
+}
+EXAMPLE_NODES = 4
+
+# scaled variants: resource module, host variable and config generator
+SCALED = {
+    "scale-bgp": ("bgp", bgp_config),
+    "scale-ospf": ("ospf_v2", ospf_config),
+    "scale-static": ("static_routes", static_routes_config),
+}
+
+SCALED_PLAYBOOK = """\
+- name: Scaled {module} rollout
+  hosts: all
+  gather_facts: false
+  tasks:
+    - name: Apply {module}
+      nokia.srlinux.{module}:
+        config: "{{{{ {module}_config }}}}"
+        state: merged
+
+    - name: Apply {module} again
+      nokia.srlinux.{module}:
+        config: "{{{{ {module}_config }}}}"
+        state: merged
+"""
+
+
+def write_inventory(workdir, fleet):
+    """Inventory of the stand-in devices"""
+    path = os.path.join(workdir, "hosts")
+    with open(path, "w") as f:
+        f.write("[all:vars]\n")
+        f.write("ansible_connection=ansible.netcommon.httpapi\n")
+        f.write("ansible_network_os=nokia.srlinux.srlinux\n")
+        f.write("ansible_host=127.0.0.1\n")
+        f.write("ansible_user=admin\nansible_password=NokiaSrl1!\n")
+        f.write("ansible_httpapi_use_ssl=false\n")
+        f.write(f"ansible_python_interpreter={sys.executable}\n\n[all]\n")
+        for name, port in fleet.ports.items():
+            # the persistent connection socket is keyed by host and ansible_port, without
+            # it all devices on 127.0.0.1 would share the connection of the first one
+            f.write(f"{name} ansible_port={port} ansible_httpapi_port={port}\n")
+    return path
+
+
+def write_scaled(workdir, scenario, names, objects):
+    """Playbook and host_vars of a scaled variant"""
+    module, make_config = SCALED[scenario]
+    os.makedirs(os.path.join(workdir, "host_vars"), exist_ok=True)
+    for i, name in enumerate(names):
+        config = make_config(objects)
+        config["router_id"] = f"10.255.{i >> 8 & 255}.{i & 255}"
+        with open(os.path.join(workdir, "host_vars", name + ".json"), "w") as f:
+            json.dump({f"{module}_config": config}, f)
+    path = os.path.join(workdir, scenario + ".yml")
+    with open(path, "w") as f:
+        f.write(SCALED_PLAYBOOK.format(module=module))
+    return path
+
+
+def _process_rss(pid):
+    """RSS of a process in bytes, 0 once it is gone"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _run_processes(marker):
+    """Pids of the processes of a run, found by the marker in their environment.
+
+    ansible-connection daemonizes, its processes are not children of ansible-playbook.
+    """
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/environ", "rb") as f:
+                if marker in f.read():
+                    pids.append(int(entry))
+        except OSError:
+            continue
+    return pids
+
+
+class RssSampler(threading.Thread):
+    """Samples the summed RSS of the processes of a run, Linux only"""
+
+    def __init__(self, marker, interval=0.2):
+        super().__init__(daemon=True)
+        self.marker = marker
+        self.interval = interval
+        self.peak = 0
+        self.peak_process = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            sizes = [_process_rss(pid) for pid in _run_processes(self.marker)]
+            self.peak = max(self.peak, sum(sizes))
+            self.peak_process = max([self.peak_process] + sizes)
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        """Stop sampling"""
+        self.stopped.set()
+        self.join()
+
+
+def stop_connections(marker):
+    """Stop the ansible-connection processes a run leaves behind"""
+    for pid in _run_processes(marker):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+
+def attribute(marks, fleet):
+    """Requests of every task by method, from the task start times"""
+    times = [m["time"] for m in marks]
+    tasks = [
+        {
+            "task": m["task"],
+            "time": round(marks[i + 1]["time"] - m["time"], 3) if i + 1 < len(marks) else None,
+            "requests": {},
+            "devices": set(),
+        }
+        for i, m in enumerate(marks)
+        if m["task"] is not None
+    ]
+    for name, device in fleet.devices.items():
+        for stamp, method in device.requests:
+            index = bisect.bisect_right(times, stamp) - 1
+            if 0 <= index < len(tasks):
+                task = tasks[index]
+                task["requests"][method] = task["requests"].get(method, 0) + 1
+                task["devices"].add(name)
+    for task in tasks:
+        total = sum(task["requests"].values())
+        task["requests_per_device"] = round(total / len(task["devices"]), 2) if task["devices"] else 0
+        task["devices"] = len(task["devices"])
+    return tasks
+
+
+def run_scenario(scenario, args):
+    """Run one scenario, returns its report"""
+    nodes = EXAMPLE_NODES if scenario in EXAMPLES else args.nodes
+    names = [f"node{i + 1}" for i in range(nodes)]
+    workdir = tempfile.mkdtemp(prefix=f"srl-{scenario}-")
+    marks_path = os.path.join(workdir, "marks.jsonl")
+    if scenario in EXAMPLES:
+        playbook = os.path.join(EXAMPLES_DIR, EXAMPLES[scenario])
+    else:
+        playbook = write_scaled(workdir, scenario, names, args.objects)
+
+    env = dict(os.environ)
+    env.update(
+        {
+            "ANSIBLE_COLLECTIONS_PATH": os.pathsep.join(
+                p for p in (COLLECTIONS_ROOT, os.environ.get("ANSIBLE_COLLECTIONS_PATH")) if p
+            ),
+            "ANSIBLE_CALLBACK_PLUGINS": os.path.join(HERE, "callback_plugins"),
+            "ANSIBLE_CALLBACKS_ENABLED": "task_marks",
+            "ANSIBLE_HOST_KEY_CHECKING": "false",
+            "ANSIBLE_RETRY_FILES_ENABLED": "false",
+            # connections of a run must not be reused by the next one on the same ports
+            "ANSIBLE_PERSISTENT_CONTROL_PATH_DIR": os.path.join(workdir, "pc"),
+            MARKS_ENV: marks_path,
+        }
+    )
+    with Fleet(names, args.base_port) as fleet:
+        inventory = write_inventory(workdir, fleet)
+        sampler = RssSampler(f"{MARKS_ENV}={marks_path}".encode("utf-8"))
+        log_path = os.path.join(workdir, "ansible.log")
+        started = time.perf_counter()
+        with open(log_path, "w") as log:
+            process = subprocess.Popen(
+                [args.ansible_playbook, "-i", inventory, "-f", str(args.forks), playbook],
+                env=env,
+                cwd=workdir,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+            sampler.start()
+            rc = process.wait()
+        wall = time.perf_counter() - started
+        sampler.stop()
+        stop_connections(sampler.marker)
+
+        marks = []
+        if os.path.exists(marks_path):
+            with open(marks_path) as f:
+                marks = [json.loads(line) for line in f if line.strip()]
+        devices = {name: device.stats() for name, device in fleet.devices.items()}
+        tasks = attribute(marks, fleet)
+
+    commits = [d["commits"] for d in devices.values()]
+    report = {
+        "scenario": scenario,
+        "nodes": nodes,
+        "objects": None if scenario in EXAMPLES else args.objects,
+        "forks": args.forks,
+        "rc": rc,
+        "log": log_path,
+        "wall_time": round(wall, 3),
+        "peak_rss_mb": round(sampler.peak / 2**20, 1),
+        "peak_process_rss_mb": round(sampler.peak_process / 2**20, 1),
+        "commits_per_device": {
+            "min": min(commits),
+            "max": max(commits),
+            "mean": round(sum(commits) / len(commits), 2),
+        },
+        "requests": sum(sum(d["requests"].values()) for d in devices.values()),
+        "tasks": tasks,
+        "devices": devices,
+    }
+    if not args.keep and rc == 0:
+        shutil.rmtree(workdir, ignore_errors=True)
+        report["log"] = None
+    return report
+
+
+def print_report(report):
+    """Human-readable summary of a report"""
+    print(
+        f"\n{report['scenario']}: {report['nodes']} nodes"
+        + (f", {report['objects']} objects per node" if report["objects"] else "")
+        + f", {report['forks']} forks, rc={report['rc']}"
+    )
+    print(
+        f"  wall {report['wall_time']:.2f} s, peak controller RSS {report['peak_rss_mb']} MB "
+        f"(largest process {report['peak_process_rss_mb']} MB), {report['requests']} requests, "
+        f"commits per device {report['commits_per_device']['min']}..{report['commits_per_device']['max']}"
+    )
+    for task in report["tasks"]:
+        requests = ", ".join(f"{m} {n}" for m, n in sorted(task["requests"].items())) or "-"
+        duration = f"{task['time']:8.2f} s" if task["time"] is not None else " " * 10
+        print(f"  {duration}  {task['task'][:60]:60s}  {requests} ({task['requests_per_device']}/device)")
+    if report["log"]:
+        print(f"  log: {report['log']}")
+
+
+def main():
+    """Main entrypoint"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "scenarios",
+        nargs="+",
+        choices=sorted(EXAMPLES) + sorted(SCALED),
+        help="example playbooks run on 4 nodes, scaled variants on --nodes",
+    )
+    parser.add_argument("--nodes", type=int, default=4, help="nodes of the scaled variants")
+    parser.add_argument(
+        "--objects", type=int, default=100, help="neighbors, interfaces or routes per node"
+    )
+    parser.add_argument("--forks", type=int, default=5)
+    parser.add_argument("--base-port", type=int, default=18080)
+    parser.add_argument(
+        "--ansible-playbook",
+        default=shutil.which(
+            "ansible-playbook",
+            path=os.pathsep.join([os.path.dirname(sys.executable), os.environ.get("PATH", "")]),
+        ),
+    )
+    parser.add_argument("--output", help="JSON file the reports are written to")
+    parser.add_argument("--keep", action="store_true", help="keep the work directories")
+    args = parser.parse_args()
+    if not args.ansible_playbook:
+        parser.error("ansible-playbook not found, use --ansible-playbook")
+
+    reports = []
+    for scenario in args.scenarios:
+        reports.append(run_scenario(scenario, args))
+        print_report(reports[-1])
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+    return 0 if all(r["rc"] == 0 for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Stand-in SR Linux JSON-RPC endpoints for benchmarks.
+
+Every device is a threaded HTTP server on its own local port that keeps a running
+config in memory and answers get, set, diff, validate and cli requests closely
+enough for the modules of the collection, with no protocol state behind it.
+Requests are counted per method and time-stamped, a set that changes the config
+counts as a commit.
+
+    python tests/benchmarks/standin.py --devices 4 --base-port 18080
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# <root>/ansible_collections/nokia/srlinux/tests/benchmarks/standin.py
+COLLECTIONS_ROOT = os.path.abspath(os.path.join(__file__, *[os.pardir] * 6))
+if COLLECTIONS_ROOT not in sys.path:
+    sys.path.append(COLLECTIONS_ROOT)
+
+# pylint: disable=wrong-import-position
+from ansible_collections.nokia.srlinux.plugins.module_utils.compare import (
+    list_key,
+)
+from ansible_collections.nokia.srlinux.plugins.module_utils.srlinux import (
+    split_path,
+)
+
+COMMIT_PATH = "/system/configuration/commit"
+
+
+def _child_key(node, name):
+    """Key of a child in node, with or without its module prefix"""
+    for key in node:
+        if key.split(":", 1)[-1] == name:
+            return key
+    return None
+
+
+def _matches(entry, keys):
+    return all(v == "*" or str(entry.get(k)) == v for k, v in keys.items())
+
+
+class Device:
+    """Running config and request counters of one stand-in device"""
+
+    def __init__(self, name, config=None):
+        self.name = name
+        self.running = config or {}
+        self.commits = 0
+        self.counts = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        # (time, method) of every request, to attribute them to playbook tasks
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def resolve(self, elems):
+        """Node at elems, None if missing"""
+        node = self.running
+        for name, keys in elems:
+            if not isinstance(node, dict):
+                return None
+            key = _child_key(node, name)
+            if key is None:
+                return None
+            node = node[key]
+            if keys:
+                node = next((e for e in node if _matches(e, keys)), None)
+                if node is None:
+                    return None
+        return node
+
+    def project(self, node, elems):
+        """Subtree of node matching elems with wildcard keys, rooted at the first one"""
+        if not elems:
+            return copy.deepcopy(node)
+        name, keys = elems[0]
+        key = _child_key(node, name) if isinstance(node, dict) else None
+        if key is None:
+            return None
+        if not keys:
+            sub = self.project(node[key], elems[1:])
+            return None if sub is None else {name: sub}
+        entries = []
+        for entry in node[key]:
+            if not _matches(entry, keys):
+                continue
+            if not elems[1:]:
+                entries.append(copy.deepcopy(entry))
+                continue
+            sub = self.project(entry, elems[1:])
+            if isinstance(sub, dict):
+                item = {k: entry[k] for k in keys if k in entry}
+                item.update(sub)
+                entries.append(item)
+        return {name: entries} if entries else None
+
+    def get(self, path):
+        """Get result of a path"""
+        if path.startswith(COMMIT_PATH):
+            # commit ids only, enough for the src skip of the config module
+            return {"commit": [{"id": i} for i in range(self.commits + 1)]}
+        elems = split_path(path)
+        wildcard = next((i for i, (_, keys) in enumerate(elems) if "*" in keys.values()), None)
+        if wildcard is None:
+            node = self.resolve(elems)
+            return copy.deepcopy(node) if node is not None else {}
+        parent = self.resolve(elems[:wildcard])
+        return (parent is not None and self.project(parent, elems[wildcard:])) or {}
+
+    def ensure(self, elems):
+        """Node at elems, created if missing"""
+        node = self.running
+        for name, keys in elems:
+            key = _child_key(node, name) or name
+            if keys:
+                entries = node.setdefault(key, [])
+                entry = next((e for e in entries if _matches(e, keys)), None)
+                if entry is None:
+                    entry = {k: int(v) if v.isdigit() else v for k, v in keys.items()}
+                    entries.append(entry)
+                node = entry
+            else:
+                node = node.setdefault(key, {})
+        return node
+
+    def merge(self, dst, src):
+        """Merge a set value into the config, list entries are matched by their keys"""
+        for key, value in src.items():
+            dkey = _child_key(dst, key.split(":", 1)[-1]) or key
+            current = dst.get(dkey)
+            if isinstance(value, dict) and isinstance(current, dict):
+                self.merge(current, value)
+            elif isinstance(value, list) and isinstance(current, list) and value and all(
+                isinstance(e, dict) for e in value + current
+            ):
+                keys = list_key(dkey.split(":", 1)[-1], value + current, {})
+                index = {tuple(str(e.get(k)) for k in keys or ()): e for e in current}
+                for entry in value:
+                    match = index.get(tuple(str(entry.get(k)) for k in keys or ()))
+                    if match is None or not keys:
+                        current.append(copy.deepcopy(entry))
+                    else:
+                        self.merge(match, entry)
+            else:
+                dst[dkey] = copy.deepcopy(value)
+
+    def apply(self, cmd):
+        """Apply one set command"""
+        elems = split_path(cmd["path"])
+        action = cmd["action"]
+        value = cmd.get("value")
+        if action == "delete":
+            if not elems:
+                self.running = {}
+                return
+            parent = self.resolve(elems[:-1])
+            name, keys = elems[-1]
+            key = _child_key(parent, name) if isinstance(parent, dict) else None
+            if key is None:
+                return
+            if keys:
+                parent[key] = [e for e in parent[key] if not _matches(e, keys)]
+            else:
+                del parent[key]
+            return
+        if not elems:
+            if action == "replace":
+                self.running = copy.deepcopy(value)
+            else:
+                self.merge(self.running, value)
+            return
+        if isinstance(value, dict) or elems[-1][1]:
+            node = self.ensure(elems)
+            if action == "replace":
+                keys = {k: node[k] for k in elems[-1][1]}
+                node.clear()
+                node.update(keys)
+            if isinstance(value, dict):
+                self.merge(node, value)
+        else:
+            parent = self.ensure(elems[:-1])
+            parent[_child_key(parent, elems[-1][0]) or elems[-1][0]] = copy.deepcopy(value)
+
+    def handle(self, request):
+        """Result of a JSON-RPC request"""
+        method = request.get("method")
+        params = request.get("params") or {}
+        commands = params.get("commands") or []
+        with self.lock:
+            self.counts[method] = self.counts.get(method, 0) + 1
+            self.requests.append((time.time(), method))
+            if method == "get":
+                return [self.get(c["path"]) for c in commands]
+            if method in ("set", "diff", "validate"):
+                if params.get("datastore") == "tools":
+                    return [{}]
+                before = json.dumps(self.running, sort_keys=True)
+                saved = copy.deepcopy(self.running)
+                for cmd in commands:
+                    self.apply(cmd)
+                changed = json.dumps(self.running, sort_keys=True) != before
+                if method == "set":
+                    self.commits += changed
+                    return [{}]
+                self.running = saved
+                if method == "diff":
+                    return ["      changed\n" if changed else ""]
+                return [{}]
+            if method == "cli":
+                return [{"text": ""} for _ in commands]
+        raise ValueError(f"unsupported method {method}")
+
+    def stats(self):
+        """Counters of the device"""
+        with self.lock:
+            return {
+                "commits": self.commits,
+                "requests": dict(self.counts),
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+            }
+
+
+def _handler(device):
+    class Handler(BaseHTTPRequestHandler):
+        """JSON-RPC over HTTP POST /jsonrpc"""
+
+        protocol_version = "HTTP/1.1"
+        # headers and body are written separately, keep-alive requests would wait for acks
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            """Answer a JSON-RPC request"""
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            request = json.loads(body or b"{}")
+            try:
+                response = {"result": device.handle(request)}
+            except Exception as e:  # pylint: disable=broad-except
+                response = {"error": {"code": -1, "message": str(e)}}
+            response.update(jsonrpc="2.0", id=request.get("id"))
+            data = json.dumps(response).encode("utf-8")
+            with device.lock:
+                device.bytes_in += len(body)
+                device.bytes_out += len(data)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+class Fleet:
+    """Stand-in devices on consecutive local ports"""
+
+    def __init__(self, names, base_port):
+        self.devices = {}
+        self.ports = {}
+        self.servers = []
+        for i, name in enumerate(names):
+            device = Device(name)
+            server = ThreadingHTTPServer(("127.0.0.1", base_port + i), _handler(device))
+            server.daemon_threads = True
+            self.devices[name] = device
+            self.ports[name] = base_port + i
+            self.servers.append(server)
+
+    def __enter__(self):
+        for server in self.servers:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+def main():
+    """Serve stand-in devices until interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--devices", type=int, default=4)
+    parser.add_argument("--base-port", type=int, default=18080)
+    args = parser.parse_args()
+    names = [f"node{i + 1}" for i in range(args.devices)]
+    with Fleet(names, args.base_port) as fleet:
+        for name in names:
+            print(f"{name} 127.0.0.1:{fleet.ports[name]}", flush=True)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
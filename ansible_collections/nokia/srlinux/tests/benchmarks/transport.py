@@ -0,0 +1,174 @@
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""JSON-RPC against gNMI transport for a full-config get and a large replace.
+
+Serves one stand-in device over both JSON-RPC (standin.py) and gNMI
+(gnmi_standin.py) and times, for configs of every size, the client side of
+
+- get: a get of / from the running datastore, decoded to Python objects
+- replace: a replace of / with the whole config
+
+over a JSON-RPC keep-alive connection, the way the httpapi plugin posts, and
+over `GnmiSession` of the gNMI transport, with the bytes on the wire per call.
+
+    python tests/benchmarks/transport.py --sizes 100,10000 --output /tmp/transport.json
+
+Requires grpcio and pygnmi.
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import sys
+
+from bench import measure
+from gnmi_standin import serve
+from standin import Fleet
+
+# pylint: disable=wrong-import-position,wrong-import-order
+from ansible_collections.nokia.srlinux.plugins.module_utils.gnmi import GnmiSession
+
+
+def full_config(n):
+    """Config with n interfaces, each with a routed subinterface, and n static routes"""
+    return {
+        "interface": [
+            {
+                "name": f"ethernet-1/{i}",
+                "admin-state": "enable",
+                "mtu": 9232,
+                "subinterface": [
+                    {
+                        "index": 0,
+                        "admin-state": "enable",
+                        "ipv4": {
+                            "admin-state": "enable",
+                            "address": [{"ip-prefix": f"10.{i >> 8 & 255}.{i & 255}.0/31"}],
+                        },
+                    }
+                ],
+            }
+            for i in range(n)
+        ],
+        "network-instance": [
+            {
+                "name": "default",
+                "type": "default",
+                "static-routes": {
+                    "route": [
+                        {
+                            "prefix": f"172.{16 + (i >> 16 & 15)}.{i >> 8 & 255}.{i & 255}/32",
+                            "admin-state": "enable",
+                            "next-hop-group": "nhg0",
+                        }
+                        for i in range(n)
+                    ]
+                },
+            }
+        ],
+    }
+
+
+class JsonRpcSession:
+    """JSON-RPC over a keep-alive HTTP connection"""
+
+    def __init__(self, port):
+        self.connection = http.client.HTTPConnection("127.0.0.1", port)
+        self.connection.connect()
+        # headers and body go out in two writes, don't wait for delayed acks in between
+        self.connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.id = 0
+
+    def post(self, method, params):
+        """Result of a JSON-RPC request"""
+        self.id += 1
+        body = json.dumps({"jsonrpc": "2.0", "id": self.id, "method": method, "params": params})
+        self.connection.request(
+            "POST", "/jsonrpc", body, {"Content-Type": "application/json"}
+        )
+        response = json.loads(self.connection.getresponse().read())
+        if "error" in response:
+            raise RuntimeError(response["error"]["message"])
+        return response["result"]
+
+    def get(self, path):
+        """Value at path in the running datastore"""
+        return self.post("get", {"commands": [{"path": path, "datastore": "running"}]})[0]
+
+    def set(self, commands):
+        """Apply set commands"""
+        self.post("set", {"commands": commands})
+
+
+def wire_bytes(device, func, *args):
+    """Request and response bytes of one call"""
+    before = device.stats()
+    func(*args)
+    after = device.stats()
+    return (after["bytes_in"] - before["bytes_in"]) + (after["bytes_out"] - before["bytes_out"])
+
+
+def main():
+    """Main entrypoint"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "--sizes", default="100,10000", help="comma-separated interface and route counts"
+    )
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds per benchmark")
+    parser.add_argument("--max-calls", type=int, default=50, help="calls per benchmark")
+    parser.add_argument("--base-port", type=int, default=18080, help="JSON-RPC port")
+    parser.add_argument("--gnmi-port", type=int, default=57400)
+    parser.add_argument("--output", help="JSON file the results are written to")
+    args = parser.parse_args()
+
+    results = {}
+    with Fleet(["node1"], args.base_port) as fleet:
+        device = fleet.devices["node1"]
+        server = serve(device, args.gnmi_port)
+        jsonrpc = JsonRpcSession(args.base_port)
+        gnmi = GnmiSession("127.0.0.1", args.gnmi_port, use_ssl=False)
+        try:
+            for size in [int(s) for s in args.sizes.split(",") if s]:
+                config = full_config(size)
+                commands = [{"action": "replace", "path": "/", "value": config}]
+                cases = (
+                    ("get", "jsonrpc", jsonrpc.get, ("/",)),
+                    ("get", "gnmi", lambda path: gnmi.get(path, "running"), ("/",)),
+                    ("replace", "jsonrpc", jsonrpc.set, (commands,)),
+                    ("replace", "gnmi", gnmi.set, (commands,)),
+                )
+                device.running = json.loads(json.dumps(config))
+                for operation, transport, func, call_args in cases:
+                    name = f"{operation}[{size}].{transport}"
+                    results[name] = measure(
+                        lambda call_args=call_args: call_args, func, args.min_time, args.max_calls
+                    )
+                    results[name]["bytes"] = wire_bytes(device, func, *call_args)
+                    print(
+                        f"{name:32s} {results[name]['min'] * 1e3:10.2f} ms "
+                        f"(median {results[name]['median'] * 1e3:.2f} ms, "
+                        f"{results[name]['calls']} calls)  {results[name]['bytes'] / 2**20:8.2f} MB",
+                        flush=True,
+                    )
+                for operation in ("get", "replace"):
+                    base = results[f"{operation}[{size}].jsonrpc"]
+                    other = results[f"{operation}[{size}].gnmi"]
+                    print(
+                        f"{operation}[{size}]: gNMI x{base['min'] / other['min']:.2f} the speed, "
+                        f"x{other['bytes'] / base['bytes']:.2f} the bytes of JSON-RPC"
+                    )
+        finally:
+            gnmi.close()
+            server.stop(0)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# Copyright 2024 Nokia
+# Licensed under the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Compile the SR Linux YANG models of a release into a schema index.
+
+The index is used by the schema_index option of the config and validate modules,
+see plugins/module_utils/schema.py for its format. Requires pyang.
+
+    git clone -b v24.3.1 https://github.com/nokia/srlinux-yang-models
+    python3 scripts/compile_schema_index.py --version 24.3.1 \\
+        --models srlinux-yang-models/srlinux-yang-models \\
+        --output srl-24.3.1.json.gz
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+
+try:
+    from pyang import context, repository
+    from pyang import types as pyang_types
+except ImportError:
+    sys.exit("pyang is required: pip install pyang")
+
+INT_TYPES = {
+    "int8", "int16", "int32", "int64", "uint8", "uint16", "uint32", "uint64",
+}
+DATA_KEYWORDS = {"container", "list", "leaf", "leaf-list"}
+
+
+def base_type(type_stmt):
+    """Follow typedefs down to the built-in type statement"""
+    while type_stmt.i_typedef is not None:
+        type_stmt = type_stmt.i_typedef.search_one("type")
+    return type_stmt
+
+
+def identities(identity, found):
+    """Names of the identities derived from identity"""
+    for derived in getattr(identity, "i_derived", []) or []:
+        found.add(derived.arg)
+        identities(derived, found)
+    return found
+
+
+def leaf_node(stmt):
+    """Index node of a leaf or leaf-list"""
+    type_stmt = base_type(stmt.search_one("type"))
+    node = {"t": type_stmt.arg}
+    if stmt.keyword == "leaf-list":
+        node["ll"] = 1
+    if type_stmt.arg == "enumeration":
+        node["e"] = [e.arg for e in type_stmt.search("enum")]
+    elif type_stmt.arg == "identityref":
+        found = set()
+        for base in type_stmt.search("base"):
+            if getattr(base, "i_identity", None) is not None:
+                identities(base.i_identity, found)
+        node["e"] = sorted(found)
+    elif type_stmt.arg in INT_TYPES:
+        spec = getattr(stmt.search_one("type"), "i_type_spec", None)
+        if isinstance(spec, pyang_types.RangeTypeSpec) and len(spec.ranges) == 1:
+            low, high = spec.ranges[0]
+            if isinstance(low, int) and isinstance(high, int):
+                node["r"] = [low, high]
+    return node
+
+
+def data_children(stmt):
+    """Config data node children, looking through choices and cases"""
+    for child in getattr(stmt, "i_children", []):
+        if getattr(child, "i_config", True) is False:
+            continue
+        if child.keyword in ("choice", "case"):
+            yield from data_children(child)
+        elif child.keyword in DATA_KEYWORDS:
+            yield child
+
+
+def compile_node(stmt):
+    """Index node of a container or list and everything below"""
+    node = {}
+    children = {}
+    for child in data_children(stmt):
+        if child.keyword in ("leaf", "leaf-list"):
+            children[child.arg] = leaf_node(child)
+        else:
+            children[child.arg] = compile_node(child)
+    if children:
+        node["c"] = children
+    if stmt.keyword == "list":
+        key = stmt.search_one("key")
+        names = key.arg.split() if key is not None else []
+        node["k"] = {name: children.get(name, {}).get("t", "string") for name in names}
+    return node
+
+
+def main():
+    """Main entrypoint"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--models", required=True, help="directory of the YANG models")
+    parser.add_argument("--version", required=True, help="SR Linux release of the models")
+    parser.add_argument("--output", required=True, help="index file, gzipped if ending in .gz")
+    args = parser.parse_args()
+
+    dirs = [root for root, _, files in os.walk(args.models) if any(f.endswith(".yang") for f in files)]
+    ctx = context.Context(repository.FileRepository(os.pathsep.join(dirs)))
+    modules = []
+    for root in dirs:
+        for name in sorted(os.listdir(root)):
+            if name.endswith(".yang"):
+                with open(os.path.join(root, name)) as f:
+                    module = ctx.add_module(name, f.read())
+                # tools models reuse the top-level names of the config ones
+                if module is not None and module.keyword == "module" and "-tools-" not in name:
+                    modules.append(module)
+    ctx.validate()
+
+    root = {"c": {}}
+    for module in modules:
+        for child in data_children(module):
+            if child.keyword in ("leaf", "leaf-list"):
+                root["c"][child.arg] = leaf_node(child)
+            else:
+                # augments from other modules are already merged into i_children
+                root["c"][child.arg] = compile_node(child)
+
+    data = json.dumps(
+        {"format": 1, "version": args.version, "root": root}, separators=(",", ":")
+    ).encode("utf-8")
+    if args.output.endswith(".gz"):
+        data = gzip.compress(data, mtime=0)
+    with open(args.output, "wb") as f:
+        f.write(data)
+    print(f"{args.output}: {len(root['c'])} top-level nodes, {len(data)} bytes")
+
+
+if __name__ == "__main__":
+    main()